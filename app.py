@@ -3,19 +3,25 @@ import os
 import sys
 import json
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 from werkzeug.utils import secure_filename
 import time
-from queue import Queue
+from queue import Empty, Queue
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the current directory to the path to import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import IndoT5HybridConfig, UPLOAD_DIR, ALLOWED_EXTENSIONS, MAX_CONTENT_LENGTH
 from engines.indot5_hybrid_engine import IndoT5HybridParaphraser
+from engines.cancellation import CancellationToken, OperationCancelled
+from engines.inference_scheduler import InferenceScheduler
+from engines.embedding_store import DEFAULT_EMBEDDING_ROOT
+from engines.result_store import DEFAULT_RESULT_STORE_PATH
 from utils.file_parser import FileParser
+from utils.job_store import DEFAULT_JOB_STORE_PATH, JOB_COMPLETED, JOB_FAILED, UNFINISHED_STATUSES, JobStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,13 +35,26 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
 # Global instances
 paraphraser = None
+app_config = None
 file_parser = FileParser()
+job_store = None
+job_executor = None
+
+# Seconds between job store polls of /jobs/<id>/stream
+JOB_STREAM_POLL_INTERVAL = 0.5
+
+# Seconds between SSE keepalive comments while an engine call is running
+SSE_KEEPALIVE_INTERVAL = 1.0
+
+# Seconds between checks for partial output while a streamed engine call is running
+SSE_PARTIAL_INTERVAL = 0.1
 
 def initialize_paraphraser():
     """Initialize the paraphraser with default configuration"""
-    global paraphraser
+    global paraphraser, app_config
     try:
         config = IndoT5HybridConfig()
+        app_config = config
         paraphraser = IndoT5HybridParaphraser(
             model_name=config.model_name,
             use_gpu=config.use_gpu,
@@ -43,13 +62,159 @@ def initialize_paraphraser():
             min_confidence=config.neural_confidence_threshold,
             quality_threshold=config.min_quality_threshold,
             max_transformations=config.max_transformations_per_sentence,
-            enable_caching=True
+            max_processing_time=config.max_processing_time,
+            generation_profiles=config.generation_profiles,
+            default_profile=config.default_generation_profile,
+            enable_early_exit=config.enable_early_exit,
+            early_exit_similarity=config.early_exit_similarity,
+            early_exit_max_overlap=config.early_exit_max_overlap,
+            adaptive_stages=config.adaptive_stages,
+            stage_skip_diversity=config.stage_skip_diversity,
+            stage_skip_syntax_diversity=config.stage_skip_syntax_diversity,
+            stage_reorder_min_similarity=config.stage_reorder_min_similarity,
+            constrained_decoding=config.constrained_decoding,
+            max_concurrent_generate=config.max_concurrent_generate,
+            enable_caching=True,
+            backend=config.inference_backend,
+            onnx_model_dir=config.onnx_model_dir,
+            quantization=config.quantization,
+            quantized_cache_dir=config.quantized_cache_dir,
+            encoder_cache_size=config.encoder_cache_size,
+            encoder_cache_max_mb=config.encoder_cache_max_mb,
+            result_cache_size=config.result_cache_size,
+            result_cache_max_mb=config.result_cache_max_mb,
+            result_cache_ttl=config.result_cache_ttl,
+            similarity_cache_size=config.similarity_cache_size,
+            synonym_cache_size=config.synonym_cache_size,
+            embedding_store_dir=(config.embedding_store_dir or DEFAULT_EMBEDDING_ROOT)
+            if config.enable_embedding_store else None,
+            result_store_path=(config.result_store_path or DEFAULT_RESULT_STORE_PATH)
+            if config.enable_result_store else None,
+            result_store_max_entries=config.result_store_max_entries,
+            result_store_ttl=config.result_store_ttl
         )
+        
+        # Batch concurrent requests into shared generate() calls
+        if config.enable_inference_scheduler:
+            paraphraser.attach_scheduler(InferenceScheduler(
+                paraphraser,
+                max_wait_ms=config.scheduler_max_wait_ms,
+                max_batch_size=config.scheduler_max_batch_size,
+                max_batch_tokens=config.scheduler_max_batch_tokens,
+                queue_depth=config.scheduler_queue_depth
+            ))
         logger.info("Paraphraser initialized successfully")
+        
+        if config.enable_job_api:
+            initialize_job_runner(config)
     except Exception as e:
         logger.error(f"Failed to initialize paraphraser: {e}")
         raise
 
+def initialize_job_runner(config):
+    """Open the job store, start the job worker pool and resume unfinished jobs"""
+    global job_store, job_executor
+    try:
+        job_store = JobStore(config.job_store_path or DEFAULT_JOB_STORE_PATH, lease_timeout=config.job_lease_timeout)
+    except Exception as e:
+        logger.warning(f"Job store unavailable ({e}), /jobs API disabled")
+        return
+    
+    job_executor = ThreadPoolExecutor(max_workers=max(1, config.job_workers), thread_name_prefix="job-worker")
+    
+    # Jobs whose worker stopped (lease expired) continue from their last
+    # checkpointed chunk; jobs other live workers still run keep their lease
+    job_store.requeue_interrupted()
+    for job_id in job_store.unfinished_jobs():
+        logger.info(f"Resuming job {job_id}")
+        job_executor.submit(run_job, job_id)
+    
+    # Leases that are still live now (e.g. a worker that crashed just before
+    # this restart) are picked up by the reaper once they expire
+    threading.Thread(target=reap_expired_jobs, name="job-reaper", daemon=True).start()
+
+def latest_event(events: Optional[Queue]) -> Optional[Dict[str, Any]]:
+    """Newest payload on an event queue, dropping the older ones (None if empty)"""
+    payload = None
+    while events is not None:
+        try:
+            payload = events.get_nowait()
+        except Empty:
+            break
+    return payload
+
+def partial_events(events: Queue, variation: int):
+    """on_partial callback queueing SSE 'partial' payloads of one variation"""
+    return lambda text: events.put({'status': 'partial', 'variation': variation, 'text': text})
+
+def call_with_keepalive(func, *args, events: Optional[Queue] = None, **kwargs):
+    """
+    Run a blocking engine call inside an SSE generator (use with `yield from`)
+    
+    The call runs on a helper thread while keepalive comments are written, so
+    a disconnected client is noticed during long calls: the failed write
+    closes the generator, whose handler then cancels the request's token.
+    Payloads the call puts on `events` are written as data events while it
+    runs (only the newest since the previous write, e.g. partial output).
+    
+    Returns:
+        The return value of func (its exception is re-raised)
+    """
+    done = threading.Event()
+    outcome = {}
+    
+    def run():
+        try:
+            outcome['result'] = func(*args, **kwargs)
+        except BaseException as e:
+            outcome['error'] = e
+        finally:
+            done.set()
+    
+    threading.Thread(target=run, name="sse-engine-call", daemon=True).start()
+    last_write = time.time()
+    while not done.wait(SSE_KEEPALIVE_INTERVAL if events is None else SSE_PARTIAL_INTERVAL):
+        payload = latest_event(events)
+        if payload is not None:
+            yield f"data: {json.dumps(payload)}\\n\\n"
+            last_write = time.time()
+        elif time.time() - last_write >= SSE_KEEPALIVE_INTERVAL:
+            yield ": keepalive\\n\\n"
+            last_write = time.time()
+    
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+# Optional request fields that set generation options (validated by generation_error)
+GENERATION_FIELDS = ('profile', 'temperature', 'max_length', 'latency_budget_ms')
+
+def generation_error(data: Dict[str, Any]):
+    """Validate the optional 'profile', 'temperature', 'max_length' and 'latency_budget_ms' fields (error message or None)"""
+    profile = data.get('profile')
+    if profile is not None and profile not in paraphraser.generation_profiles:
+        return f"Unknown profile (available: {', '.join(paraphraser.generation_profiles)})"
+    
+    max_length = data.get('max_length')
+    if max_length is not None and (max_length < 10 or max_length > 1000):
+        return 'Max length must be between 10 and 1000'
+    
+    temperature = data.get('temperature')
+    if temperature is not None and (temperature < 0.1 or temperature > 2.0):
+        return 'Temperature must be between 0.1 and 2.0'
+    
+    latency_budget_ms = data.get('latency_budget_ms')
+    if latency_budget_ms is not None and latency_budget_ms <= 0:
+        return 'Latency budget must be positive'
+    return None
+
+def request_options(data: Dict[str, Any], **overrides):
+    """ParaphraseOptions with the generation fields of a request applied (see GENERATION_FIELDS)"""
+    fields = {key: data[key] for key in ('profile', 'temperature', 'max_length') if data.get(key) is not None}
+    if data.get('latency_budget_ms') is not None:
+        fields['latency_budget'] = data['latency_budget_ms'] / 1000.0
+    return paraphraser.default_options(**fields, **overrides)
+
 @app.route('/')
 def index():
     """Serve the HTML interface"""
@@ -58,6 +223,8 @@ def index():
 @app.route('/paraphrase-stream', methods=['POST'])
 def paraphrase_stream():
     """Handle paraphrasing with Server-Sent Events streaming"""
+    cancel_token = CancellationToken()
+    
     def generate():
         try:
             # Get JSON data from request
@@ -80,6 +247,12 @@ def paraphrase_stream():
             method = data.get('method', 'hybrid')
             num_variations = data.get('num_variations', 5)
             min_quality = data.get('min_quality', 70)
+            stream_tokens = bool(data.get('stream_tokens', False))  # 'partial' events while generating
+            
+            error = generation_error(data)
+            if error:
+                yield f"data: {json.dumps({'error': error})}\\n\\n"
+                return
             
             # Send initial status
             yield f"data: {json.dumps({'status': 'started', 'message': 'Memulai proses parafrase...'})}\\n\\n"
@@ -88,12 +261,21 @@ def paraphrase_stream():
             request_count = min(num_variations * 2, 10)
             
             paraphrases = []
+            partials = Queue()
             
             # Generate variations one by one and stream progress
             for i in range(request_count):
                 yield f"data: {json.dumps({'status': 'progress', 'current': i+1, 'total': request_count, 'message': f'Menghasilkan variasi {i+1}/{request_count}...'})}\\n\\n"
                 
-                result = paraphraser.paraphrase(text, method=method)
+                options = request_options(
+                    data, cancel_token=cancel_token,
+                    on_partial=partial_events(partials, i + 1) if stream_tokens else None
+                )
+                result = yield from call_with_keepalive(
+                    paraphraser.paraphrase, text, method=method, options=options,
+                    events=partials if stream_tokens else None
+                )
+                latest_event(partials)  # Partial output is superseded by the scored result
                 
                 if result.success and result.quality_score >= min_quality:
                     paraphrase_data = {
@@ -104,12 +286,17 @@ def paraphrase_stream():
                         'fluency_score': float(result.fluency_score),
                         'method': result.method_used,
                         'processing_time': float(result.processing_time),
+                        'profile': result.generation_profile,
+                        'deadline_exceeded': result.deadline_exceeded,
                         'success': result.success
                     }
                     paraphrases.append(paraphrase_data)
                     
                     # Stream the new result immediately
                     yield f"data: {json.dumps({'status': 'result', 'variation': i+1, 'data': paraphrase_data, 'total_found': len(paraphrases)})}\\n\\n"
+                elif stream_tokens:
+                    # Streamed partial output that did not make it into the results
+                    yield f"data: {json.dumps({'status': 'discarded', 'variation': i+1, 'quality_score': float(result.quality_score)})}\\n\\n"
                 
                 # Check if we have enough results
                 if len(paraphrases) >= num_variations:
@@ -122,6 +309,11 @@ def paraphrase_stream():
             # Send completion
             yield f"data: {json.dumps({'status': 'completed', 'total_variations': len(paraphrases), 'paraphrases': paraphrases, 'original_text': text})}\\n\\n"
             
+        except GeneratorExit:
+            # Client disconnected: stop the engine work started for it
+            cancel_token.cancel("client disconnected")
+            paraphraser.record_cancellation(cancel_token)
+            raise
         except Exception as e:
             logger.error(f"Error in streaming: {e}", exc_info=True)
             yield f"data: {json.dumps({'status': 'error', 'error': str(e)})}\\n\\n"
@@ -151,8 +343,7 @@ def paraphrase():
         method = data.get('method', 'hybrid')
         num_variations = data.get('num_variations', 5)
         min_quality = data.get('min_quality', 70)  # Percentage scale (0-100)
-        max_length = data.get('max_length', 200)
-        temperature = data.get('temperature', 1.0)
+        sentence_mode = bool(data.get('sentence_mode', False))
         
         # Validate parameters
         if method not in ['hybrid', 'neural', 'rule-based']:
@@ -164,12 +355,6 @@ def paraphrase():
         if min_quality < 0 or min_quality > 100:
             return jsonify({'error': 'Min quality must be between 0 and 100'}), 400
         
-        if max_length < 10 or max_length > 1000:
-            return jsonify({'error': 'Max length must be between 10 and 1000'}), 400
-        
-        if temperature < 0.1 or temperature > 2.0:
-            return jsonify({'error': 'Temperature must be between 0.1 and 2.0'}), 400
-        
         logger.info(f"Processing text: {text[:50]}... with method: {method}, min_quality: {min_quality}%")
         
         # Check if paraphraser is initialized
@@ -177,18 +362,28 @@ def paraphrase():
             logger.error("Paraphraser not initialized")
             return jsonify({'error': 'Paraphraser not initialized. Please restart the server.'}), 500
         
-        # Generate paraphrases using generate_variations for unique results
-        # Request more variations to ensure we have enough after quality filtering
-        request_count = min(num_variations * 2, 10)  # Request up to 2x, max 10
-        results = paraphraser.generate_variations(
-            text, 
-            num_variations=request_count, 
-            method=method,
-            min_quality_threshold=min_quality
-        )
+        error = generation_error(data)
+        if error:
+            return jsonify({'error': error}), 400
+        options = request_options(data)
+        
+        if sentence_mode:
+            # Sentence-parallel: all sentences in one batched generate() call
+            results = [paraphraser.paraphrase_sentences(text, method=method, options=options)]
+        else:
+            # Generate paraphrases using generate_variations for unique results
+            # Request more variations to ensure we have enough after quality filtering
+            request_count = min(num_variations * 2, 10)  # Request up to 2x, max 10
+            results = paraphraser.generate_variations(
+                text, 
+                num_variations=request_count, 
+                method=method,
+                min_quality_threshold=min_quality,
+                options=options
+            )
         paraphrases = []
         for result in results:
-            paraphrases.append({
+            paraphrase_data = {
                 'text': result.paraphrased_text,
                 'quality_score': float(result.quality_score),
                 'semantic_similarity': float(result.semantic_similarity),
@@ -199,8 +394,13 @@ def paraphrase():
                 'transformations': result.transformations_applied,
                 'word_changes': result.word_changes,
                 'syntax_changes': result.syntax_changes,
+                'profile': result.generation_profile,
+                'deadline_exceeded': result.deadline_exceeded,
                 'success': result.success
-            })
+            }
+            if result.sentence_results:
+                paraphrase_data['sentences'] = [sentence_summary(r) for r in result.sentence_results]
+            paraphrases.append(paraphrase_data)
         
         # Sort by quality score (descending)
         paraphrases.sort(key=lambda x: x['quality_score'], reverse=True)
@@ -235,6 +435,36 @@ def paraphrase():
         logger.error(f"Error processing paraphrase request: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/estimate', methods=['POST'])
+def estimate():
+    """Predict per-profile latency of a request without running the model"""
+    try:
+        data = request.get_json()
+        
+        if not data or not data.get('text', '').strip():
+            return jsonify({'error': 'No text provided'}), 400
+        
+        method = data.get('method', 'hybrid')
+        if method not in ['hybrid', 'neural', 'rule-based']:
+            return jsonify({'error': 'Invalid method'}), 400
+        
+        if paraphraser is None:
+            return jsonify({'error': 'Paraphraser not initialized. Please restart the server.'}), 500
+        
+        error = generation_error(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        latency_budget_ms = data.get('latency_budget_ms')
+        return jsonify(paraphraser.estimate_latency(
+            data['text'].strip(), method=method,
+            latency_budget=latency_budget_ms / 1000.0 if latency_budget_ms is not None else None
+        )), 200
+        
+    except Exception as e:
+        logger.error(f"Error estimating latency: {e}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -243,6 +473,36 @@ def health():
         'paraphraser_ready': paraphraser is not None
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Runtime metrics (model info, inference scheduler statistics)"""
+    if paraphraser is None:
+        return jsonify({'error': 'Paraphraser not initialized'}), 503
+    return jsonify(paraphraser.get_model_info())
+
+def sentence_summary(result) -> Dict[str, Any]:
+    """Per-sentence metrics of a sentence-parallel result"""
+    return {
+        'original': result.original_text,
+        'text': result.paraphrased_text,
+        'quality_score': float(result.quality_score),
+        'semantic_similarity': float(result.semantic_similarity),
+        'lexical_diversity': float(result.lexical_diversity),
+        'fluency_score': float(result.fluency_score),
+        'success': result.success
+    }
+
+def chunk_summary(chunk_index: int, original: str, result) -> Dict[str, Any]:
+    """Chunk result with per-sentence metrics (sentence-map chunk pipeline)"""
+    return {
+        'chunk_index': chunk_index,
+        'original': original,
+        'paraphrased': result.paraphrased_text,
+        'quality_score': float(result.quality_score),
+        'success': result.success,
+        'sentences': [sentence_summary(r) for r in result.sentence_results]
+    }
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
@@ -308,30 +568,47 @@ def paraphrase_chunks():
         
         chunks = data['chunks']
         method = data.get('method', 'hybrid')
+        sentence_mode = bool(data.get('sentence_mode', True))
         
         if not chunks:
             return jsonify({'error': 'Empty chunks array'}), 400
         
+        error = generation_error(data)
+        if error:
+            return jsonify({'error': error}), 400
+        options = request_options(data)
+        
         results = []
-        paraphrased_chunks = []
         
-        for i, chunk in enumerate(chunks):
-            if chunk.strip():
-                logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-                result = paraphraser.paraphrase(chunk.strip(), method=method)
-                
-                results.append({
-                    'chunk_index': i,
-                    'original': chunk,
-                    'paraphrased': result.paraphrased_text,
-                    'quality_score': float(result.quality_score),
-                    'success': result.success
-                })
-                
-                paraphrased_chunks.append(result.paraphrased_text)
+        if sentence_mode:
+            # Sentence map: overlapping sentences are paraphrased once, the document is rebuilt by ID
+            indices = [i for i, chunk in enumerate(chunks) if chunk.strip()]
+            document_result, chunk_results = paraphraser.paraphrase_chunks(
+                [chunks[i].strip() for i in indices], method=method, options=options
+            )
+            for i, result in zip(indices, chunk_results):
+                results.append(chunk_summary(i, chunks[i], result))
+            combined_text = document_result.paraphrased_text if indices else ""
+        else:
+            paraphrased_chunks = []
+            for i, chunk in enumerate(chunks):
+                if chunk.strip():
+                    logger.info(f"Processing chunk {i+1}/{len(chunks)}")
+                    result = paraphraser.paraphrase(chunk.strip(), method=method, options=options)
+                    
+                    results.append({
+                        'chunk_index': i,
+                        'original': chunk,
+                        'paraphrased': result.paraphrased_text,
+                        'quality_score': float(result.quality_score),
+                        'success': result.success
+                    })
+                    
+                    paraphrased_chunks.append(result.paraphrased_text)
+            
+            # Smart combining: remove duplicate overlaps and join smoothly
+            combined_text = smart_combine_chunks(paraphrased_chunks)
         
-        # Smart combining: remove duplicate overlaps and join smoothly
-        combined_text = smart_combine_chunks(paraphrased_chunks)
         avg_quality = sum(r['quality_score'] for r in results) / len(results) if results else 0
         
         logger.info(f"Successfully processed {len(results)} chunks")
@@ -347,6 +624,292 @@ def paraphrase_chunks():
         logger.error(f"Error paraphrasing chunks: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/paraphrase-chunks-stream', methods=['POST'])
+def paraphrase_chunks_stream():
+    """Paraphrase document chunks on a worker pool, streaming each chunk (in order) via SSE"""
+    cancel_token = CancellationToken()
+    
+    def generate():
+        try:
+            data = request.get_json()
+            
+            if not data or 'chunks' not in data:
+                yield f"data: {json.dumps({'status': 'error', 'error': 'No chunks provided'})}\\n\\n"
+                return
+            
+            chunks = data['chunks']
+            method = data.get('method', 'hybrid')
+            
+            indices = [i for i, chunk in enumerate(chunks) if chunk.strip()]
+            if not indices:
+                yield f"data: {json.dumps({'status': 'error', 'error': 'Empty chunks array'})}\\n\\n"
+                return
+            
+            if paraphraser is None:
+                yield f"data: {json.dumps({'status': 'error', 'error': 'Paraphraser not initialized'})}\\n\\n"
+                return
+            
+            error = generation_error(data)
+            if error:
+                yield f"data: {json.dumps({'status': 'error', 'error': error})}\\n\\n"
+                return
+            
+            yield f"data: {json.dumps({'status': 'started', 'total_chunks': len(indices), 'message': 'Memulai parafrase dokumen...'})}\\n\\n"
+            
+            quality_scores = []
+            results = paraphraser.iter_paraphrase_chunks(
+                [chunks[i].strip() for i in indices],
+                method=method,
+                options=request_options(data, cancel_token=cancel_token),
+                batch_size=app_config.chunk_batch_size,
+                max_workers=app_config.chunk_workers
+            )
+            while True:
+                position, result = yield from call_with_keepalive(next, results)
+                if position is None:
+                    # Document rebuilt from the sentence map
+                    average_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
+                    yield f"data: {json.dumps({'status': 'completed', 'chunks_processed': len(quality_scores), 'combined_text': result.paraphrased_text, 'average_quality': average_quality})}\\n\\n"
+                    break
+                
+                quality_scores.append(float(result.quality_score))
+                chunk_data = chunk_summary(indices[position], chunks[indices[position]], result)
+                yield f"data: {json.dumps({'status': 'chunk', 'completed': position + 1, 'total': len(indices), 'data': chunk_data})}\\n\\n"
+            
+        except GeneratorExit:
+            # Client disconnected: running chunks stop, queued chunks never start
+            cancel_token.cancel("client disconnected")
+            paraphraser.record_cancellation(cancel_token)
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming chunks: {e}", exc_info=True)
+            yield f"data: {json.dumps({'status': 'error', 'error': str(e)})}\\n\\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
+# ============================================================================
+# ASYNC DOCUMENT JOBS
+# ============================================================================
+
+def reap_expired_jobs():
+    """Requeue and resubmit jobs whose lease expired, for as long as the app runs"""
+    while True:
+        time.sleep(max(job_store.lease_timeout / 3, 1.0))
+        try:
+            for job_id in job_store.requeue_interrupted():
+                logger.info(f"Resuming job {job_id} (lease expired)")
+                job_executor.submit(run_job, job_id)
+        except Exception as e:
+            logger.error(f"Job reaper failed: {e}", exc_info=True)
+
+def keep_job_lease(job_id: str, stop: threading.Event, lease: CancellationToken):
+    """Renew this worker's lease on a running job until stop is set; cancels lease once it is lost"""
+    while not stop.wait(max(job_store.lease_timeout / 3, 1.0)):
+        if not job_store.heartbeat(job_id):
+            lease.cancel("lease lost")
+            return
+
+def run_job(job_id: str):
+    """Paraphrase the chunks of a job that have no checkpoint yet, then store the document result"""
+    if not job_store.claim_job(job_id):
+        return
+    
+    # Cancelled when another worker takes the job over: its chunks stop and nothing more is written
+    lease = CancellationToken()
+    stop_lease = threading.Event()
+    threading.Thread(target=keep_job_lease, args=(job_id, stop_lease, lease), name="job-lease", daemon=True).start()
+    try:
+        job = job_store.get_job(job_id)
+        pending = [chunk for chunk in job_store.get_chunks(job_id) if chunk['result'] is None]
+        logger.info(f"Job {job_id}: {len(pending)}/{job['total_chunks']} chunks pending")
+        
+        if pending:
+            for position, result in paraphraser.iter_paraphrase_chunks(
+                [chunk['text'] for chunk in pending],
+                method=job['method'],
+                options=request_options(job['options'], cancel_token=lease),
+                batch_size=app_config.chunk_batch_size,
+                max_workers=app_config.chunk_workers
+            ):
+                if position is None or lease.cancelled:
+                    break
+                chunk = pending[position]
+                # Failed chunks get no checkpoint, so a resumed job runs them again
+                if not result.success:
+                    logger.warning(f"Job {job_id}: chunk {chunk['chunk_index']} failed ({result.error_message})")
+                    continue
+                if not job_store.save_chunk_result(job_id, chunk['chunk_index'],
+                                                   chunk_summary(chunk['chunk_index'], chunk['text'], result)):
+                    lease.cancel("lease lost")
+                    break
+        
+        if lease.cancelled:
+            logger.warning(f"Job {job_id}: lease lost, leaving the job to its new worker")
+            return
+        
+        chunks = job_store.get_chunks(job_id)
+        failed = sum(chunk['result'] is None for chunk in chunks)
+        if failed:
+            job_store.set_status(job_id, JOB_FAILED, error=f"{failed}/{len(chunks)} chunks failed")
+            logger.warning(f"Job {job_id} failed: {failed}/{len(chunks)} chunks failed")
+            return
+        
+        if job_store.set_status(job_id, JOB_COMPLETED, result=combine_job_chunks(chunks)):
+            logger.info(f"Job {job_id} completed")
+        else:
+            logger.warning(f"Job {job_id}: lease lost, leaving the job to its new worker")
+    except OperationCancelled:
+        logger.warning(f"Job {job_id}: lease lost, leaving the job to its new worker")
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+        job_store.set_status(job_id, JOB_FAILED, error=str(e))
+    finally:
+        stop_lease.set()
+
+def combine_job_chunks(chunks) -> Dict[str, Any]:
+    """Rebuild the document of a job from its checkpointed chunks (sentence map, no overlap)"""
+    sentences, chunk_ids, document_ids = file_parser.map_chunk_sentences([chunk['text'] for chunk in chunks])
+    
+    paraphrased = {}
+    for chunk, ids in zip(chunks, chunk_ids):
+        for i, sentence in zip(ids, chunk['result']['sentences']):
+            paraphrased.setdefault(i, sentence['text'])
+    
+    quality_scores = [chunk['result']['quality_score'] for chunk in chunks]
+    return {
+        'combined_text': " ".join(paraphrased.get(i, sentences[i]) for i in document_ids),
+        'average_quality': sum(quality_scores) / len(quality_scores) if quality_scores else 0,
+        'chunks_processed': len(chunks)
+    }
+
+def job_status(job) -> Dict[str, Any]:
+    """Public status fields of a job"""
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'method': job['method'],
+        'options': job['options'],
+        'total_chunks': job['total_chunks'],
+        'completed_chunks': job['completed_chunks'],
+        'progress': job['completed_chunks'] / job['total_chunks'] if job['total_chunks'] else 1.0,
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    }
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Submit a document for background paraphrasing (JSON with 'chunks' or 'text')"""
+    if job_store is None or paraphraser is None:
+        return jsonify({'error': 'Job API not available'}), 503
+    
+    data = request.get_json()
+    if not data or ('chunks' not in data and 'text' not in data):
+        return jsonify({'error': 'No chunks or text provided'}), 400
+    
+    method = data.get('method', 'hybrid')
+    if method not in ['hybrid', 'neural', 'rule-based']:
+        return jsonify({'error': 'Invalid method'}), 400
+    
+    error = generation_error(data)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    chunks = data['chunks'] if 'chunks' in data else file_parser.chunk_text(data['text'])
+    chunks = [chunk.strip() for chunk in chunks if chunk and chunk.strip()]
+    if not chunks:
+        return jsonify({'error': 'Empty document'}), 400
+    
+    # The generation fields are stored with the job and applied when it runs (or resumes)
+    options = {key: data[key] for key in GENERATION_FIELDS if data.get(key) is not None}
+    job_id = job_store.create_job(chunks, method, options)
+    job_executor.submit(run_job, job_id)
+    logger.info(f"Job {job_id} submitted ({len(chunks)} chunks)")
+    
+    return jsonify(job_status(job_store.get_job(job_id))), 202, {'Location': f'/jobs/{job_id}'}
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll the status of a job"""
+    if job_store is None:
+        return jsonify({'error': 'Job API not available'}), 503
+    
+    job = job_store.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_status(job)), 200
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def delete_job(job_id):
+    """Delete a finished job and its results"""
+    if job_store is None:
+        return jsonify({'error': 'Job API not available'}), 503
+    
+    job = job_store.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] in UNFINISHED_STATUSES:
+        return jsonify({'error': 'Job is still running'}), 409
+    
+    job_store.delete_job(job_id)
+    return jsonify({'success': True, 'job_id': job_id}), 200
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Fetch the result of a completed job (202 while it is still running)"""
+    if job_store is None:
+        return jsonify({'error': 'Job API not available'}), 503
+    
+    job = job_store.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] == JOB_FAILED:
+        return jsonify({**job_status(job), 'success': False}), 500
+    if job['status'] != JOB_COMPLETED:
+        return jsonify(job_status(job)), 202
+    
+    return jsonify({
+        **job_status(job),
+        **job['result'],
+        'success': True,
+        'chunk_results': [chunk['result'] for chunk in job_store.get_chunks(job_id)]
+    }), 200
+
+@app.route('/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """Stream checkpointed chunk results of a job via SSE until it finishes"""
+    if job_store is None:
+        return jsonify({'error': 'Job API not available'}), 503
+    if job_store.get_job(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    def generate():
+        try:
+            sent = set()
+            job = job_store.get_job(job_id)
+            yield f"data: {json.dumps({'status': 'started', 'job': job_status(job)})}\\n\\n"
+            
+            while True:
+                job = job_store.get_job(job_id)
+                for chunk in job_store.get_chunks(job_id):
+                    if chunk['result'] is not None and chunk['chunk_index'] not in sent:
+                        sent.add(chunk['chunk_index'])
+                        yield f"data: {json.dumps({'status': 'chunk', 'completed': len(sent), 'total': job['total_chunks'], 'data': chunk['result']})}\\n\\n"
+                
+                if job['status'] == JOB_COMPLETED:
+                    yield f"data: {json.dumps({'status': 'completed', **job['result']})}\\n\\n"
+                    return
+                if job['status'] == JOB_FAILED:
+                    yield f"data: {json.dumps({'status': 'error', 'error': job['error']})}\\n\\n"
+                    return
+                
+                time.sleep(JOB_STREAM_POLL_INTERVAL)
+        except Exception as e:
+            logger.error(f"Error streaming job {job_id}: {e}", exc_info=True)
+            yield f"data: {json.dumps({'status': 'error', 'error': str(e)})}\\n\\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
 def smart_combine_chunks(chunks):
     """
     Combine chunks intelligently by removing duplicate overlaps
@@ -0,0 +1,243 @@
+"""
+Benchmark Inference - IndoT5 Hybrid Paraphraser
+Membandingkan latensi dan kualitas varian inferensi IndoT5 (torch fp32, ONNX Runtime, int8)
+pada TEST_SENTENCES dari run_research_test.py dan menyimpan hasil ke 'hasil/benchmarks/'
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+from typing import List, Dict, Any
+
+import numpy as np
+import torch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from engines.generation_utils import SeededGumbelSampler
+from engines.indot5_hybrid_engine import IndoT5HybridParaphraser
+from engines.onnx_backend import default_onnx_dir, export_onnx_model, onnx_export_exists
+from engines.quantization import model_size_mb
+from run_research_test import TEST_SENTENCES, HASIL_DIR, get_timestamp, print_header
+
+BENCHMARK_DIR = os.path.join(HASIL_DIR, "benchmarks")
+
+# Varian inferensi yang dibandingkan (torch fp32 adalah baseline)
+VARIANTS = {
+    "torch": {"backend": "torch", "quantization": None},
+    "onnx": {"backend": "onnx", "quantization": None},
+    "int8": {"backend": "torch", "quantization": "int8"}
+}
+
+# ============================================================================
+# FUNGSI UTILITAS
+# ============================================================================
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """Ringkasan latensi dalam milidetik"""
+    values = np.array(latencies) * 1000.0
+    return {
+        "mean_ms": float(round(values.mean(), 2)),
+        "p50_ms": float(round(np.percentile(values, 50), 2)),
+        "p95_ms": float(round(np.percentile(values, 95), 2)),
+        "min_ms": float(round(values.min(), 2)),
+        "max_ms": float(round(values.max(), 2))
+    }
+
+def get_model_size_mb(paraphraser: IndoT5HybridParaphraser) -> float:
+    """Ukuran model IndoT5 dalam MB"""
+    if paraphraser.backend == "onnx":
+        total = sum(
+            os.path.getsize(os.path.join(paraphraser.onnx_model_dir, name))
+            for name in os.listdir(paraphraser.onnx_model_dir)
+            if name.endswith(".onnx") or name.endswith(".onnx_data")
+        )
+        return float(round(total / (1024 * 1024), 2))
+    return float(round(model_size_mb(paraphraser.model), 2))
+
+def compare_with_baseline(results: Dict[str, Any], baseline: str = "torch") -> Dict[str, Any]:
+    """
+    Laporan kualitas vs latensi setiap varian relatif terhadap baseline fp32
+    """
+    if baseline not in results:
+        return {}
+
+    base = results[baseline]
+    comparison = {}
+    for variant, stats in results.items():
+        if variant == baseline:
+            continue
+        comparison[variant] = {
+            "generate_speedup_p50": float(round(base["generate"]["p50_ms"] / stats["generate"]["p50_ms"], 2))
+            if stats["generate"]["p50_ms"] else None,
+            "pipeline_speedup_p50": float(round(base["pipeline"]["p50_ms"] / stats["pipeline"]["p50_ms"], 2))
+            if stats["pipeline"]["p50_ms"] else None,
+            "semantic_similarity_delta": float(round(
+                stats["average_semantic_similarity"] - base["average_semantic_similarity"], 4)),
+            "quality_score_delta": float(round(
+                stats["average_quality_score"] - base["average_quality_score"], 2)),
+            "model_size_ratio": float(round(stats["model_size_mb"] / base["model_size_mb"], 3))
+            if base["model_size_mb"] else None
+        }
+    return comparison
+
+def benchmark_paraphraser(paraphraser: IndoT5HybridParaphraser,
+                          sentences: List[str],
+                          runs: int = 3) -> Dict[str, Any]:
+    """
+    Mengukur latensi generate() dan pipeline hybrid lengkap untuk satu paraphraser
+    """
+    # Cache dimatikan agar setiap run benar-benar menjalankan model
+    paraphraser.enable_caching = False
+
+    # Warm-up (inisialisasi sesi / alokasi memori)
+    paraphraser._generate_candidates([sentences[0]])
+
+    generate_latencies = []
+    pipeline_latencies = []
+    semantic_scores = []
+    quality_scores = []
+
+    for run in range(runs):
+        print(f"   🔄 Run {run + 1}/{runs}...")
+        for sentence in sentences:
+            start = time.time()
+            paraphraser._generate_candidates([sentence])
+            generate_latencies.append(time.time() - start)
+
+            start = time.time()
+            result = paraphraser.paraphrase(sentence, method="hybrid")
+            pipeline_latencies.append(time.time() - start)
+
+            if result.success:
+                semantic_scores.append(float(result.semantic_similarity))
+                quality_scores.append(float(result.quality_score))
+
+    return {
+        "backend": paraphraser.backend,
+        "quantization": paraphraser.quantization,
+        "model_size_mb": get_model_size_mb(paraphraser),
+        "runs": runs,
+        "sentences": len(sentences),
+        "generate": summarize_latencies(generate_latencies),
+        "pipeline": summarize_latencies(pipeline_latencies),
+        "average_semantic_similarity": float(round(np.mean(semantic_scores), 4)) if semantic_scores else 0.0,
+        "average_quality_score": float(round(np.mean(quality_scores), 2)) if quality_scores else 0.0
+    }
+
+def benchmark_gumbel_sampler(rows: int = 16, steps: int = 256, vocab_size: int = 32128,
+                             prompt_rows: int = 2) -> Dict[str, Any]:
+    """
+    Overhead pelacakan parent beam di SeededGumbelSampler dibanding undian Gumbel saja
+
+    Default: profil "best" (2 strategi x 8 beam = 16 baris) selama 256 langkah,
+    dengan beam diacak ulang setiap langkah seperti beam search.
+    """
+    generator = torch.Generator().manual_seed(0)
+    sampler = SeededGumbelSampler([torch.Generator().manual_seed(i) for i in range(prompt_rows)])
+    beams = rows // prompt_rows
+    input_ids = torch.zeros(rows, 1, dtype=torch.long)
+    scores = torch.zeros(rows, vocab_size)
+    sampler_time = draw_time = 0.0
+
+    for _ in range(steps):
+        start = time.perf_counter()
+        sampler(input_ids, scores)
+        sampler_time += time.perf_counter() - start
+
+        # Undian Gumbel saja, yang harus dibayar sampler mana pun
+        start = time.perf_counter()
+        uniform = torch.rand((rows, vocab_size), generator=generator).clamp(min=1e-30, max=1.0 - 1e-7)
+        -torch.log(-torch.log(uniform))
+        draw_time += time.perf_counter() - start
+
+        parents = torch.randint(beams, (rows,), generator=generator) + torch.arange(rows) // beams * beams
+        tokens = torch.randint(vocab_size, (rows, 1), generator=generator)
+        input_ids = torch.cat([input_ids[parents], tokens], dim=1)
+
+    return {
+        "rows": rows,
+        "steps": steps,
+        "vocab_size": vocab_size,
+        "sampler_ms_per_step": float(round(sampler_time / steps * 1000.0, 4)),
+        "draws_ms_per_step": float(round(draw_time / steps * 1000.0, 4)),
+        "overhead_ms_per_step": float(round((sampler_time - draw_time) / steps * 1000.0, 4))
+    }
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark varian inferensi IndoT5")
+    parser.add_argument("--model-name", default="Wikidepia/IndoT5-base")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--onnx-dir", default=None, help="Direktori export ONNX")
+    parser.add_argument("--export", action="store_true", help="Export model ke ONNX sebelum benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--sampler-overhead", action="store_true",
+                        help="Hanya ukur overhead SeededGumbelSampler (16 baris x 256 langkah)")
+    args = parser.parse_args()
+
+    if args.sampler_overhead:
+        print_header("BENCHMARK SEEDED GUMBEL SAMPLER")
+        stats = benchmark_gumbel_sampler()
+        print(f"📊 sampler {stats['sampler_ms_per_step']}ms/langkah | undian {stats['draws_ms_per_step']}ms/langkah | "
+              f"overhead {stats['overhead_ms_per_step']}ms/langkah")
+        return
+
+    onnx_dir = args.onnx_dir or default_onnx_dir(args.model_name)
+
+    if args.export or ("onnx" in args.variants and not onnx_export_exists(onnx_dir)):
+        print_header("EXPORT ONNX")
+        export_onnx_model(args.model_name, onnx_dir)
+        print(f"✅ Export tersimpan di: {onnx_dir}")
+
+    report = {
+        "benchmark_id": f"BENCH-{get_timestamp()}",
+        "timestamp": datetime.now().isoformat(),
+        "model_name": args.model_name,
+        "results": {}
+    }
+
+    for variant in args.variants:
+        print_header(f"BENCHMARK VARIANT: {variant.upper()}")
+        settings = VARIANTS[variant]
+        paraphraser = IndoT5HybridParaphraser(
+            model_name=args.model_name,
+            use_gpu=False,
+            backend=settings["backend"],
+            onnx_model_dir=onnx_dir,
+            quantization=settings["quantization"]
+        )
+
+        if paraphraser.backend != settings["backend"]:
+            print(f"⚠️ Backend {settings['backend']} tidak tersedia, menggunakan {paraphraser.backend}")
+
+        stats = benchmark_paraphraser(paraphraser, TEST_SENTENCES, runs=args.runs)
+        report["results"][variant] = stats
+
+        print(f"\n📊 {variant}: generate p50={stats['generate']['p50_ms']}ms "
+              f"p95={stats['generate']['p95_ms']}ms | pipeline p50={stats['pipeline']['p50_ms']}ms | "
+              f"semantic={stats['average_semantic_similarity']} | quality={stats['average_quality_score']} | "
+              f"size={stats['model_size_mb']}MB")
+
+    # Laporan kualitas vs latensi relatif terhadap torch fp32
+    report["comparison_vs_fp32"] = compare_with_baseline(report["results"])
+    for variant, delta in report["comparison_vs_fp32"].items():
+        print(f"\n🚀 {variant} vs fp32: speedup generate {delta['generate_speedup_p50']}x | "
+              f"semantic Δ {delta['semantic_similarity_delta']:+} | quality Δ {delta['quality_score_delta']:+} | "
+              f"size x{delta['model_size_ratio']}")
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    output_file = os.path.join(BENCHMARK_DIR, f"benchmark_{get_timestamp()}.json")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Saved: {output_file}")
+
+if __name__ == "__main__":
+    main()
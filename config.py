@@ -4,12 +4,15 @@ Contains settings for IndoT5 neural model and rule-based transformations
 """
 
 import os
+import copy
 import json
 import logging
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from generation_profiles import DEFAULT_GENERATION_PROFILE, DEFAULT_GENERATION_PROFILES
+
 # Base paths
 BASE_DIR = Path(__file__).parent
 PROJECT_ROOT = BASE_DIR.parent
@@ -41,6 +44,60 @@ class IndoT5HybridConfig:
     top_p: float = 0.95
     repetition_penalty: float = 1.6
     
+    # Generation profiles (latency tiers), selectable per request with "profile"
+    default_generation_profile: str = DEFAULT_GENERATION_PROFILE
+    generation_profiles: Dict[str, Dict[str, Any]] = field(
+        default_factory=lambda: copy.deepcopy(DEFAULT_GENERATION_PROFILES)
+    )
+    
+    # Early exit: later prompt strategies run only when the first strategy's best
+    # candidate misses these thresholds (semantic similarity, word overlap)
+    enable_early_exit: bool = True
+    early_exit_similarity: float = 0.85
+    early_exit_max_overlap: float = 0.6
+    
+    # Adaptive hybrid stages: rule stages are skipped for neural results that are
+    # already diverse (1 - word overlap); reordering also needs this similarity
+    adaptive_stages: bool = True
+    stage_skip_diversity: float = 0.5
+    stage_skip_syntax_diversity: float = 0.7
+    stage_reorder_min_similarity: float = 0.75
+    
+    # Constrained decoding: block prompt echoes and colon garbage during generate()
+    constrained_decoding: bool = True
+    
+    # Max model.generate() calls at once (scheduler, chunk/job pools, streaming share it)
+    max_concurrent_generate: int = 1
+    
+    # Inference backend: "torch" or "onnx" (ONNX Runtime, falls back to torch when no export exists)
+    inference_backend: str = "torch"
+    onnx_model_dir: Optional[str] = None
+    
+    # CPU quantization of the torch model: None (fp32) or "int8" (dynamic, cached on disk)
+    quantization: Optional[str] = None
+    quantized_cache_dir: Optional[str] = None
+    
+    # LRU cache of T5 encoder outputs per (prefix, text); repeated requests only run the decoder
+    encoder_cache_size: int = 256
+    encoder_cache_max_mb: float = 128.0
+    
+    # Bounded in-memory caches (LRU + approximate byte budget, results expire after TTL)
+    result_cache_size: int = 1024
+    result_cache_max_mb: float = 64.0
+    result_cache_ttl: Optional[float] = 3600.0  # seconds, None = never
+    similarity_cache_size: int = 4096
+    synonym_cache_size: int = 4096
+    
+    # Persistent sentence-embedding store (sqlite + memory-mapped float16, shared by workers)
+    enable_embedding_store: bool = True
+    embedding_store_dir: Optional[str] = None  # default: models/embeddings
+    
+    # Result cache shared by all worker processes (sqlite, LRU + TTL eviction)
+    enable_result_store: bool = True
+    result_store_path: Optional[str] = None  # default: models/results/results.sqlite
+    result_store_max_entries: int = 100000
+    result_store_ttl: Optional[float] = 7 * 24 * 3600  # seconds, None = never
+    
     # Quality thresholds
     min_quality_threshold: float = 50.0
     neural_confidence_threshold: float = 0.5
@@ -74,6 +131,23 @@ class IndoT5HybridConfig:
     enable_batch_processing: bool = True
     max_batch_size: int = 10
     
+    # Document chunks (/paraphrase-chunks-stream worker pool)
+    chunk_workers: int = 2
+    chunk_batch_size: int = 16
+    
+    # Asynchronous document jobs (/jobs API, sqlite checkpoints, resumed on restart)
+    enable_job_api: bool = True
+    job_store_path: Optional[str] = None  # default: models/jobs/jobs.sqlite
+    job_workers: int = 1
+    job_lease_timeout: float = 300.0  # seconds without a heartbeat before another worker resumes a job
+    
+    # Inference scheduler (cross-request micro-batching for the web app)
+    enable_inference_scheduler: bool = True
+    scheduler_max_wait_ms: float = 10.0
+    scheduler_max_batch_size: int = 8
+    scheduler_max_batch_tokens: int = 4096
+    scheduler_queue_depth: int = 64
+    
     # Data files
     synonym_file: str = "sinonim_extended.json"
     transformation_rules_file: str = "transformation_rules.json"
@@ -5,12 +5,22 @@ Core paraphrasing engine with IndoT5 neural and rule-based transformations
 
 from .indot5_hybrid_engine import (
     IndoT5HybridParaphraser,
-    IndoT5HybridResult
+    IndoT5HybridResult,
+    GenerationProfile,
+    ParaphraseOptions
 )
 from .quality_scorer import QualityScorer
+from .inference_scheduler import InferenceScheduler, SchedulerQueueFullError
+from .cancellation import CancellationToken, OperationCancelled
 
 __all__ = [
     'IndoT5HybridParaphraser',
     'IndoT5HybridResult', 
-    'QualityScorer'
+    'GenerationProfile',
+    'ParaphraseOptions',
+    'QualityScorer',
+    'InferenceScheduler',
+    'SchedulerQueueFullError',
+    'CancellationToken',
+    'OperationCancelled'
 ]
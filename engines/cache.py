@@ -0,0 +1,194 @@
+"""
+In-memory caches for IndoT5 Hybrid Paraphraser
+Thread-safe LRU cache with entry/byte limits, optional TTL and hit/miss statistics
+"""
+
+import dataclasses
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import torch
+
+
+def text_key(*texts: str) -> str:
+    """Stable full-text cache key (SHA-1 over all texts)"""
+    digest = hashlib.sha1()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def approximate_size(obj: Any) -> int:
+    """
+    Approximate memory footprint of a cached value in bytes
+
+    Follows containers and dataclasses; tensors and arrays count their buffers.
+    """
+    if isinstance(obj, torch.Tensor):
+        return obj.element_size() * obj.nelement()
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(approximate_size(k) + approximate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(approximate_size(item) for item in obj)
+    if dataclasses.is_dataclass(obj):
+        return sys.getsizeof(obj) + approximate_size(vars(obj))
+    return sys.getsizeof(obj)
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache
+
+    Entries are evicted when the entry count or the approximate byte budget is
+    exceeded, and expire after ttl seconds when a TTL is set. Entries can be
+    tagged on put() and removed together with pop_tag(). Safe to share
+    between request threads and the inference scheduler worker.
+    """
+
+    def __init__(self, maxsize: int = 256,
+                 max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = approximate_size):
+        """
+        Initialize LRU cache
+
+        Args:
+            maxsize: Maximum number of entries (oldest entries are evicted first)
+            max_bytes: Approximate memory budget in bytes (None = unlimited)
+            ttl: Seconds before an entry expires (None = never)
+            sizeof: Function returning the approximate size of a value in bytes
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._data = OrderedDict()  # key -> (value, size, expires_at)
+        self._tags: Dict[Hashable, set] = {}  # tag -> keys
+        self._key_tags: Dict[Hashable, Hashable] = {}  # key -> tag
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it as most recently used"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, _, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, tag: Optional[Hashable] = None):
+        """
+        Store a value, evicting least recently used entries when over budget
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            tag: Optional group of the entry (see pop_tag)
+        """
+        size = self._sizeof(value)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            # A single value larger than the whole budget is not cached
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._data[key] = (value, size, expires_at)
+            self.bytes += size
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+                self._key_tags[key] = tag
+
+            while len(self._data) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key)
+
+    def pop_tag(self, tag: Hashable) -> int:
+        """Remove every entry stored with a tag and return how many were removed"""
+        with self._lock:
+            keys = list(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """Remove all entries (statistics are kept)"""
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+            self._key_tags.clear()
+            self.bytes = 0
+
+    def _remove(self, key: Hashable) -> Any:
+        """Remove an entry (lock must be held)"""
+        value, size, _ = self._data.pop(key)
+        self.bytes -= size
+        tag = self._key_tags.pop(key, None)
+        if tag is not None:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+        return value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        """Get cache size, memory and hit-rate statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None
+            }
@@ -0,0 +1,47 @@
+"""
+Cooperative cancellation for IndoT5 Hybrid Paraphraser
+A token is shared by a request and the engine work it started; the engine
+checks it between stages and generate() stops on it through a StoppingCriteria
+"""
+
+import threading
+from typing import Optional
+
+
+class OperationCancelled(Exception):
+    """Raised by the engine when the request's CancellationToken was cancelled"""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag
+
+    Set once (e.g. when an SSE client disconnects) and polled by the engine.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Request cancellation (later calls keep the first reason)"""
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelled if cancellation was requested"""
+        if self._event.is_set():
+            raise OperationCancelled(self._reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or timeout; returns whether the token is cancelled"""
+        return self._event.wait(timeout)
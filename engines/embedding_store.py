@@ -0,0 +1,235 @@
+"""
+Persistent embedding store for IndoT5 Hybrid Paraphraser
+Keeps sentence embeddings on disk so warm restarts and other workers skip encode()
+
+Layout per semantic model (models/embeddings/<model_name>/):
+    index.sqlite   text hash -> row number (WAL mode, many concurrent readers)
+    vectors.f16    float16 matrix of shape (capacity, dim), memory-mapped
+
+Writers append under an sqlite write lock: the vectors are written and
+flushed before their index rows are committed, so readers never see a row
+that points at unwritten data. The matrix file only grows, so mappings held
+by other processes stay valid; they remap when they see a row past their end.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_ROOT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "embeddings"
+)
+
+# Rows added whenever the matrix file has to grow
+GROWTH_ROWS = 4096
+
+# Max parameters per "IN (...)" query (sqlite default limit is 999)
+_QUERY_CHUNK = 500
+
+
+def default_embedding_dir(model_name: str, root: Optional[str] = None) -> str:
+    """Get the store directory for a semantic model name"""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+    return os.path.join(root or DEFAULT_EMBEDDING_ROOT, safe_name)
+
+
+class EmbeddingStore:
+    """
+    sqlite index + memory-mapped float16 matrix of normalized sentence embeddings
+    """
+
+    def __init__(self, store_dir: str, model_name: str):
+        """
+        Open (or create) an embedding store
+
+        Args:
+            store_dir: Directory of the store (one directory per semantic model)
+            model_name: Semantic model name, checked against the stored metadata
+        """
+        self.store_dir = store_dir
+        self.model_name = model_name
+        self.index_path = os.path.join(store_dir, "index.sqlite")
+        self.matrix_path = os.path.join(store_dir, "vectors.f16")
+
+        os.makedirs(store_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.index_path, timeout=30.0, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (text_hash TEXT PRIMARY KEY, row INTEGER NOT NULL)"
+        )
+
+        stored_model = self._get_meta("model_name")
+        if stored_model is None:
+            self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('model_name', ?)", (model_name,))
+        elif stored_model != model_name:
+            raise ValueError(f"Embedding store {store_dir} belongs to {stored_model}, not {model_name}")
+
+        dim = self._get_meta("dim")
+        self.dim = int(dim) if dim is not None else None
+        self._matrix = None
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _capacity(self) -> int:
+        """Rows available in the matrix file"""
+        if not self.dim or not os.path.exists(self.matrix_path):
+            return 0
+        return os.path.getsize(self.matrix_path) // (self.dim * 2)
+
+    def _map(self) -> None:
+        """(Re)map the matrix file"""
+        capacity = self._capacity()
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float16, mode="r+",
+                                 shape=(capacity, self.dim)) if capacity else None
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the matrix file to hold at least `rows` rows (write lock must be held)"""
+        if self._capacity() < rows:
+            new_capacity = max(rows, self._capacity() + GROWTH_ROWS)
+            with open(self.matrix_path, "ab") as f:
+                f.truncate(new_capacity * self.dim * 2)
+        if self._matrix is None or self._matrix.shape[0] < rows:
+            self._map()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up embeddings by text hash
+
+        Args:
+            keys: Text hashes (see engines.cache.text_key)
+
+        Returns:
+            Mapping of found keys to float32 vectors
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+
+        with self._lock:
+            if self.dim is None:
+                dim = self._get_meta("dim")
+                if dim is None:
+                    self.misses += len(unique_keys)
+                    return found
+                self.dim = int(dim)
+
+            rows = []
+            for start in range(0, len(unique_keys), _QUERY_CHUNK):
+                chunk = unique_keys[start:start + _QUERY_CHUNK]
+                rows.extend(self._conn.execute(
+                    f"SELECT text_hash, row FROM embeddings WHERE text_hash IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall())
+
+            if rows:
+                # Another worker may have appended past our mapping
+                max_row = max(row for _, row in rows)
+                if self._matrix is None or self._matrix.shape[0] <= max_row:
+                    self._map()
+                for key, row in rows:
+                    found[key] = np.asarray(self._matrix[row], dtype=np.float32)
+
+            self.hits += len(found)
+            self.misses += len(unique_keys) - len(found)
+
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray) -> int:
+        """
+        Append embeddings that are not stored yet
+
+        Args:
+            keys: Text hashes
+            vectors: Matrix of shape (len(keys), dim)
+
+        Returns:
+            Number of rows written
+        """
+        vectors = np.asarray(vectors)
+        if len(keys) == 0:
+            return 0
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                dim = self._get_meta("dim")
+                if dim is None:
+                    self._conn.execute("INSERT INTO meta VALUES ('dim', ?)", (str(vectors.shape[1]),))
+                    dim = vectors.shape[1]
+                self.dim = int(dim)
+                if vectors.shape[1] != self.dim:
+                    raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match store ({self.dim})")
+
+                # Skip keys already written (possibly by another worker)
+                new_items = {}
+                for key, vector in zip(keys, vectors):
+                    new_items.setdefault(key, vector)
+                new_keys = list(new_items)
+                for start in range(0, len(new_keys), _QUERY_CHUNK):
+                    chunk = new_keys[start:start + _QUERY_CHUNK]
+                    for (existing,) in self._conn.execute(
+                        f"SELECT text_hash FROM embeddings WHERE text_hash IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ):
+                        new_items.pop(existing, None)
+
+                if new_items:
+                    first_row = self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM embeddings").fetchone()[0]
+                    self._ensure_capacity(first_row + len(new_items))
+
+                    self._matrix[first_row:first_row + len(new_items)] = np.stack(list(new_items.values()))
+                    self._matrix.flush()
+
+                    self._conn.executemany(
+                        "INSERT INTO embeddings (text_hash, row) VALUES (?, ?)",
+                        [(key, first_row + i) for i, key in enumerate(new_items)]
+                    )
+
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self.writes += len(new_items)
+            return len(new_items)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        """Get store size and hit-rate statistics"""
+        rows = len(self)
+        lookups = self.hits + self.misses
+        return {
+            "path": self.store_dir,
+            "rows": rows,
+            "dim": self.dim,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None
+        }
+
+    def close(self) -> None:
+        """Close the sqlite connection and drop the mapping"""
+        with self._lock:
+            self._matrix = None
+            self._conn.close()
@@ -0,0 +1,251 @@
+"""
+Generation utilities for IndoT5 Hybrid Paraphraser
+Custom logits processors used to run several prompt strategies (and texts with their own length limits) in one generate() call,
+to keep prompt echoes and colon garbage out of the candidates, and stopping criteria used to abandon a generate() call whose requests were cancelled
+"""
+
+from typing import List, Optional, Sequence
+
+import torch
+from transformers import LogitsProcessor, StoppingCriteria
+
+
+class PerRowTemperatureWarper(LogitsProcessor):
+    """
+    Temperature warper with an individual temperature per input row
+
+    `generate()` only accepts a single temperature for the whole batch.
+    When several prompts (e.g. "parafrasekan" and "tulis ulang") are batched
+    together, each prompt keeps its own temperature through this warper.
+    Scores arrive flattened as (batch_size * num_beams, vocab_size), so every
+    input temperature is repeated for its beams.
+    """
+
+    def __init__(self, temperatures: Sequence[float]):
+        if not temperatures:
+            raise ValueError("At least one temperature is required")
+        if any(t <= 0 for t in temperatures):
+            raise ValueError(f"Temperatures must be strictly positive, got {list(temperatures)}")
+        self.temperatures = torch.tensor(list(temperatures), dtype=torch.float32)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        num_rows = scores.shape[0]
+        repeats = max(num_rows // len(self.temperatures), 1)
+        temperatures = self.temperatures.to(scores.device).repeat_interleave(repeats)[:num_rows]
+        return scores / temperatures.unsqueeze(1).to(scores.dtype)
+
+
+class PerRowLengthLogitsProcessor(LogitsProcessor):
+    """
+    Length limits with an individual min/max length per input row
+
+    `generate()` applies one min_length/max_length to the whole batch, so a
+    text batched with longer or shorter ones would get different limits than
+    it gets alone. This processor bans EOS until each row reaches its own
+    min_length and forces EOS once it reaches its own max_length; generate()
+    itself runs with the largest max_length of the batch. Lengths count the
+    decoder start token, like generate()'s own limits.
+    """
+
+    def __init__(self, min_lengths: Sequence[int], max_lengths: Sequence[int], eos_token_id: int):
+        if not min_lengths or len(min_lengths) != len(max_lengths):
+            raise ValueError("One min_length and one max_length per row are required")
+        self.min_lengths = torch.tensor(list(min_lengths), dtype=torch.long)
+        self.max_lengths = torch.tensor(list(max_lengths), dtype=torch.long)
+        self.eos_token_id = eos_token_id
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        num_rows = scores.shape[0]
+        cur_len = input_ids.shape[-1]
+        repeats = max(num_rows // len(self.min_lengths), 1)
+
+        too_short = (self.min_lengths.repeat_interleave(repeats)[:num_rows] > cur_len).to(scores.device)
+        scores[too_short, self.eos_token_id] = -float("inf")
+
+        at_limit = (self.max_lengths.repeat_interleave(repeats)[:num_rows] - 1 <= cur_len).to(scores.device)
+        if at_limit.any():
+            scores[at_limit] = -float("inf")
+            scores[at_limit, self.eos_token_id] = 0.0
+        return scores
+
+
+class SeededGumbelSampler(LogitsProcessor):
+    """
+    Beam-search sampling driven by per-row torch.Generator instances
+
+    HF beam sampling draws from torch's global RNG, so concurrent requests
+    disturb each other and a request cannot be replayed. This processor makes
+    the draws explicit instead: it adds Gumbel noise from each prompt row's own
+    generator and generate() runs with do_sample=False. Taking the top-k of
+    log-probs + Gumbel noise samples k continuations without replacement from
+    softmax(log-probs), the same distribution as HF's multinomial step.
+
+    generate() adds the processed scores to the running beam scores, so the
+    noise of the token chosen at the previous step is subtracted again; the
+    running scores therefore stay the true log-probabilities. Only the score of
+    a beam's final token keeps its noise, which just perturbs the ranking of
+    finished beams.
+
+    Beam search reorders beams between steps, so each row's parent is found
+    by matching its prefix against the previous step's rows of the same
+    prompt row (one tensor comparison); the correction is then the parent's
+    stored noise at the row's last token. Per step this is O(rows) Python
+    work, instead of hashing every full prefix.
+
+    Must be the last processor in the list (after temperature/top-k/top-p).
+    """
+
+    def __init__(self, generators: Sequence[torch.Generator]):
+        """
+        Args:
+            generators: One generator per prompt row (rows of the same request may share one)
+        """
+        if not generators:
+            raise ValueError("At least one generator is required")
+        self.generators = list(generators)
+        self._last_ids: Optional[torch.LongTensor] = None
+        self._last_noise: Optional[torch.Tensor] = None
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        num_rows, vocab_size = scores.shape
+        beams = max(num_rows // len(self.generators), 1)
+        tiny = torch.finfo(torch.float32).tiny
+
+        noise = torch.empty((num_rows, vocab_size), dtype=torch.float32, device=scores.device)
+        for prompt_row, generator in enumerate(self.generators):
+            uniform = torch.rand((beams, vocab_size), generator=generator, device=generator.device)
+            uniform = uniform.clamp(min=tiny, max=1.0 - 1e-7)
+            noise[prompt_row * beams:(prompt_row + 1) * beams] = -torch.log(-torch.log(uniform)).to(scores.device)
+
+        correction = torch.zeros(num_rows, dtype=torch.float32, device=scores.device)
+        previous = self._last_ids
+        if previous is not None and previous.shape[1] == input_ids.shape[1] - 1:
+            # parents[row, j]: previous row j is row's prefix within the same prompt row
+            groups = torch.arange(num_rows, device=input_ids.device) // beams
+            previous_groups = torch.arange(previous.shape[0], device=input_ids.device) // beams
+            parents = (input_ids[:, None, :-1] == previous[None, :, :].to(input_ids.device)).all(dim=-1)
+            parents &= groups[:, None] == previous_groups[None, :]
+
+            # At the first step all beams share one prefix; only beam 0 can be continued
+            has_parent = parents.any(dim=1)
+            parent_rows = parents.to(torch.uint8).argmax(dim=1)
+            parent_noise = self._last_noise[parent_rows, input_ids[:, -1].to(self._last_noise.device)]
+            correction = torch.where(has_parent.to(scores.device), parent_noise.to(scores.device), correction)
+        self._last_ids = input_ids
+        self._last_noise = noise
+
+        return scores + (noise - correction.unsqueeze(1)).to(scores.dtype)
+
+
+class LeadingSequenceBlocker(LogitsProcessor):
+    """
+    Keeps generated text from starting with any of the given token sequences
+
+    Used for prompt echoes ("parafrasekan", "tulis ulang"): unlike
+    generate()'s bad_words_ids the sequences are only blocked at the start,
+    so the same words stay available later in the sentence.
+    """
+
+    def __init__(self, sequences: Sequence[Sequence[int]]):
+        """
+        Args:
+            sequences: Token id sequences that generated text may not start with
+        """
+        self.sequences = [list(sequence) for sequence in sequences if sequence]
+        self.max_steps = max((len(sequence) for sequence in self.sequences), default=0)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        # input_ids[:, 0] is the decoder start token
+        step = input_ids.shape[1] - 1
+        if step >= self.max_steps:
+            return scores
+        generated = input_ids[:, 1:step + 1].tolist()
+        for row, tokens in enumerate(generated):
+            for sequence in self.sequences:
+                if len(sequence) > step and tokens == sequence[:step]:
+                    scores[row, sequence[step]] = -float("inf")
+        return scores
+
+
+class ColonRunSuppressor(LogitsProcessor):
+    """
+    Suppresses the colon patterns that candidate validation rejects
+
+    Colon tokens are blocked within the first `colon_free_prefix` generated
+    tokens (garbage prefixes like "an:fratuktur:"), directly after another
+    colon token or after a token of `blocked_after_ids` (e.g. "...kan:"), and
+    once a row already holds `max_colons` colon tokens.
+    """
+
+    def __init__(self, colon_ids: Sequence[int], blocked_after_ids: Sequence[int] = (),
+                 colon_free_prefix: int = 4, max_colons: int = 2):
+        """
+        Args:
+            colon_ids: Token ids whose text contains a colon
+            blocked_after_ids: Token ids that may not be followed by a colon token
+            colon_free_prefix: Generated tokens at the start that may not be colons
+            max_colons: Colon tokens allowed per row
+        """
+        self.colon_ids = torch.tensor(sorted(set(colon_ids)), dtype=torch.long)
+        self.blocked_after_ids = torch.tensor(sorted(set(colon_ids) | set(blocked_after_ids)), dtype=torch.long)
+        self.colon_free_prefix = colon_free_prefix
+        self.max_colons = max_colons
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        if not self.colon_ids.numel():
+            return scores
+
+        colon_ids = self.colon_ids.to(input_ids.device)
+        generated = input_ids[:, 1:]
+        if generated.shape[1] < self.colon_free_prefix:
+            banned = torch.ones(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+        else:
+            banned = torch.isin(generated, colon_ids).sum(dim=1) >= self.max_colons
+            banned |= torch.isin(generated[:, -1], self.blocked_after_ids.to(input_ids.device))
+
+        rows = banned.nonzero().squeeze(1)
+        if rows.numel():
+            scores[rows.unsqueeze(1), colon_ids.unsqueeze(0)] = -float("inf")
+        return scores
+
+
+class CancellationStoppingCriteria(StoppingCriteria):
+    """
+    Stops generate() once every request in the batch has been cancelled
+
+    A batch shared by several requests keeps running while any of them still
+    waits for its output. The engine checks `all_cancelled` afterwards to
+    discard the truncated sequences.
+    """
+
+    def __init__(self, tokens: Sequence):
+        """
+        Args:
+            tokens: CancellationToken of every request in the batch (None = not cancellable)
+        """
+        self.tokens = list(tokens)
+
+    @property
+    def all_cancelled(self) -> bool:
+        return bool(self.tokens) and all(token is not None and token.cancelled for token in self.tokens)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        return torch.full((input_ids.shape[0],), self.all_cancelled, dtype=torch.bool, device=input_ids.device)
+
+
+def build_prompt_rows(texts: List[str], strategies: Sequence[tuple]) -> List[tuple]:
+    """
+    Expand texts x strategies into prompt rows
+
+    Args:
+        texts: Input texts
+        strategies: Sequence of (prefix, temperature) pairs
+
+    Returns:
+        List of (text_index, prefix, temperature, prompt) tuples
+    """
+    rows = []
+    for text_index, text in enumerate(texts):
+        for prefix, temperature in strategies:
+            rows.append((text_index, prefix, temperature, f"{prefix}: {text}"))
+    return rows
@@ -9,16 +9,37 @@ import os
 import re
 import random
 import logging
+import threading
 import time
-from typing import List, Dict, Tuple, Optional, Any, Union
-from dataclasses import dataclass, field
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from typing import List, Dict, Iterator, Tuple, Optional, Any, Union, Callable
+from dataclasses import asdict, dataclass, field, replace
 import nltk
 import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
+from transformers import (
+    AutoConfig, AutoTokenizer, AutoModelForSeq2SeqLM, pipeline,
+    LogitsProcessorList, MaxTimeCriteria, StoppingCriteriaList, TextIteratorStreamer,
+    TopKLogitsWarper, TopPLogitsWarper
+)
+from transformers.modeling_outputs import BaseModelOutput
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
+from .cache import LRUCache, text_key
+from .cancellation import CancellationToken, OperationCancelled
+from .embedding_store import EmbeddingStore, default_embedding_dir
+from .latency_planner import LatencyPlanner
+from .result_store import ResultStore
+from .generation_utils import (
+    CancellationStoppingCriteria, ColonRunSuppressor, LeadingSequenceBlocker, PerRowLengthLogitsProcessor,
+    PerRowTemperatureWarper, SeededGumbelSampler, build_prompt_rows
+)
+from .onnx_backend import default_onnx_dir, is_onnx_available, load_onnx_model, onnx_export_exists
+from .quantization import load_or_quantize
+from utils.file_parser import FileParser
+from generation_profiles import DEFAULT_GENERATION_PROFILE, DEFAULT_GENERATION_PROFILES, GenerationProfile
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,6 +64,33 @@ class IndoT5HybridResult:
     success: bool = True
     error_message: Optional[str] = None
     alternatives: List[str] = field(default_factory=list)
+    sentence_results: List["IndoT5HybridResult"] = field(default_factory=list)
+    deadline_exceeded: bool = False  # Time budget ran out: generation was cut short or skipped
+    generation_profile: Optional[str] = None  # Profile used for neural generation
+
+@dataclass(frozen=True)
+class ParaphraseOptions:
+    """
+    Per-request paraphrasing settings
+    
+    Immutable and passed down explicitly, so one engine instance can serve
+    concurrent requests with different settings. The cancellation token and
+    the partial-output callback are not settings: they do not take part in
+    equality or cache keys.
+    """
+    synonym_rate: float = 0.7
+    min_confidence: float = 0.5
+    max_transformations: Optional[int] = None  # Syntactic budget (None = per-method default)
+    transformation_level: int = 0  # Extra syntactic transforms on top of the budget (variations)
+    use_cache: bool = True
+    max_processing_time: Optional[float] = None  # Seconds per request (None = no deadline)
+    profile: Optional[str] = None  # Generation profile name (None = engine default)
+    temperature: Optional[float] = None  # Fixed sampling temperature (None = per-strategy, randomized)
+    max_length: Optional[int] = None  # Cap on generated tokens
+    latency_budget: Optional[float] = None  # Seconds; picks the profile when none is named, bounds batch requests
+    cancel_token: Optional[CancellationToken] = field(default=None, compare=False)
+    # Called with the partial neural output while it is generated (see _stream_candidates)
+    on_partial: Optional[Callable[[str], None]] = field(default=None, compare=False)
 
 class IndoT5HybridParaphraser:
     """
@@ -54,6 +102,25 @@ class IndoT5HybridParaphraser:
     3. Quality assessment and validation
     """
     
+    # Prompt strategies: (prefix, base temperature)
+    NEURAL_STRATEGIES = [
+        ("parafrasekan", 1.3),      # Strategy 1: formal, higher temp
+        ("tulis ulang", 1.1),       # Strategy 2: creative, normal temp
+    ]
+    
+    # Prompt-like words the model echoes before a colon ("tulis ulang:", "kata berbeda:")
+    ECHO_PREFIXES = ("tulis", "ulang", "dengan kata berbeda", "kata berbeda", "kata beda")
+    
+    SUPPORTED_METHODS = ("hybrid", "neural", "rule-based")
+    
+    SEMANTIC_MODEL_NAME = 'all-MiniLM-L6-v2'
+    
+    # Bump when pipeline changes make previously stored results stale
+    RESULT_CACHE_VERSION = 1
+    
+    # Share of max_processing_time kept for the rule stages and scoring after generation
+    DEADLINE_RESERVE = 0.15
+    
     def __init__(self, 
                  model_name: str = "Wikidepia/IndoT5-base",
                  use_gpu: bool = True,
@@ -61,7 +128,34 @@ class IndoT5HybridParaphraser:
                  min_confidence: float = 0.5,
                  quality_threshold: float = 60.0,
                  max_transformations: int = 5,
-                 enable_caching: bool = True):
+                 max_processing_time: Optional[float] = None,
+                 generation_profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+                 default_profile: str = DEFAULT_GENERATION_PROFILE,
+                 enable_early_exit: bool = True,
+                 early_exit_similarity: float = 0.85,
+                 early_exit_max_overlap: float = 0.6,
+                 adaptive_stages: bool = True,
+                 stage_skip_diversity: float = 0.5,
+                 stage_skip_syntax_diversity: float = 0.7,
+                 stage_reorder_min_similarity: float = 0.75,
+                 constrained_decoding: bool = True,
+                 max_concurrent_generate: int = 1,
+                 enable_caching: bool = True,
+                 backend: str = "torch",
+                 onnx_model_dir: Optional[str] = None,
+                 quantization: Optional[str] = None,
+                 quantized_cache_dir: Optional[str] = None,
+                 encoder_cache_size: int = 256,
+                 encoder_cache_max_mb: float = 128.0,
+                 result_cache_size: int = 1024,
+                 result_cache_max_mb: float = 64.0,
+                 result_cache_ttl: Optional[float] = 3600.0,
+                 similarity_cache_size: int = 4096,
+                 synonym_cache_size: int = 4096,
+                 embedding_store_dir: Optional[str] = None,
+                 result_store_path: Optional[str] = None,
+                 result_store_max_entries: int = 100000,
+                 result_store_ttl: Optional[float] = None):
         """
         Initialize IndoT5 Hybrid Paraphraser
         
@@ -72,7 +166,37 @@ class IndoT5HybridParaphraser:
             min_confidence: Minimum neural confidence threshold
             quality_threshold: Minimum quality score threshold
             max_transformations: Maximum rule-based transformations
+            max_processing_time: Default time budget per request in seconds (None = unbounded)
+            generation_profiles: Profile name -> GenerationProfile fields (default: DEFAULT_GENERATION_PROFILES)
+            default_profile: Profile used when a request does not name one
+            enable_early_exit: Run later prompt strategies only when the first one
+                yields no candidate that clears the early-exit thresholds
+            early_exit_similarity: Minimum semantic similarity of a good-enough first-strategy candidate
+            early_exit_max_overlap: Maximum word overlap with the original of a good-enough candidate
+            adaptive_stages: Plan the hybrid rule stages per request (see _plan_hybrid_stages)
+            stage_skip_diversity: Neural diversity from which synonym substitution and reordering are skipped
+            stage_skip_syntax_diversity: Neural diversity from which syntactic transformation is skipped too
+            stage_reorder_min_similarity: Minimum neural similarity for word reordering
+            constrained_decoding: Block prompt echoes and colon garbage during generate()
+                instead of only rejecting such candidates afterwards
+            max_concurrent_generate: Max model.generate() calls running at once, across
+                the scheduler, batch/chunk/job work, streaming and the benchmark
             enable_caching: Enable model and result caching
+            backend: IndoT5 inference backend ("torch" or "onnx")
+            onnx_model_dir: ONNX export directory (default: models/onnx/<model_name>)
+            quantization: Optional CPU quantization of the torch model ("int8")
+            quantized_cache_dir: Cache directory for quantized weights (default: models/quantized)
+            encoder_cache_size: Max cached encoder outputs per (prefix, text), 0 disables (torch only)
+            encoder_cache_max_mb: Approximate memory budget of the encoder cache
+            result_cache_size: Max cached paraphrase results
+            result_cache_max_mb: Approximate memory budget of the result cache
+            result_cache_ttl: Seconds before a cached result expires (None = never)
+            similarity_cache_size: Max cached semantic similarity scores
+            synonym_cache_size: Max cached synonym lookups
+            embedding_store_dir: Root of the persistent embedding store (None disables it)
+            result_store_path: sqlite file of the process-shared result cache (None disables it)
+            result_store_max_entries: Max results in the shared store (LRU eviction)
+            result_store_ttl: Seconds before a shared result expires (None = never)
         """
         self.model_name = model_name
         self.use_gpu = use_gpu and torch.cuda.is_available()
@@ -80,27 +204,118 @@ class IndoT5HybridParaphraser:
         self.min_confidence = min_confidence
         self.quality_threshold = quality_threshold
         self.max_transformations = max_transformations
+        self.max_processing_time = max_processing_time
+        self.generation_profiles = {
+            name: GenerationProfile.from_dict(name, spec)
+            for name, spec in (generation_profiles or DEFAULT_GENERATION_PROFILES).items()
+        }
+        self.default_profile = default_profile
+        self._validate_profiles()
+        self.enable_early_exit = enable_early_exit
+        self.early_exit_similarity = early_exit_similarity
+        self.early_exit_max_overlap = early_exit_max_overlap
+        self.adaptive_stages = adaptive_stages
+        self.stage_skip_diversity = stage_skip_diversity
+        self.stage_skip_syntax_diversity = stage_skip_syntax_diversity
+        self.stage_reorder_min_similarity = stage_reorder_min_similarity
+        self.constrained_decoding = constrained_decoding
         self.enable_caching = enable_caching
+        self.backend = backend
+        self.onnx_model_dir = onnx_model_dir or default_onnx_dir(model_name)
+        self.quantization = quantization
+        self.quantized_cache_dir = quantized_cache_dir
         
         # Initialize device
         self.device = torch.device("cuda" if self.use_gpu else "cpu")
         
+        # Optional cross-request micro-batching (see attach_scheduler)
+        self.scheduler = None
+        
+        # Bounds concurrent generate() calls, whichever path they come from
+        self.max_concurrent_generate = max(1, max_concurrent_generate)
+        self._generate_slots = threading.BoundedSemaphore(self.max_concurrent_generate)
+        
+        # Cancelled requests (counted once per token) and generate() calls stopped early
+        self._cancel_lock = threading.Lock()
+        self._cancelled_tokens = weakref.WeakSet()
+        self._cancel_stats = {"requests": 0, "generate_calls_stopped": 0}
+        
+        # Neural requests that ran only their first prompt strategy (early exit)
+        self._early_exit_lock = threading.Lock()
+        self._early_exit_stats = {"requests": 0, "second_pass_skipped": 0, "second_pass_run": 0}
+        
+        # Decoded candidates and those rejected by _is_valid_paraphrase, per decoding mode
+        self._candidate_lock = threading.Lock()
+        self._candidate_stats = {
+            mode: {"generated": 0, "rejected": 0} for mode in ("constrained", "unconstrained")
+        }
+        
+        # Learns generate() latency per profile; picks profiles for latency budgets
+        self.planner = LatencyPlanner()
+        
         # Initialize models
         self._init_models()
+        self._build_decoding_constraints()
         
         # Load data
         self._load_data()
         
-        # Initialize caches
-        if self.enable_caching:
-            self._result_cache = {}
-            self._synonym_cache = {}
-            self._similarity_cache = {}  # Cache for semantic similarity
+        # Sentence splitter for sentence-parallel mode
+        self._file_parser = FileParser()
+        
+        # Initialize caches (bounded LRU, so long-running workers stay within memory)
+        self._result_cache = LRUCache(
+            maxsize=result_cache_size,
+            max_bytes=int(result_cache_max_mb * 1024 * 1024),
+            ttl=result_cache_ttl
+        )
+        self._synonym_cache = LRUCache(maxsize=synonym_cache_size)
+        self._similarity_cache = LRUCache(maxsize=similarity_cache_size)  # Cache for semantic similarity
+        
+        # Tokenized prompts + T5 encoder hidden states, so repeated requests for
+        # the same text only run the decoder. ONNX sessions run their own encoder.
+        self._encoder_cache = None
+        if self.enable_caching and self.backend == "torch" and encoder_cache_size > 0:
+            self._encoder_cache = LRUCache(
+                maxsize=encoder_cache_size,
+                max_bytes=int(encoder_cache_max_mb * 1024 * 1024)
+            )
+        
+        # Sentence embeddings persisted across restarts and shared between workers
+        self._embedding_store = None
+        if embedding_store_dir:
+            try:
+                self._embedding_store = EmbeddingStore(
+                    default_embedding_dir(self.SEMANTIC_MODEL_NAME, embedding_store_dir),
+                    self.SEMANTIC_MODEL_NAME
+                )
+            except Exception as e:
+                logger.warning(f"⚠️  Embedding store unavailable ({e}), embeddings are not persisted")
+        
+        # Results shared by all worker processes (consulted after the in-memory cache)
+        self._result_store = None
+        if result_store_path:
+            try:
+                self._result_store = ResultStore(result_store_path, result_store_max_entries, result_store_ttl)
+            except Exception as e:
+                logger.warning(f"⚠️  Result store unavailable ({e}), results are cached per process only")
         
         logger.info(f"✅ IndoT5 Hybrid Paraphraser initialized")
         logger.info(f"   Model: {self.model_name}")
         logger.info(f"   Device: {self.device}")
         logger.info(f"   GPU: {self.use_gpu}")
+        logger.info(f"   Backend: {self.backend}")
+    
+    def _validate_profiles(self):
+        """Check that the default profile exists and profile strategies are known prefixes"""
+        if self.default_profile not in self.generation_profiles:
+            raise ValueError(f"Unknown default generation profile: {self.default_profile}")
+        prefixes = {prefix for prefix, _ in self.NEURAL_STRATEGIES}
+        for profile in self.generation_profiles.values():
+            if profile.strategies is not None and (not profile.strategies or not set(profile.strategies) <= prefixes):
+                raise ValueError(f"Profile {profile.name} has invalid strategies: {profile.strategies}")
+            if profile.num_return_sequences > profile.num_beams:
+                raise ValueError(f"Profile {profile.name}: num_return_sequences exceeds num_beams")
     
     def _init_models(self):
         """Initialize IndoT5 and semantic similarity models"""
@@ -112,14 +327,20 @@ class IndoT5HybridParaphraser:
                 use_fast=False,
                 legacy=True
             )
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+            self.model = None
             
-            if self.use_gpu:
-                self.model = self.model.to(self.device)
+            if self.backend == "onnx":
+                self.model = self._load_onnx_model()
+            elif self.backend != "torch":
+                raise ValueError(f"Unknown backend: {self.backend}")
+            
+            if self.model is None:
+                self.backend = "torch"
+                self.model = self._load_torch_model()
             
             # Load semantic similarity model
             logger.info("🔄 Loading semantic similarity model")
-            self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.semantic_model = SentenceTransformer(self.SEMANTIC_MODEL_NAME)
             
             logger.info("✅ Models loaded successfully")
             
@@ -127,6 +348,53 @@ class IndoT5HybridParaphraser:
             logger.error(f"❌ Error loading models: {e}")
             raise
     
+    def _load_torch_model(self):
+        """Load the torch model (fp32, or dynamically quantized int8 on CPU)"""
+        if self.quantization:
+            if self.use_gpu:
+                logger.warning(f"⚠️  {self.quantization} quantization is CPU-only, loading fp32 weights on GPU")
+                self.quantization = None
+            else:
+                return load_or_quantize(
+                    self.model_name,
+                    lambda: AutoModelForSeq2SeqLM.from_pretrained(self.model_name),
+                    quantization=self.quantization,
+                    cache_dir=self.quantized_cache_dir,
+                    build_skeleton=lambda: AutoModelForSeq2SeqLM.from_config(AutoConfig.from_pretrained(self.model_name))
+                )
+        
+        model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+        if self.use_gpu:
+            model = model.to(self.device)
+        return model
+    
+    def _load_onnx_model(self):
+        """
+        Load the ONNX Runtime model (encoder + decoder with KV cache)
+        
+        Returns:
+            ORT model, or None to fall back to torch when no export is present
+        """
+        if not is_onnx_available():
+            logger.warning("⚠️  optimum[onnxruntime] not installed, falling back to torch backend")
+            return None
+        
+        if not onnx_export_exists(self.onnx_model_dir):
+            logger.warning(f"⚠️  No ONNX export found in {self.onnx_model_dir}, falling back to torch backend "
+                           f"(export with: python benchmark_inference.py --export)")
+            return None
+        
+        try:
+            logger.info(f"🔄 Loading ONNX Runtime model: {self.onnx_model_dir}")
+            model = load_onnx_model(self.onnx_model_dir)
+            # ONNX Runtime runs on CPU
+            self.use_gpu = False
+            self.device = torch.device("cpu")
+            return model
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to load ONNX model ({e}), falling back to torch backend")
+            return None
+    
     def _load_data(self):
         """Load synonym database and transformation rules"""
         try:
@@ -202,133 +470,590 @@ class IndoT5HybridParaphraser:
             'karena', 'sebab', 'sehingga', 'meski', 'walaupun', 'meskipun'
         }
     
-    def _neural_paraphrase(self, text: str, num_beams: int = 4, temperature: float = 1.2) -> Tuple[str, float]:
+    def _clean_generated_text(self, decoded: str) -> str:
+        """Strip prompt echoes and garbage prefixes from a decoded candidate"""
+        decoded = decoded.strip()
+        
+        # ROBUST prefix removal - only at start of text
+        prefixes_to_remove = [
+            r'^parafrasekan\s*:\s*',
+            r'^tulis\s+ulang\s*:\s*',
+            r'^tulis\s*:\s*',
+            r'^ulang\s*:\s*',
+            r'^dengan\s+kata\s+berbeda\s*:\s*',
+            r'^kata\s+berbeda\s*:\s*',
+            r'^kata\s+beda\s*:\s*',
+        ]
+        
+        for pattern in prefixes_to_remove:
+            decoded = re.sub(pattern, '', decoded, flags=re.IGNORECASE)
+        
+        # Remove any garbage like "an:fratuktur:" or "frafaksi:" at start
+        # Match pattern like: word:word: at the beginning
+        decoded = re.sub(r'^[a-z]+:[a-z]+:\s*', '', decoded, flags=re.IGNORECASE)
+        
+        # Clean up multiple punctuation
+        decoded = re.sub(r'\s+', ' ', decoded)
+        decoded = re.sub(r'\.{2,}', '.', decoded)
+        decoded = re.sub(r':{2,}', ':', decoded)
+        decoded = re.sub(r'-{2,}', '-', decoded)
+        return decoded.strip(': .-,')
+    
+    def _build_decoding_constraints(self) -> None:
+        """
+        Token ids of the constrained-decoding processors
+        
+        Every prompt prefix followed by a colon is blocked anywhere in the output
+        (bad_words_ids), outputs may not start with a prompt prefix, and the colon
+        tokens of the vocabulary feed ColonRunSuppressor.
+        """
+        def encode(text: str) -> Tuple[int, ...]:
+            return tuple(self.tokenizer(text, add_special_tokens=False)["input_ids"])
+        
+        prefixes = [prefix for prefix, _ in self.NEURAL_STRATEGIES]
+        bad_words = {
+            encode(f"{word}{colon}") for word in prefixes + list(self.ECHO_PREFIXES) for colon in (":", " :")
+        }
+        self._bad_words_ids = [list(ids) for ids in sorted(bad_words) if len(ids) > 1]
+        self._echo_sequences = sorted({
+            encode(variant) for prefix in prefixes for variant in (prefix, prefix.capitalize())
+        })
+        
+        vocab = self.tokenizer.get_vocab()
+        self._colon_ids = sorted(token_id for token, token_id in vocab.items() if ":" in token)
+        self._colon_blocked_after_ids = sorted(
+            token_id for token, token_id in vocab.items() if token.lower().endswith("kan")
+        )
+    
+    def _constraint_processors(self) -> List[Any]:
+        """Logits processors of constrained decoding (empty when disabled)"""
+        if not self.constrained_decoding:
+            return []
+        return [
+            LeadingSequenceBlocker(self._echo_sequences),
+            ColonRunSuppressor(self._colon_ids, self._colon_blocked_after_ids),
+        ]
+    
+    def get_candidate_stats(self) -> Dict[str, Any]:
+        """Get the share of decoded candidates rejected by validation, per decoding mode"""
+        with self._candidate_lock:
+            stats = {mode: dict(counts) for mode, counts in self._candidate_stats.items()}
+        for counts in stats.values():
+            counts["rejection_rate"] = (
+                round(counts["rejected"] / counts["generated"], 4) if counts["generated"] else None
+            )
+        stats["constrained_decoding"] = self.constrained_decoding
+        return stats
+    
+    def _generate_candidates(self, texts: List[str], num_beams: Optional[int] = None,
+                             num_return_sequences: Optional[int] = None,
+                             strategies: Optional[List[Tuple[str, float]]] = None,
+                             rngs: Optional[List[random.Random]] = None,
+                             cancel_tokens: Optional[List[Optional[CancellationToken]]] = None,
+                             deadlines: Optional[List[Optional[float]]] = None,
+                             profile: Optional[GenerationProfile] = None,
+                             temperature: Optional[float] = None,
+                             max_length: Optional[int] = None,
+                             streamer: Optional[TextIteratorStreamer] = None) -> List[List[str]]:
+        """
+        Generate neural candidates for every text x strategy in ONE padded generate() call
+        
+        Each prompt row keeps its own (randomized) temperature through
+        PerRowTemperatureWarper, so batching does not change the sampling setup
+        of the individual strategies. Sampling draws from a torch.Generator per
+        text (SeededGumbelSampler) instead of torch's global RNG.
+        
+        Args:
+            texts: Input texts
+            num_beams: Number of beams for beam search (default: from profile)
+            num_return_sequences: Candidates returned per prompt row (default: from profile)
+            strategies: (prefix, temperature) pairs (default: the profile's NEURAL_STRATEGIES)
+            rngs: Per-text random.Random (None = fresh unseeded generators)
+            cancel_tokens: Per-text CancellationToken; generate() stops once all are cancelled
+            deadlines: Per-text time.time() limits; generate() stops (truncating the
+                candidates) once all have passed
+            profile: Generation profile (default: the engine's default profile)
+            temperature: Fixed temperature for every row instead of the randomized
+                per-strategy ones (sampling profiles only)
+            max_length: Cap on generated tokens
+            streamer: Receives the tokens as they are generated (one prompt row,
+                one beam and one returned sequence only)
+            
+        Returns:
+            List of valid candidates per input text (same order as texts)
+            
+        Raises:
+            OperationCancelled: If every text's token was cancelled
+            ValueError: If a streamer is used with several rows, beams or sequences
+        """
+        profile = profile or self.generation_profiles[self.default_profile]
+        num_beams = num_beams or profile.num_beams
+        num_return_sequences = num_return_sequences or profile.num_return_sequences
+        if strategies is None:
+            strategies = self._profile_strategies(profile)
+        if rngs is None:
+            rngs = [random.Random() for _ in texts]
+        if streamer is not None and (len(texts) * len(strategies) != 1 or num_beams != 1 or num_return_sequences != 1):
+            raise ValueError("Streaming generation needs one prompt row, one beam and one returned sequence")
+        
+        cancellation = CancellationStoppingCriteria(cancel_tokens or [])
+        if cancellation.all_cancelled:
+            raise OperationCancelled("cancelled before generation")
+        
+        generate_start = time.time()
+        rows = build_prompt_rows(texts, strategies)
+        inputs = self._prepare_generation_inputs(texts, rows)
+        
+        # Length limits are per text, so batching never changes a text's limits
+        max_lengths = []
+        min_lengths = []
+        for text in texts:
+            word_count = len(text.split())
+            text_length = min(word_count * 2 + 50, 256)
+            if max_length is not None:
+                text_length = min(text_length, max_length)
+            max_lengths.append(text_length)
+            min_lengths.append(min(max(word_count - 5, 5), text_length))
+        length_processor = PerRowLengthLogitsProcessor(
+            [min_lengths[text_index] for text_index, _, _, _ in rows],
+            [max_lengths[text_index] for text_index, _, _, _ in rows],
+            self.tokenizer.eos_token_id,
+        )
+        
+        stopping_criteria = [cancellation] if cancellation.tokens else []
+        if deadlines and all(deadline is not None for deadline in deadlines):
+            now = time.time()
+            stopping_criteria.append(MaxTimeCriteria(max_time=max(max(deadlines) - now, 0.0), initial_timestamp=now))
+        
+        if profile.sampling:
+            # Per-request torch generators, seeded from the request's random.Random
+            text_generators = [
+                torch.Generator(device=self.device).manual_seed(rng.getrandbits(63)) for rng in rngs
+            ]
+            
+            # Add randomization for diversity (per prompt row)
+            temperatures = []
+            for text_index, _, temp, _ in rows:
+                if temperature is not None:
+                    temperatures.append(temperature)
+                else:
+                    actual_temp = temp + rngs[text_index].uniform(-0.15, 0.25)
+                    temperatures.append(max(0.9, min(1.8, actual_temp)))
+            
+            # Temperature, top-k, top-p and the sampling itself are applied per row
+            # by our own processors, so generate() runs its deterministic beam search
+            logits_processor = LogitsProcessorList([
+                length_processor,
+                *self._constraint_processors(),
+                PerRowTemperatureWarper(temperatures),
+                TopKLogitsWarper(top_k=profile.top_k),
+                TopPLogitsWarper(top_p=profile.top_p),
+                SeededGumbelSampler([text_generators[text_index] for text_index, _, _, _ in rows]),
+            ])
+        else:
+            logits_processor = LogitsProcessorList([length_processor, *self._constraint_processors()])
+        
+        # Beam-only settings (greedy decoding warns about them)
+        beam_kwargs = {"early_stopping": True, "length_penalty": 0.8} if num_beams > 1 else {}
+        
+        # Time spent waiting for a generate slot is not generate() latency
+        wait_start = time.time()
+        with self._generate_slots, torch.no_grad():
+            slot_wait = time.time() - wait_start
+            outputs = self.model.generate(
+                **inputs,
+                max_length=max(max_lengths),
+                num_beams=num_beams,
+                num_return_sequences=num_return_sequences,
+                do_sample=False,
+                logits_processor=logits_processor,
+                repetition_penalty=1.5,
+                no_repeat_ngram_size=3,
+                pad_token_id=self.tokenizer.pad_token_id,
+                eos_token_id=self.tokenizer.eos_token_id,
+                bad_words_ids=self._bad_words_ids if self.constrained_decoding and self._bad_words_ids else None,
+                stopping_criteria=StoppingCriteriaList(stopping_criteria) if stopping_criteria else None,
+                streamer=streamer,
+                **beam_kwargs
+            )
+        
+        rows_count, prompt_tokens = inputs["attention_mask"].shape
+        self.planner.record(
+            profile.name, rows_count * prompt_tokens * num_beams, time.time() - generate_start - slot_wait
+        )
+        
+        # Truncated outputs of a stopped call are discarded
+        if cancellation.all_cancelled:
+            with self._cancel_lock:
+                self._cancel_stats["generate_calls_stopped"] += 1
+            raise OperationCancelled("cancelled during generation")
+        
+        # Outputs are grouped per prompt row: num_return_sequences rows each
+        candidates = [[] for _ in texts]
+        for output_index, output in enumerate(outputs):
+            text_index = rows[output_index // num_return_sequences][0]
+            decoded = self._clean_generated_text(
+                self.tokenizer.decode(output, skip_special_tokens=True)
+            )
+            
+            # STRICT VALIDATION
+            if decoded and self._is_valid_paraphrase(texts[text_index], decoded):
+                candidates[text_index].append(decoded)
+        
+        valid = sum(len(text_candidates) for text_candidates in candidates)
+        with self._candidate_lock:
+            counts = self._candidate_stats["constrained" if self.constrained_decoding else "unconstrained"]
+            counts["generated"] += len(outputs)
+            counts["rejected"] += len(outputs) - valid
+        
+        return candidates
+    
+    def _tokenize_prompts(self, prompts: List[str]) -> Dict[str, torch.Tensor]:
+        """Tokenize prompts into a padded batch on the model device"""
+        inputs = self.tokenizer(
+            prompts,
+            return_tensors="pt",
+            max_length=512,
+            truncation=True,
+            padding=True
+        )
+        
+        if self.use_gpu:
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        
+        return inputs
+    
+    def _prepare_generation_inputs(self, texts: List[str], rows: List[Tuple]) -> Dict[str, Any]:
+        """
+        Build generate() inputs for the prompt rows, reusing cached encoder outputs
+        
+        Rows missing from the encoder cache are tokenized and encoded in one
+        batch; the rest come straight from the cache. The padded hidden states
+        are passed to generate() as encoder_outputs so only the decoder runs.
+        
+        Args:
+            texts: Input texts
+            rows: Prompt rows from build_prompt_rows
+            
+        Returns:
+            Keyword arguments for model.generate()
+        """
+        prompts = [prompt for _, _, _, prompt in rows]
+        
+        if not (self.enable_caching and self._encoder_cache is not None):
+            return self._tokenize_prompts(prompts)
+        
+        keys = [
+            (self.model_name, prefix, text_key(texts[text_index]))
+            for text_index, prefix, _, _ in rows
+        ]
+        entries = [self._encoder_cache.get(key) for key in keys]
+        missing = [i for i, entry in enumerate(entries) if entry is None]
+        
+        if missing:
+            inputs = self._tokenize_prompts([prompts[i] for i in missing])
+            with torch.no_grad():
+                hidden_states = self.model.get_encoder()(
+                    input_ids=inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"]
+                ).last_hidden_state
+            
+            # Store unpadded rows so they can be re-padded into any batch
+            for j, i in enumerate(missing):
+                mask = inputs["attention_mask"][j].bool()
+                entries[i] = (inputs["input_ids"][j][mask], hidden_states[j][mask])
+                self._encoder_cache.put(keys[i], entries[i])
+        
+        max_length = max(input_ids.shape[0] for input_ids, _ in entries)
+        hidden_size = entries[0][1].shape[-1]
+        
+        input_ids = torch.full((len(entries), max_length), self.tokenizer.pad_token_id,
+                               dtype=entries[0][0].dtype, device=entries[0][0].device)
+        attention_mask = torch.zeros((len(entries), max_length),
+                                     dtype=torch.long, device=input_ids.device)
+        hidden_states = torch.zeros((len(entries), max_length, hidden_size),
+                                    dtype=entries[0][1].dtype, device=entries[0][1].device)
+        
+        for i, (row_ids, row_hidden) in enumerate(entries):
+            length = row_ids.shape[0]
+            input_ids[i, :length] = row_ids
+            attention_mask[i, :length] = 1
+            hidden_states[i, :length] = row_hidden
+        
+        # generate() expands encoder_outputs in place for beams, so build a fresh one per call
+        return {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "encoder_outputs": BaseModelOutput(last_hidden_state=hidden_states)
+        }
+    
+    @staticmethod
+    def _word_overlap(text: str, candidate: str) -> float:
+        """Share of the original's distinct words that the candidate keeps (0-1)"""
+        original_words = set(text.lower().split())
+        return len(original_words & set(candidate.lower().split())) / max(len(original_words), 1)
+    
+    def _candidate_scores(self, text: str, candidates: List[str],
+                          similarities: List[float]) -> List[float]:
+        """Score candidates: high semantic (0.75) + diversity (0.25)"""
+        return [
+            similarity * 0.75 + (1.0 - self._word_overlap(text, candidate)) * 0.25
+            for candidate, similarity in zip(candidates, similarities)
+        ]
+    
+    def _rank_candidates(self, text: str, candidates: List[str],
+                         similarities: List[float]) -> Tuple[Optional[str], float]:
+        """
+        Pick the best candidate by _candidate_scores
+        
+        Args:
+            text: Original text
+            candidates: Neural candidates
+            similarities: Semantic similarity of each candidate to the original
+            
+        Returns:
+            Tuple of (best_candidate or None, similarity of best candidate)
+        """
+        best_candidate = None
+        best_similarity = 0.0
+        best_score = -1
+        
+        for candidate, similarity, score in zip(candidates, similarities,
+                                                self._candidate_scores(text, candidates, similarities)):
+            if score > best_score:
+                best_score = score
+                best_candidate = candidate
+                best_similarity = float(similarity)
+        
+        return best_candidate, best_similarity
+    
+    def _select_best_candidate(self, text: str, candidates: List[str],
+                               vectors: Optional[Dict[str, np.ndarray]] = None) -> Tuple[Optional[str], float]:
+        """
+        Select the best neural candidate
+        
+        The original and all candidates are embedded in one encode() call and
+        scored with a single matrix product over the normalized vectors.
+        
+        Args:
+            text: Original text
+            candidates: Neural candidates
+            vectors: Per-request embeddings (text -> vector), filled in place
+            
+        Returns:
+            Tuple of (best_candidate or None, confidence_score)
+        """
+        vectors = {} if vectors is None else vectors
+        self._embed_missing([text] + candidates, vectors)
+        
+        similarities = np.stack([vectors[candidate] for candidate in candidates]) @ vectors[text]
+        return self._rank_candidates(text, candidates, similarities.tolist())
+    
+    def _neural_fallback(self, text: str, rng: Optional[random.Random] = None) -> Tuple[str, float]:
+        """Rule-based fallback used when no neural candidate is valid"""
+        logger.warning("⚠️ No valid neural candidates, using rule-based fallback")
+        fallback_result, _, _ = self._apply_synonym_substitution(text, rate=0.6, rng=rng)
+        if fallback_result != text:
+            return fallback_result, 0.5
+        else:
+            return text, 0.3
+    
+    def _neural_paraphrase(self, text: str, profile: Optional[GenerationProfile] = None,
+                           temperature: Optional[float] = None,
+                           max_length: Optional[int] = None,
+                           vectors: Optional[Dict[str, np.ndarray]] = None,
+                           rng: Optional[random.Random] = None,
+                           seeded: bool = False,
+                           cancel_token: Optional[CancellationToken] = None,
+                           deadline: Optional[float] = None,
+                           on_partial: Optional[Callable[[str], None]] = None) -> Tuple[str, float]:
         """
         Generate paraphrase using IndoT5 neural model (IMPROVED QUALITY & DIVERSITY)
         
+        The prompt strategies run as one padded batch, so the encoder and the
+        decoder loop run once per request instead of once per strategy. With
+        early exit enabled, the first strategy runs alone and the others only
+        run (as one batch) when none of its candidates clears the
+        early_exit_similarity / early_exit_max_overlap thresholds; the second
+        pass only embeds its new candidates (the first pass's vectors are
+        reused), so it costs one extra encode() batch. With on_partial, the
+        first strategy is streamed instead (_stream_candidates, one beam); the
+        other strategies then run under the same thresholds when early exit is
+        enabled, and always otherwise.
+        
         Args:
             text: Input text
-            num_beams: Number of beams for beam search
-            temperature: Temperature for generation
+            profile: Generation profile (default: the engine's default profile)
+            temperature: Fixed sampling temperature (None = randomized per strategy)
+            max_length: Cap on generated tokens
+            vectors: Per-request embeddings (text -> vector), reused by quality metrics
+            rng: Per-request random.Random (also seeds the torch.Generator)
+            seeded: Explicitly seeded request; the scheduler runs it in its own
+                generate() call because batch-wide length limits would change the output
+            cancel_token: Stops the generate() call (or drops the queued request) when cancelled
+            deadline: time.time() limit for generation; candidates are truncated at it and a
+                request still waiting in the scheduler falls back to the rule-based path
+            on_partial: Receives the streamed partial output of the first strategy
             
         Returns:
             Tuple of (paraphrased_text, confidence_score)
         """
+        if rng is None:
+            rng = random.Random()
+        
+        profile = profile or self.generation_profiles[self.default_profile]
+        generate_kwargs = dict(
+            rng=rng, seeded=seeded, cancel_token=cancel_token, deadline=deadline,
+            profile=profile, temperature=temperature, max_length=max_length
+        )
+        
         try:
-            # Try multiple strategies to get best result
-            strategies = [
-                ("parafrasekan", 1.3),      # Strategy 1: formal, higher temp
-                ("tulis ulang", 1.1),       # Strategy 2: creative, normal temp
-            ]
-            
-            all_candidates = []
-            
-            for prefix, temp in strategies:
-                prefix_text = f"{prefix}: {text}"
-                
-                inputs = self.tokenizer(
-                    prefix_text,
-                    return_tensors="pt",
-                    max_length=512,
-                    truncation=True,
-                    padding=True
+            strategies = self._profile_strategies(profile)
+            early_exit = self.enable_early_exit and len(strategies) > 1
+            if on_partial is not None or early_exit:
+                if on_partial is not None:
+                    all_candidates = self._stream_candidates(text, strategies[0], on_partial, **generate_kwargs)
+                else:
+                    all_candidates = self._request_candidates(text, strategies[:1], **generate_kwargs)
+                best_candidate, confidence = (
+                    self._select_best_candidate(text, all_candidates, vectors) if all_candidates else (None, 0.0)
                 )
-            
-                if self.use_gpu:
-                    inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                
-                # Add randomization for diversity
-                actual_temp = temp + random.uniform(-0.15, 0.25)
-                actual_temp = max(0.9, min(1.8, actual_temp))
-                
-                # Generate with both beam search and sampling
-                with torch.no_grad():
-                    # Beam search results
-                    outputs = self.model.generate(
-                        **inputs,
-                        max_length=min(len(text.split()) * 2 + 50, 256),
-                        min_length=max(len(text.split()) - 5, 5),
-                        num_beams=num_beams,
-                        num_return_sequences=2,  # Get 2 candidates per strategy
-                        do_sample=True,
-                        temperature=actual_temp,
-                        top_k=60,
-                        top_p=0.93,
-                        early_stopping=True,
-                        repetition_penalty=1.5,
-                        length_penalty=0.8,
-                        no_repeat_ngram_size=3,
-                        pad_token_id=self.tokenizer.pad_token_id,
-                        eos_token_id=self.tokenizer.eos_token_id
-                    )
+                good_enough = early_exit and best_candidate is not None and (
+                    confidence >= self.early_exit_similarity
+                    and self._word_overlap(text, best_candidate) <= self.early_exit_max_overlap
+                )
+                if early_exit:
+                    self._record_early_exit(good_enough)
                 
-                # Process all candidates
-                for output in outputs:
-                    import re
-                    decoded = self.tokenizer.decode(output, skip_special_tokens=True).strip()
-                    
-                    # ROBUST prefix removal - only at start of text
-                    prefixes_to_remove = [
-                        r'^parafrasekan\s*:\s*',
-                        r'^tulis\s+ulang\s*:\s*',
-                        r'^tulis\s*:\s*',
-                        r'^ulang\s*:\s*',
-                        r'^dengan\s+kata\s+berbeda\s*:\s*',
-                        r'^kata\s+berbeda\s*:\s*',
-                        r'^kata\s+beda\s*:\s*',
-                    ]
-                    
-                    for pattern in prefixes_to_remove:
-                        decoded = re.sub(pattern, '', decoded, flags=re.IGNORECASE)
-                    
-                    # Remove any garbage like "an:fratuktur:" or "frafaksi:" at start
-                    # Match pattern like: word:word: at the beginning
-                    decoded = re.sub(r'^[a-z]+:[a-z]+:\s*', '', decoded, flags=re.IGNORECASE)
-                    
-                    # Clean up multiple punctuation
-                    decoded = re.sub(r'\s+', ' ', decoded)
-                    decoded = re.sub(r'\.{2,}', '.', decoded)
-                    decoded = re.sub(r':{2,}', ':', decoded)
-                    decoded = re.sub(r'-{2,}', '-', decoded)
-                    decoded = decoded.strip(': .-,')
-                    
-                    # STRICT VALIDATION
-                    if decoded and self._is_valid_paraphrase(text, decoded):
-                        all_candidates.append(decoded)
+                # Without further strategies, or past the deadline, the first strategy's best candidate is kept
+                deadline_passed = deadline is not None and time.time() >= deadline
+                if good_enough or (best_candidate and (len(strategies) == 1 or deadline_passed)):
+                    return best_candidate, confidence
+                if len(strategies) > 1:
+                    all_candidates += self._request_candidates(text, strategies[1:], **generate_kwargs)
+            else:
+                all_candidates = self._request_candidates(text, None, **generate_kwargs)
             
             # Select best candidate
             if all_candidates:
-                # Score each candidate
-                best_candidate = None
-                best_score = -1
-                
-                for candidate in all_candidates:
-                    similarity = self._calculate_semantic_similarity(text, candidate)
-                    word_overlap = len(set(text.lower().split()) & set(candidate.lower().split())) / len(set(text.lower().split()))
-                    
-                    # Score: high semantic (0.75) + diversity (0.25)
-                    score = similarity * 0.75 + (1.0 - word_overlap) * 0.25
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_candidate = candidate
-                
+                best_candidate, confidence = self._select_best_candidate(text, all_candidates, vectors)
                 if best_candidate:
-                    confidence = self._calculate_semantic_similarity(text, best_candidate)
                     return best_candidate, confidence
             
             # Fallback to rule-based
-            logger.warning("⚠️ No valid neural candidates, using rule-based fallback")
-            fallback_result, _, _ = self._apply_synonym_substitution(text, rate=0.6)
-            if fallback_result != text:
-                return fallback_result, 0.5
-            else:
-                return text, 0.3
+            return self._neural_fallback(text, rng)
             
+        except OperationCancelled:
+            raise
+        except (TimeoutError, FutureTimeoutError):
+            # concurrent.futures.TimeoutError (scheduler) is only the builtin from Python 3.11
+            logger.warning("⏱️  Deadline reached while waiting for generation, using rule-based fallback")
+            return self._neural_fallback(text, rng)
         except Exception as e:
             logger.error(f"❌ Neural paraphrase failed: {e}")
             return text, 0.0
     
+    def _request_candidates(self, text: str, strategies: Optional[List[Tuple[str, float]]],
+                            rng: random.Random, seeded: bool,
+                            cancel_token: Optional[CancellationToken], deadline: Optional[float],
+                            profile: GenerationProfile, temperature: Optional[float],
+                            max_length: Optional[int]) -> List[str]:
+        """
+        Neural candidates of one request, through the scheduler when one is attached
+        
+        Args:
+            text: Input text
+            strategies: Prompt strategies to run (None = all of the profile's)
+            (remaining arguments as in _neural_paraphrase)
+            
+        Returns:
+            Valid candidates
+        """
+        # Tuples keep the scheduler's batching key hashable
+        strategies = tuple(strategies) if strategies is not None else None
+        if self.scheduler is not None:
+            # Batched together with concurrent requests by the scheduler worker
+            return self.scheduler.generate(
+                text, timeout=max(deadline - time.time(), 0.0) if deadline is not None else None,
+                rng=rng, exclusive=seeded, cancel_token=cancel_token, deadline=deadline,
+                profile=profile, strategies=strategies, temperature=temperature, max_length=max_length
+            )
+        return self._generate_candidates(
+            [text], strategies=strategies, rngs=[rng], cancel_tokens=[cancel_token], deadlines=[deadline],
+            profile=profile, temperature=temperature, max_length=max_length
+        )[0]
+    
+    def _stream_candidates(self, text: str, strategy: Tuple[str, float],
+                           on_partial: Callable[[str], None],
+                           rng: random.Random, seeded: bool,
+                           cancel_token: Optional[CancellationToken], deadline: Optional[float],
+                           profile: GenerationProfile, temperature: Optional[float],
+                           max_length: Optional[int]) -> List[str]:
+        """
+        Generate one strategy's candidate while streaming its tokens
+        
+        Streamers do not support beam search, so the row is decoded with one
+        beam (sampled through the profile's processors, or greedy). generate()
+        runs on a helper thread; this thread passes the cleaned text decoded
+        so far to on_partial as it grows. The scheduler is bypassed because a
+        streamed call cannot share its batch.
+        
+        Args:
+            text: Input text
+            strategy: (prefix, temperature) pair to stream
+            on_partial: Called with the partial output (generation itself stops through cancel_token)
+            (remaining arguments as in _neural_paraphrase)
+            
+        Returns:
+            Valid candidates (at most one)
+        """
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        outcome = {}
+        
+        def run():
+            try:
+                outcome["candidates"] = self._generate_candidates(
+                    [text], num_beams=1, num_return_sequences=1, strategies=[strategy],
+                    rngs=[rng], cancel_tokens=[cancel_token], deadlines=[deadline],
+                    profile=profile, temperature=temperature, max_length=max_length, streamer=streamer
+                )[0]
+            except BaseException as e:
+                outcome["error"] = e
+                streamer.end()
+        
+        worker = threading.Thread(target=run, name="neural-stream", daemon=True)
+        worker.start()
+        
+        partial = ""
+        for piece in streamer:
+            partial += piece
+            cleaned = self._clean_generated_text(partial)
+            if cleaned:
+                on_partial(cleaned)
+        worker.join()
+        
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["candidates"]
+    
+    def _record_early_exit(self, skipped: bool) -> None:
+        """Count a neural request that ran (or skipped) its later prompt strategies"""
+        with self._early_exit_lock:
+            self._early_exit_stats["requests"] += 1
+            self._early_exit_stats["second_pass_skipped" if skipped else "second_pass_run"] += 1
+    
+    def get_early_exit_stats(self) -> Dict[str, Any]:
+        """Get how often neural requests skipped their later prompt strategies"""
+        with self._early_exit_lock:
+            stats = dict(self._early_exit_stats)
+        stats["skip_rate"] = round(stats["second_pass_skipped"] / stats["requests"], 4) if stats["requests"] else None
+        stats.update(
+            enabled=self.enable_early_exit,
+            similarity_threshold=self.early_exit_similarity,
+            max_overlap=self.early_exit_max_overlap
+        )
+        return stats
+    
     def _is_valid_paraphrase(self, original: str, paraphrase: str) -> bool:
         """Validate if paraphrase is good quality"""
         import re
@@ -385,21 +1110,20 @@ class IndoT5HybridParaphraser:
             Similarity score (0-1)
         """
         try:
-            # Check cache first
-            cache_key = f"{text1[:100]}||{text2[:100]}"  # Use first 100 chars for key
-            if self.enable_caching and hasattr(self, '_similarity_cache'):
-                if cache_key in self._similarity_cache:
-                    return self._similarity_cache[cache_key]
-            
-            # Encode both texts using semantic_model (not similarity_model!)
-            embeddings = self.semantic_model.encode([text1, text2])
+            # Check cache first (hash of the full texts, so long texts do not collide)
+            cache_key = text_key(text1, text2)
+            if self.enable_caching:
+                cached_similarity = self._similarity_cache.get(cache_key)
+                if cached_similarity is not None:
+                    return cached_similarity
             
-            # Calculate cosine similarity
-            similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
+            # Normalized embeddings (persistent store first): cosine similarity = dot product
+            embeddings = self._embed_texts([text1, text2])
+            similarity = np.dot(embeddings[0], embeddings[1])
             
             # Cache result
-            if self.enable_caching and hasattr(self, '_similarity_cache'):
-                self._similarity_cache[cache_key] = float(similarity)
+            if self.enable_caching:
+                self._similarity_cache.put(cache_key, float(similarity))
             
             return float(similarity)
         except Exception as e:
@@ -421,19 +1145,41 @@ class IndoT5HybridParaphraser:
         
         return 1.0 - (intersection / union) if union > 0 else 0.0
     
-    def _apply_synonym_substitution(self, text: str, rate: float = None) -> Tuple[str, List[str], int]:
+    def _get_synonyms(self, word: str) -> List[str]:
+        """Get the synonym list of a word (handles both list and dict format, cached)"""
+        if self.enable_caching:
+            synonyms = self._synonym_cache.get(word)
+            if synonyms is not None:
+                return synonyms
+        
+        syn_data = self.synonym_data.get(word)
+        if isinstance(syn_data, list):
+            synonyms = syn_data
+        elif isinstance(syn_data, dict):
+            synonyms = syn_data.get('sinonim', [])
+        else:
+            synonyms = []
+        
+        if self.enable_caching:
+            self._synonym_cache.put(word, synonyms)
+        return synonyms
+    
+    def _apply_synonym_substitution(self, text: str, rate: float = None,
+                                    rng: Optional[random.Random] = None) -> Tuple[str, List[str], int]:
         """
         Apply synonym substitution to text
         
         Args:
             text: Input text
             rate: Synonym replacement rate
+            rng: Per-request random.Random (default: global random module)
             
         Returns:
             Tuple of (modified_text, transformations, changes_count)
         """
         if rate is None:
             rate = self.synonym_rate
+        rng = rng or random
         
         words = text.split()
         result = []
@@ -449,19 +1195,12 @@ class IndoT5HybridParaphraser:
                 continue
             
             # Check if word has synonyms
-            if clean_word in self.synonym_data and random.random() < rate:
-                # Handle both list format and dict format
-                syn_data = self.synonym_data[clean_word]
-                if isinstance(syn_data, list):
-                    synonyms = syn_data
-                elif isinstance(syn_data, dict):
-                    synonyms = syn_data.get('sinonim', [])
-                else:
-                    synonyms = []
+            if clean_word in self.synonym_data and rng.random() < rate:
+                synonyms = self._get_synonyms(clean_word)
                 
                 if synonyms:
                     # Choose random synonym
-                    chosen_synonym = random.choice(synonyms)
+                    chosen_synonym = rng.choice(synonyms)
                     
                     # PREVENT DUPLICATE: Check if chosen synonym matches previous or next word
                     prev_word = result[-1].lower().strip('.,!?;:"') if result else ""
@@ -494,19 +1233,33 @@ class IndoT5HybridParaphraser:
         
         return ' '.join(result), transformations, changes_count
     
-    def _apply_syntactic_transformation(self, text: str, max_transforms: int = None) -> Tuple[str, List[str], int]:
+    def _transform_budget(self, options: ParaphraseOptions, default: int) -> int:
+        """
+        Syntactic transforms allowed for one rule stage
+        
+        Starts from options.max_transformations (or the stage's own default)
+        and adds options.transformation_level, capped at the engine's
+        max_transformations (never below the starting budget).
+        """
+        base = default if options.max_transformations is None else options.max_transformations
+        return min(max(self.max_transformations, base), base + options.transformation_level)
+    
+    def _apply_syntactic_transformation(self, text: str, max_transforms: int = None,
+                                        rng: Optional[random.Random] = None) -> Tuple[str, List[str], int]:
         """
         Apply syntactic transformations to text
         
         Args:
             text: Input text
             max_transforms: Maximum number of transformations
+            rng: Per-request random.Random (default: global random module)
             
         Returns:
             Tuple of (modified_text, transformations, changes_count)
         """
         if max_transforms is None:
             max_transforms = self.max_transformations
+        rng = rng or random
         
         result = text
         transformations = []
@@ -521,7 +1274,7 @@ class IndoT5HybridParaphraser:
         
         # Apply random transformations
         num_transforms = min(max_transforms, len(transform_types))
-        selected_transforms = random.sample(transform_types, num_transforms)
+        selected_transforms = rng.sample(transform_types, num_transforms)
         
         for transform_type in selected_transforms:
             if transform_type in self.transformation_rules:
@@ -547,7 +1300,7 @@ class IndoT5HybridParaphraser:
                     for word, word_data in rules_data.items():
                         alternatives = word_data.get("alternatives", []) if isinstance(word_data, dict) else []
                         if alternatives and re.search(rf'\b{word}\b', result, re.IGNORECASE):
-                            chosen = random.choice(alternatives)
+                            chosen = rng.choice(alternatives)
                             new_result = re.sub(rf'\b{word}\b', chosen, result, count=1, flags=re.IGNORECASE)
                             
                             if new_result != result:
@@ -558,11 +1311,12 @@ class IndoT5HybridParaphraser:
         
         return result, transformations, changes_count
     
-    def _apply_word_reordering(self, text: str) -> str:
+    def _apply_word_reordering(self, text: str, rng: Optional[random.Random] = None) -> str:
         """
         Apply word reordering for better paraphrase variety
         Strategically reorder words while maintaining meaning
         """
+        rng = rng or random
         try:
             sentences = text.split('.')
             reordered_sentences = []
@@ -579,10 +1333,10 @@ class IndoT5HybridParaphraser:
                 
                 # Find adjectives and nouns to reorder
                 # Simple heuristic: try to move adjectives or modifiers
-                if random.random() < 0.4 and len(words) >= 4:
+                if rng.random() < 0.4 and len(words) >= 4:
                     # Try swapping some words carefully
                     # Example: "yang sangat baik" -> "yang baik sangat" is ok
-                    idx = random.randint(1, len(words) - 2)
+                    idx = rng.randint(1, len(words) - 2)
                     if idx < len(words) - 1:
                         words[idx], words[idx + 1] = words[idx + 1], words[idx]
                 
@@ -595,7 +1349,8 @@ class IndoT5HybridParaphraser:
     
     def _calculate_quality_metrics(self, original: str, paraphrased: str, 
                                  neural_confidence: float, word_changes: int, 
-                                 syntax_changes: int) -> Dict[str, float]:
+                                 syntax_changes: int,
+                                 semantic_similarity: Optional[float] = None) -> Dict[str, float]:
         """
         Calculate comprehensive quality metrics
         
@@ -605,16 +1360,18 @@ class IndoT5HybridParaphraser:
             neural_confidence: Neural model confidence
             word_changes: Number of word changes
             syntax_changes: Number of syntax changes
+            semantic_similarity: Precomputed similarity (skips encoding when given)
             
         Returns:
             Dictionary of quality metrics
         """
         # Semantic similarity
-        try:
-            embeddings = self.semantic_model.encode([original, paraphrased])
-            semantic_similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-        except:
-            semantic_similarity = 0.8  # Default fallback
+        if semantic_similarity is None:
+            try:
+                embeddings = self._embed_texts([original, paraphrased])
+                semantic_similarity = float(np.dot(embeddings[0], embeddings[1]))
+            except:
+                semantic_similarity = 0.8  # Default fallback
         
         # Lexical diversity
         original_words = set(original.lower().split())
@@ -648,252 +1405,721 @@ class IndoT5HybridParaphraser:
             "quality_score": quality_score
         }
     
-    def paraphrase(self, text: str, method: str = "hybrid") -> IndoT5HybridResult:
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
         """
-        Main paraphrasing method using hybrid approach
+        Embed texts, reading the persistent store first
+        
+        Texts missing from the store are encoded in ONE batched call and
+        written back, so warm restarts and other workers reuse them.
+        
+        Returns:
+            L2-normalized embedding matrix (cosine similarity = dot product)
+        """
+        if self._embedding_store is None:
+            return self._encode_texts(texts)
+        
+        keys = [text_key(t) for t in texts]
+        try:
+            vectors = self._embedding_store.get_many(keys)
+        except Exception as e:
+            logger.warning(f"⚠️  Embedding store read failed: {e}")
+            return self._encode_texts(texts)
+        
+        missing = {key: t for key, t in zip(keys, texts) if key not in vectors}
+        if missing:
+            # Round through float16 like stored vectors, so cold and warm runs score identically
+            encoded = self._encode_texts(list(missing.values())).astype(np.float16).astype(np.float32)
+            vectors.update(zip(missing, encoded))
+            try:
+                self._embedding_store.put_many(list(missing), encoded)
+            except Exception as e:
+                logger.warning(f"⚠️  Embedding store write failed: {e}")
+        
+        return np.stack([vectors[key] for key in keys])
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts with the semantic model in ONE batched call
+        
+        Returns:
+            L2-normalized embedding matrix (cosine similarity = dot product)
+        """
+        return np.asarray(self.semantic_model.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        ))
+    
+    def _embed_missing(self, texts: List[str], vectors: Dict[str, np.ndarray]) -> None:
+        """Embed the texts not yet in vectors with ONE encode() call (updates vectors in place)"""
+        missing = list(dict.fromkeys(t for t in texts if t not in vectors))
+        if missing:
+            for t, vector in zip(missing, self._embed_texts(missing)):
+                vectors[t] = vector
+    
+    def _plan_hybrid_stages(self, text: str, neural_result: str,
+                            neural_confidence: float) -> Dict[str, Optional[str]]:
+        """
+        Decide which rule stages a confident neural result still needs
+        
+        A neural result that already rewrote most of the original's words gains
+        little from synonym substitution or reordering, and reordering a result
+        of low similarity drifts further from the original.
         
         Args:
-            text: Input text to paraphrase
-            method: Paraphrasing method ("hybrid", "neural", "rule-based")
+            text: Original text
+            neural_result: Neural paraphrase
+            neural_confidence: Semantic similarity of neural_result to the original
             
         Returns:
-            IndoT5HybridResult object
+            Stage name -> reason the stage is skipped (None = run the stage)
         """
-        start_time = time.time()
+        plan = dict.fromkeys(("synonym_substitution", "syntactic_transformation", "word_reordering"))
+        if not self.adaptive_stages:
+            return plan
         
-        # Input validation
-        if not text or not text.strip():
-            return IndoT5HybridResult(
-                original_text=text,
-                paraphrased_text=text,
-                method_used=method,
-                transformations_applied=["Error: Empty input"],
-                quality_score=0.0,
-                confidence_score=0.0,
-                neural_confidence=0.0,
-                semantic_similarity=0.0,
-                lexical_diversity=0.0,
-                syntactic_complexity=0.0,
-                fluency_score=0.0,
-                processing_time=0.0,
-                word_changes=0,
-                syntax_changes=0,
-                success=False,
-                error_message="Empty input text"
-            )
+        diversity = 1.0 - self._word_overlap(text, neural_result)
+        if diversity >= self.stage_skip_diversity:
+            plan["synonym_substitution"] = plan["word_reordering"] = f"neural diversity {diversity:.2f}"
+        if diversity >= self.stage_skip_syntax_diversity:
+            plan["syntactic_transformation"] = f"neural diversity {diversity:.2f}"
+        if plan["word_reordering"] is None and neural_confidence < self.stage_reorder_min_similarity:
+            plan["word_reordering"] = f"neural similarity {neural_confidence:.2f}"
+        return plan
+    
+    def _apply_rule_stages(self, text: str, method: str,
+                           neural_result: Optional[str] = None,
+                           neural_confidence: float = 0.0,
+                           options: Optional[ParaphraseOptions] = None,
+                           rng: Optional[random.Random] = None) -> Tuple[str, List[str], int, int]:
+        """
+        Apply the rule-based stages of a paraphrasing method
         
-        # Check cache (include method in cache key)
-        cache_key = f"{method}:{text}"
-        if self.enable_caching and cache_key in self._result_cache:
-            cached_result = self._result_cache[cache_key]
-            cached_result.processing_time = time.time() - start_time
-            return cached_result
+        Args:
+            text: Original text
+            method: Paraphrasing method ("hybrid", "neural", "rule-based")
+            neural_result: Neural paraphrase (hybrid and neural methods)
+            neural_confidence: Neural confidence of neural_result
+            options: Per-request settings (defaults to default_options())
+            rng: Per-request random.Random shared by all stages (default: global random module)
+            
+        Returns:
+            Tuple of (final_text, transformations_applied, word_changes, syntax_changes)
+        """
+        options = options or self.default_options()
+        synonym_rate = options.synonym_rate
+        rng = rng or random
         
-        try:
-            transformations_applied = []
+        transformations_applied = []
+        word_changes = 0
+        syntax_changes = 0
+        
+        if method == "hybrid":
+            # ENHANCED HYBRID: Strategic balance of neural + rule-based
+            # Goal: Combine neural semantic accuracy with rule-based transformation diversity
+            transformations_applied.append(f"neural_generation (confidence: {neural_confidence:.2f})")
             
-            if method == "hybrid":
-                # ENHANCED HYBRID: Strategic balance of neural + rule-based
-                # Goal: Combine neural semantic accuracy with rule-based transformation diversity
-                
-                # Step 1: Neural paraphrase with IndoT5
-                neural_result, neural_confidence = self._neural_paraphrase(text)
-                transformations_applied.append(f"neural_generation (confidence: {neural_confidence:.2f})")
+            # Strategic Rule-based enhancement based on confidence
+            if neural_confidence >= options.min_confidence and neural_result != text:
+                # GOOD confidence - Apply BALANCED enhancements to preserve semantics
+                final_text = neural_result
+                plan = self._plan_hybrid_stages(text, neural_result, neural_confidence)
+                skipped = [f"skipped:{stage} ({reason})" for stage, reason in plan.items() if reason]
                 
-                word_changes = 0
-                syntax_changes = 0
-                
-                # Step 2: Strategic Rule-based enhancement based on confidence
-                if neural_confidence >= self.min_confidence and neural_result != text:
-                    # GOOD confidence - Apply BALANCED enhancements to preserve semantics
-                    current_text = neural_result
-                    
-                    # Moderate synonym substitution to enhance diversity
-                    synonym_result, synonym_transforms, wc = self._apply_synonym_substitution(
-                        current_text, rate=min(0.65, self.synonym_rate * 0.9)  # Moderate rate - preserve semantics
+                # Moderate synonym substitution to enhance diversity
+                if plan["synonym_substitution"] is None:
+                    final_text, synonym_transforms, wc = self._apply_synonym_substitution(
+                        final_text, rate=min(0.65, synonym_rate * 0.9),  # Moderate rate - preserve semantics
+                        rng=rng
                     )
                     word_changes += wc
                     transformations_applied.extend(synonym_transforms[:4])
-                    
-                    # Moderate syntactic transformation
+                
+                # Moderate syntactic transformation
+                if plan["syntactic_transformation"] is None:
                     final_text, syntax_transforms, sc = self._apply_syntactic_transformation(
-                        synonym_result, max_transforms=2  # Limited transforms for good neural results
+                        final_text,
+                        max_transforms=self._transform_budget(options, 2),  # Limited transforms for good neural results
+                        rng=rng
                     )
                     syntax_changes += sc
                     transformations_applied.extend(syntax_transforms[:2])
-                    
-                    # Occasional word reordering for natural variation
-                    if random.random() < 0.4:
-                        final_text = self._apply_word_reordering(final_text)
-                        transformations_applied.append("word_reordering")
-                        
-                else:
-                    # LOW confidence - Apply AGGRESSIVE rule-based transformations
-                    transformations_applied.append("low_confidence_fallback")
-                    
-                    # Apply stronger synonym substitution as fallback
-                    current_text, synonym_transforms, wc = self._apply_synonym_substitution(
-                        text, rate=min(0.85, self.synonym_rate * 1.2)  # Lebih tinggi untuk fallback
-                    )
-                    word_changes += wc
-                    transformations_applied.extend(synonym_transforms[:6])
-                    
-                    # Apply multiple syntactic transformations
-                    final_text, syntax_transforms, sc = self._apply_syntactic_transformation(
-                        current_text, max_transforms=4  # More transforms for fallback
-                    )
-                    syntax_changes += sc
-                    transformations_applied.extend(syntax_transforms[:3])
-                    
-                    # Always apply word reordering for aggressive fallback
-                    final_text = self._apply_word_reordering(final_text)
+                
+                # Occasional word reordering for natural variation
+                if plan["word_reordering"] is None and rng.random() < 0.4:
+                    final_text = self._apply_word_reordering(final_text, rng)
                     transformations_applied.append("word_reordering")
-            
-            elif method == "neural":
-                # Pure neural paraphrase
-                final_text, neural_confidence = self._neural_paraphrase(text)
-                transformations_applied.append("neural_generation")
-                word_changes = len(set(text.lower().split()) - set(final_text.lower().split()))
-                syntax_changes = 1 if final_text != text else 0
                 
-            elif method == "rule-based":
-                # Pure rule-based paraphrase - ENHANCED
-                neural_confidence = 0.0
-                transformations_applied = []
+                transformations_applied.extend(skipped)
                 
-                # Apply synonym substitution dengan rate yang TINGGI
-                current_text, synonym_transforms, word_changes = self._apply_synonym_substitution(
-                    text, rate=min(0.85, self.synonym_rate * 1.3)  # Tinggi rate untuk lebih banyak perubahan
+                # Stages that ran count their own changes; a skipped stage (adaptive
+                # stages only) is credited with the neural rewrite's changes instead,
+                # counted as the neural method counts them
+                if plan["synonym_substitution"]:
+                    word_changes += len(set(text.lower().split()) - set(neural_result.lower().split()))
+                if plan["syntactic_transformation"] and final_text != text:
+                    syntax_changes += 1
+                    
+            else:
+                # LOW confidence - Apply AGGRESSIVE rule-based transformations
+                transformations_applied.append("low_confidence_fallback")
+                
+                # Apply stronger synonym substitution as fallback
+                current_text, synonym_transforms, wc = self._apply_synonym_substitution(
+                    text, rate=min(0.85, synonym_rate * 1.2),  # Lebih tinggi untuk fallback
+                    rng=rng
                 )
-                transformations_applied.extend(synonym_transforms[:8])
+                word_changes += wc
+                transformations_applied.extend(synonym_transforms[:6])
                 
-                # Apply syntactic transformation dengan aggressive
-                final_text, syntax_transforms, syntax_changes = self._apply_syntactic_transformation(
-                    current_text, max_transforms=4  # Lebih banyak transformations
+                # Apply multiple syntactic transformations
+                final_text, syntax_transforms, sc = self._apply_syntactic_transformation(
+                    current_text,
+                    max_transforms=self._transform_budget(options, 4),  # More transforms for fallback
+                    rng=rng
                 )
-                transformations_applied.extend(syntax_transforms[:4])
+                syntax_changes += sc
+                transformations_applied.extend(syntax_transforms[:3])
                 
-                # Extra: Apply additional word order variations
-                if random.random() < 0.6:
-                    # Shuffle some words but keep meaning
-                    final_text = self._apply_word_reordering(final_text)
-                    transformations_applied.append("word_reordering")
+                # Always apply word reordering for aggressive fallback
+                final_text = self._apply_word_reordering(final_text, rng)
+                transformations_applied.append("word_reordering")
+        
+        elif method == "neural":
+            # Pure neural paraphrase
+            final_text = neural_result
+            transformations_applied.append("neural_generation")
+            word_changes = len(set(text.lower().split()) - set(final_text.lower().split()))
+            syntax_changes = 1 if final_text != text else 0
             
-            else:
+        elif method == "rule-based":
+            # Pure rule-based paraphrase - ENHANCED
+            # Apply synonym substitution dengan rate yang TINGGI
+            current_text, synonym_transforms, word_changes = self._apply_synonym_substitution(
+                text, rate=min(0.85, synonym_rate * 1.3),  # Tinggi rate untuk lebih banyak perubahan
+                rng=rng
+            )
+            transformations_applied.extend(synonym_transforms[:8])
+            
+            # Apply syntactic transformation dengan aggressive
+            final_text, syntax_transforms, syntax_changes = self._apply_syntactic_transformation(
+                current_text,
+                max_transforms=self._transform_budget(options, 4),  # Lebih banyak transformations
+                rng=rng
+            )
+            transformations_applied.extend(syntax_transforms[:4])
+            
+            # Extra: Apply additional word order variations
+            if rng.random() < 0.6:
+                # Shuffle some words but keep meaning
+                final_text = self._apply_word_reordering(final_text, rng)
+                transformations_applied.append("word_reordering")
+        
+        else:
+            raise ValueError(f"Unknown method: {method}")
+        
+        return final_text, transformations_applied, word_changes, syntax_changes
+    
+    def _build_result(self, text: str, final_text: str, method: str,
+                      transformations_applied: List[str], neural_confidence: float,
+                      word_changes: int, syntax_changes: int,
+                      quality_metrics: Dict[str, float], processing_time: float,
+                      deadline_exceeded: bool = False,
+                      generation_profile: Optional[str] = None) -> IndoT5HybridResult:
+        """Create a successful IndoT5HybridResult from stage outputs and metrics"""
+        return IndoT5HybridResult(
+            original_text=text,
+            paraphrased_text=final_text,
+            method_used=method,
+            transformations_applied=transformations_applied,
+            quality_score=quality_metrics["quality_score"],
+            confidence_score=min(neural_confidence + quality_metrics["quality_score"] / 100, 1.0),
+            neural_confidence=neural_confidence,
+            semantic_similarity=quality_metrics["semantic_similarity"],
+            lexical_diversity=quality_metrics["lexical_diversity"], 
+            syntactic_complexity=quality_metrics["syntactic_complexity"],
+            fluency_score=quality_metrics["fluency_score"],
+            processing_time=processing_time,
+            word_changes=word_changes,
+            syntax_changes=syntax_changes,
+            success=True,
+            deadline_exceeded=deadline_exceeded,
+            generation_profile=generation_profile
+        )
+    
+    def _error_result(self, text: str, method: str, error_message: str,
+                      transformation: str, processing_time: float) -> IndoT5HybridResult:
+        """Create a failed IndoT5HybridResult"""
+        return IndoT5HybridResult(
+            original_text=text,
+            paraphrased_text=text,
+            method_used=method,
+            transformations_applied=[transformation],
+            quality_score=0.0,
+            confidence_score=0.0,
+            neural_confidence=0.0,
+            semantic_similarity=0.0,
+            lexical_diversity=0.0,
+            syntactic_complexity=0.0,
+            fluency_score=0.0,
+            processing_time=processing_time,
+            word_changes=0,
+            syntax_changes=0,
+            success=False,
+            error_message=error_message
+        )
+    
+    def paraphrase(self, text: str, method: str = "hybrid", seed: Optional[int] = None,
+                   options: Optional[ParaphraseOptions] = None) -> IndoT5HybridResult:
+        """
+        Main paraphrasing method using hybrid approach
+        
+        With options.max_processing_time, generation stops at the deadline
+        (keeping the best valid candidate so far) or is skipped for the
+        rule-based path when no time is left; such results are flagged with
+        deadline_exceeded and not cached.
+        
+        Args:
+            text: Input text to paraphrase
+            method: Paraphrasing method ("hybrid", "neural", "rule-based")
+            seed: Random seed; the same seed and input give the same output
+            options: Per-request settings (defaults to default_options())
+            
+        Returns:
+            IndoT5HybridResult object
+            
+        Raises:
+            OperationCancelled: If options.cancel_token is cancelled before the result is ready
+        """
+        start_time = time.time()
+        
+        # Input validation
+        if not text or not text.strip():
+            return self._error_result(text, method, "Empty input text", "Error: Empty input", 0.0)
+        
+        options = options or self.default_options()
+        
+        # Check cache (include method, options and seed in cache key)
+        cache_key = self._result_cache_key(method, text, seed, options)
+        cached_result = self._get_cached_result(cache_key, options)
+        if cached_result is not None:
+            cached_result.processing_time = time.time() - start_time
+            return cached_result
+        
+        try:
+            if method not in self.SUPPORTED_METHODS:
                 raise ValueError(f"Unknown method: {method}")
             
+            self._check_cancelled(options)
+            
+            profile = self._resolve_profile(options, text)
+            
+            # Per-request RNG for every stage (seed=None draws from OS entropy)
+            rng = random.Random(seed)
+            
+            # Embeddings computed for this request (original, candidates, final)
+            vectors = {}
+            
+            deadline, generation_deadline = self._request_deadlines(start_time, options)
+            deadline_exceeded = False
+            
+            # Step 1: Neural paraphrase with IndoT5
+            generation_start = time.time()
+            if method in ("hybrid", "neural"):
+                if generation_deadline is not None and time.time() >= generation_deadline:
+                    logger.warning("⏱️  No time left for generation, using rule-based fallback")
+                    neural_result, neural_confidence = self._neural_fallback(text, rng)
+                    deadline_exceeded = True
+                else:
+                    neural_result, neural_confidence = self._neural_paraphrase(
+                        text, profile=profile, temperature=options.temperature, max_length=options.max_length,
+                        vectors=vectors, rng=rng, seeded=seed is not None,
+                        cancel_token=options.cancel_token, deadline=generation_deadline,
+                        on_partial=options.on_partial
+                    )
+                    deadline_exceeded = generation_deadline is not None and time.time() >= generation_deadline
+            else:
+                neural_result, neural_confidence = None, 0.0
+            generation_time = time.time() - generation_start
+            
+            self._check_cancelled(options)
+            
+            # Step 2: Rule-based stages
+            final_text, transformations_applied, word_changes, syntax_changes = self._apply_rule_stages(
+                text, method, neural_result, neural_confidence, options=options, rng=rng
+            )
+            
+            # Reuse the original (and candidate) vectors; only a new final text is encoded
+            if final_text == text:
+                semantic_similarity = 1.0
+            elif deadline is not None and time.time() >= deadline:
+                # Over budget: lexical similarity instead of another encode() call
+                semantic_similarity = self._quick_similarity(text, final_text)
+                deadline_exceeded = True
+            else:
+                try:
+                    self._embed_missing([text, final_text], vectors)
+                    semantic_similarity = float(np.dot(vectors[text], vectors[final_text]))
+                except Exception as e:
+                    logger.warning(f"Semantic similarity calculation failed: {e}")
+                    semantic_similarity = None
+            
             # Calculate quality metrics
             quality_metrics = self._calculate_quality_metrics(
-                text, final_text, neural_confidence, word_changes, syntax_changes
+                text, final_text, neural_confidence, word_changes, syntax_changes,
+                semantic_similarity=semantic_similarity
             )
             
             # Create result
-            result = IndoT5HybridResult(
-                original_text=text,
-                paraphrased_text=final_text,
-                method_used=method,
-                transformations_applied=transformations_applied,
-                quality_score=quality_metrics["quality_score"],
-                confidence_score=min(neural_confidence + quality_metrics["quality_score"] / 100, 1.0),
-                neural_confidence=neural_confidence,
-                semantic_similarity=quality_metrics["semantic_similarity"],
-                lexical_diversity=quality_metrics["lexical_diversity"], 
-                syntactic_complexity=quality_metrics["syntactic_complexity"],
-                fluency_score=quality_metrics["fluency_score"],
-                processing_time=time.time() - start_time,
-                word_changes=word_changes,
-                syntax_changes=syntax_changes,
-                success=True
+            result = self._build_result(
+                text, final_text, method, transformations_applied, neural_confidence,
+                word_changes, syntax_changes, quality_metrics, time.time() - start_time,
+                deadline_exceeded=deadline_exceeded,
+                generation_profile=self._profile_label(profile, options) if method in ("hybrid", "neural") else None
             )
+            self.planner.record_overhead(method, result.processing_time - generation_time)
             
             # Cache result (include method in cache key)
-            if self.enable_caching:
-                self._result_cache[cache_key] = result
+            self._store_result(cache_key, result, options)
             
             return result
             
+        except OperationCancelled:
+            self.record_cancellation(options.cancel_token)
+            raise
         except Exception as e:
             logger.error(f"❌ Paraphrase failed: {e}")
-            return IndoT5HybridResult(
-                original_text=text,
-                paraphrased_text=text,
-                method_used=method,
-                transformations_applied=["Error: Processing failed"],
-                quality_score=0.0,
-                confidence_score=0.0,
-                neural_confidence=0.0,
-                semantic_similarity=0.0,
-                lexical_diversity=0.0,
-                syntactic_complexity=0.0,
-                fluency_score=0.0,
-                processing_time=time.time() - start_time,
-                word_changes=0,
-                syntax_changes=0,
-                success=False,
-                error_message=str(e)
+            return self._error_result(
+                text, method, str(e), "Error: Processing failed", time.time() - start_time
             )
     
+    def attach_scheduler(self, scheduler) -> None:
+        """
+        Route single-text neural generation through an InferenceScheduler
+        
+        Streaming, pooled variations, batch work and the benchmark still call
+        _generate_candidates directly; max_concurrent_generate bounds them
+        together with the scheduler worker.
+        
+        Args:
+            scheduler: InferenceScheduler instance (None to detach)
+        """
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.start()
+    
+    def _resolve_profile(self, options: ParaphraseOptions, text: Optional[str] = None) -> GenerationProfile:
+        """
+        Generation profile of a request
+        
+        The profile named by the options; without one, the planner's choice
+        for options.latency_budget (when the text is known), else the default.
+        
+        Raises:
+            ValueError: For unknown profile names
+        """
+        name = options.profile
+        if name is None and options.latency_budget is not None and text:
+            name = self.estimate_latency(text, latency_budget=options.latency_budget)["recommended_profile"]
+        name = name or self.default_profile
+        if name not in self.generation_profiles:
+            raise ValueError(f"Unknown generation profile: {name}")
+        return self.generation_profiles[name]
+    
+    def _profile_strategies(self, profile: GenerationProfile) -> List[Tuple[str, float]]:
+        """NEURAL_STRATEGIES run by a profile"""
+        return [
+            strategy for strategy in self.NEURAL_STRATEGIES
+            if profile.strategies is None or strategy[0] in profile.strategies
+        ]
+    
+    @staticmethod
+    def _profile_label(profile: GenerationProfile, options: ParaphraseOptions) -> str:
+        """Reported generation_profile; streaming decodes its first strategy with one beam"""
+        return f"{profile.name}+streamed" if options.on_partial is not None else profile.name
+    
+    def _plan_work(self, text: str, profile: GenerationProfile) -> int:
+        """Planner work units of one text: prompt tokens x prompt rows x beams"""
+        strategies = self._profile_strategies(profile)
+        prompt_tokens = max(
+            len(self.tokenizer(f"{prefix}: {text}", max_length=512, truncation=True)["input_ids"])
+            for prefix, _ in strategies
+        )
+        return prompt_tokens * len(strategies) * profile.num_beams
+    
+    def estimate_latency(self, text: str, method: str = "hybrid",
+                         latency_budget: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Predict the latency of paraphrase() per profile without running the model
+        
+        Only the tokenizer runs; predictions come from the planner's fit of
+        recorded generate() timings (a conservative prior until enough are recorded).
+        
+        Args:
+            text: Input text
+            method: Paraphrasing method ("hybrid", "neural", "rule-based")
+            latency_budget: Budget in seconds used to recommend a profile
+            
+        Returns:
+            Dict with per-profile estimates, the recommended profile and
+            whether its p95 fits the budget
+        """
+        if method not in self.SUPPORTED_METHODS:
+            raise ValueError(f"Unknown method: {method}")
+        
+        neural = method in ("hybrid", "neural")
+        work = {
+            name: self._plan_work(text, profile) if neural else 0
+            for name, profile in self.generation_profiles.items()
+        }
+        estimates = {name: self.planner.predict(name, work[name], method) for name in self.generation_profiles}
+        
+        if latency_budget is not None:
+            recommended, within_budget = self.planner.choose(estimates, work, latency_budget * 1000.0)
+        else:
+            recommended, within_budget = self.default_profile, None
+        
+        return {
+            "method": method,
+            "words": len(text.split()),
+            "profiles": {name: {**estimate, "work": work[name]} for name, estimate in estimates.items()},
+            "latency_budget_ms": latency_budget * 1000.0 if latency_budget is not None else None,
+            "recommended_profile": recommended,
+            "within_budget": within_budget
+        }
+    
+    def get_profile_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get every generation profile with its measured generate() latency"""
+        stats = {}
+        for name, profile in self.generation_profiles.items():
+            values = np.array(self.planner.latencies(name)) * 1000.0
+            stats[name] = {
+                **asdict(profile),
+                "default": name == self.default_profile,
+                "generate_calls": len(values),
+                "mean_ms": round(float(values.mean()), 2) if len(values) else None,
+                "p50_ms": round(float(np.percentile(values, 50)), 2) if len(values) else None,
+                "p95_ms": round(float(np.percentile(values, 95)), 2) if len(values) else None
+            }
+        return stats
+    
+    def _request_deadlines(self, start_time: float,
+                           options: ParaphraseOptions) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Deadlines of a request started at start_time
+        
+        Returns:
+            Tuple of (deadline, generation deadline), both None without max_processing_time;
+            generation stops DEADLINE_RESERVE of the budget early to leave time for scoring
+        """
+        if not options.max_processing_time:
+            return None, None
+        deadline = start_time + options.max_processing_time
+        return deadline, self._generation_deadline(deadline, options)
+    
+    def _document_deadline(self, start_time: float, options: ParaphraseOptions) -> Optional[float]:
+        """
+        Deadline shared by every sentence of a document request started at start_time
+        
+        Profiles are planned per mini-batch, so for documents the latency budget
+        also bounds the whole request when no max_processing_time is set.
+        """
+        budget = options.max_processing_time or options.latency_budget
+        return start_time + budget if budget else None
+    
+    def _generation_deadline(self, deadline: Optional[float],
+                             options: ParaphraseOptions) -> Optional[float]:
+        """Generation limit for a deadline: DEADLINE_RESERVE of the budget is kept for scoring"""
+        if deadline is None:
+            return None
+        budget = options.max_processing_time or options.latency_budget
+        return deadline - budget * self.DEADLINE_RESERVE
+    
+    def _check_cancelled(self, options: Optional[ParaphraseOptions]) -> None:
+        """Raise OperationCancelled (and count the request) if the request was cancelled"""
+        token = options.cancel_token if options is not None else None
+        if token is not None and token.cancelled:
+            self.record_cancellation(token)
+            token.raise_if_cancelled()
+    
+    def record_cancellation(self, token: Optional[CancellationToken]) -> None:
+        """Count a cancelled request once, however many stages noticed it"""
+        if token is None:
+            return
+        with self._cancel_lock:
+            if token not in self._cancelled_tokens:
+                self._cancelled_tokens.add(token)
+                self._cancel_stats["requests"] += 1
+    
+    def get_cancellation_stats(self) -> Dict[str, int]:
+        """Get the number of cancelled requests and of generate() calls stopped early"""
+        with self._cancel_lock:
+            return dict(self._cancel_stats)
+    
+    def default_options(self, **overrides) -> ParaphraseOptions:
+        """
+        Options built from the engine defaults
+        
+        Args:
+            **overrides: ParaphraseOptions fields to override
+            
+        Returns:
+            ParaphraseOptions instance
+        """
+        options = ParaphraseOptions(
+            synonym_rate=self.synonym_rate,
+            min_confidence=self.min_confidence,
+            use_cache=self.enable_caching,
+            max_processing_time=self.max_processing_time
+        )
+        return replace(options, **overrides) if overrides else options
+    
+    def _result_cache_key(self, method: str, text: str, seed: Optional[int] = None,
+                          options: Optional[ParaphraseOptions] = None) -> str:
+        """
+        Result cache key
+        
+        Combines the model version, method, the options that change the
+        output (including the generation profile settings), the seed
+        (None = unseeded) and a hash of the full text.
+        """
+        options = options or self.default_options()
+        profile = self.generation_profiles.get(options.profile or self.default_profile)
+        params = json.dumps({
+            "version": self.RESULT_CACHE_VERSION,
+            "model": self.model_name,
+            "backend": self.backend,
+            "quantization": self.quantization,
+            "synonym_rate": options.synonym_rate,
+            "max_transformations": options.max_transformations,
+            "transformation_level": options.transformation_level,
+            "min_confidence": options.min_confidence,
+            "profile": asdict(profile) if profile is not None else options.profile,
+            "temperature": options.temperature,
+            "max_length": options.max_length,
+            "latency_budget": options.latency_budget if options.profile is None else None,
+            "streamed": options.on_partial is not None,
+            "seed": seed
+        }, sort_keys=True)
+        return f"{method}:{text_key(params, text)}"
+    
+    def _get_cached_result(self, cache_key: str,
+                           options: Optional[ParaphraseOptions] = None) -> Optional[IndoT5HybridResult]:
+        """Look up a result in the in-memory cache, then in the shared result store"""
+        if not (options or self.default_options()).use_cache:
+            return None
+        
+        result = self._result_cache.get(cache_key)
+        if result is None and self._result_store is not None:
+            try:
+                stored = self._result_store.get(cache_key)
+            except Exception as e:
+                logger.warning(f"⚠️  Result store read failed: {e}")
+                stored = None
+            if stored is not None:
+                result = IndoT5HybridResult(**stored)
+                self._result_cache.put(cache_key, result, tag=text_key(result.original_text))
+        return result
+    
+    def _store_result(self, cache_key: str, result: IndoT5HybridResult,
+                      options: Optional[ParaphraseOptions] = None) -> None:
+        """Cache a result in memory and in the shared result store"""
+        # Results cut short by a deadline are not reused by later requests
+        if not (options or self.default_options()).use_cache or result.deadline_exceeded:
+            return
+        
+        # Tagged with the text hash, so clear_cache(text) finds every variant
+        text_hash = text_key(result.original_text)
+        self._result_cache.put(cache_key, result, tag=text_hash)
+        if self._result_store is not None:
+            try:
+                self._result_store.put(cache_key, asdict(result), text_hash=text_hash)
+            except Exception as e:
+                logger.warning(f"⚠️  Result store write failed: {e}")
+    
     def clear_cache(self, text: str = None):
-        """Clear result cache for a specific text or all cache"""
-        if self.enable_caching:
-            if text:
-                self._result_cache.pop(text, None)
-            else:
-                self._result_cache.clear()
+        """
+        Clear cached results for a specific text or all in-memory caches
+        
+        Per-text clears remove every result of the text (all methods, options,
+        profiles and seeds) from memory and from the shared result store. The
+        shared store is only cleared per text; full clears leave it to its own
+        TTL/LRU eviction so other workers keep their hits.
+        """
+        if text:
+            text_hash = text_key(text)
+            self._result_cache.pop_tag(text_hash)
+            if self._result_store is not None:
+                self._result_store.delete_text(text_hash)
+        else:
+            self._result_cache.clear()
+            self._similarity_cache.clear()
+            self._synonym_cache.clear()
+            if self._encoder_cache is not None:
+                self._encoder_cache.clear()
+    
+    def get_cache_stats(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get size, memory and hit/miss/eviction statistics of all caches"""
+        return {
+            "results": self._result_cache.get_stats(),
+            "similarity": self._similarity_cache.get_stats(),
+            "synonyms": self._synonym_cache.get_stats(),
+            "encoder": self._encoder_cache.get_stats() if self._encoder_cache is not None else None,
+            "embedding_store": self._embedding_store.get_stats() if self._embedding_store is not None else None,
+            "result_store": self._result_store.get_stats() if self._result_store is not None else None
+        }
     
-    def generate_variations(self, text: str, num_variations: int = 5, method: str = "hybrid", min_quality_threshold: float = 70.0) -> List[IndoT5HybridResult]:
+    def generate_variations(self, text: str, num_variations: int = 5, method: str = "hybrid",
+                            min_quality_threshold: float = 70.0,
+                            use_candidate_pool: bool = True,
+                            seed: Optional[int] = None,
+                            options: Optional[ParaphraseOptions] = None) -> List[IndoT5HybridResult]:
         """
         Generate multiple paraphrase variations (OPTIMIZED)
         
+        With use_candidate_pool (default), one generate() call produces a pool
+        of candidates which is embedded once; variations are derived from that
+        pool by running the rule stages at increasing synonym_rate and
+        transformation_level (extra syntactic transforms per level). Otherwise paraphrase() runs once per variation.
+        
         Args:
             text: Input text
             num_variations: Number of variations to generate (default: 5)
             method: Paraphrasing method ("hybrid", "neural", "rule-based")
             min_quality_threshold: Minimum quality score (0-100) for filtering results (default: 70.0)
+            use_candidate_pool: Derive all variations from one shared candidate pool
+            seed: Random seed; the same seed and input give the same variations
+            options: Base settings the variation levels start from (defaults to default_options())
             
         Returns:
             List of IndoT5HybridResult objects sorted by quality score
+            
+        Raises:
+            OperationCancelled: If options.cancel_token is cancelled (checked between variations)
         """
         logger.info(f"🔄 Generating {num_variations} variations...")
         start_time = time.time()
+        options = options or self.default_options()
         
         variations = []
-        seen_texts = set()
-        
-        # Clear cache for this text to ensure unique variations
-        self.clear_cache(text)
+        pooled = False
         
-        # Store original parameters
-        original_rate = self.synonym_rate
-        original_transforms = self.max_transformations
-        original_caching = self.enable_caching
-        
-        # Disable caching for variations
-        self.enable_caching = False
+        if use_candidate_pool and text and text.strip() and method in self.SUPPORTED_METHODS:
+            try:
+                variations = self._generate_pooled_variations(
+                    text, num_variations, method, options, random.Random(seed)
+                )
+                pooled = True
+            except OperationCancelled:
+                self.record_cancellation(options.cancel_token)
+                raise
+            except Exception as e:
+                logger.error(f"❌ Pooled variations failed, falling back to per-variation generation: {e}")
         
-        try:
-            for i in range(num_variations):
-                logger.info(f"  📝 Variation {i+1}/{num_variations}...")
-                
-                # Adjust parameters for variation
-                self.synonym_rate = min(1.0, original_rate + (i * 0.15))
-                self.max_transformations = min(5, original_transforms + i)
-                
-                # Generate variation
-                result = self.paraphrase(text, method=method)
-                
-                # Only add if unique
-                if result.paraphrased_text not in seen_texts:
-                    variations.append(result)
-                    seen_texts.add(result.paraphrased_text)
-                    logger.info(f"  ✅ Variation {i+1} completed (quality: {result.quality_score:.2f})")
-                else:
-                    logger.info(f"  ⚠️  Variation {i+1} duplicate, skipped")
-        finally:
-            # Restore original parameters
-            self.synonym_rate = original_rate
-            self.max_transformations = original_transforms
-            self.enable_caching = original_caching
+        if not pooled:
+            variations = self._generate_sequential_variations(text, num_variations, method, options, seed)
         
         # Sort by quality score
         variations.sort(key=lambda x: x.quality_score, reverse=True)
@@ -912,26 +2138,517 @@ class IndoT5HybridParaphraser:
         
         return variations
     
-    def batch_paraphrase(self, texts: List[str], method: str = "hybrid") -> List[IndoT5HybridResult]:
+    def _variation_options(self, options: ParaphraseOptions, level: int) -> ParaphraseOptions:
+        """Options of the level-th variation (higher synonym rate and syntactic budget)"""
+        return replace(
+            options,
+            synonym_rate=min(1.0, options.synonym_rate + (level * 0.15)),
+            transformation_level=options.transformation_level + level
+        )
+    
+    def _generate_pooled_variations(self, text: str, num_variations: int, method: str,
+                                    options: Optional[ParaphraseOptions] = None,
+                                    rng: Optional[random.Random] = None) -> List[IndoT5HybridResult]:
+        """
+        Derive variations from one shared candidate pool
+        
+        Cost: one generate() call (num_return_sequences sized to cover
+        num_variations over the profile's strategies) and two encode() calls,
+        instead of num_variations full paraphrase() runs. Deterministic
+        profiles keep their own candidate budget; the rule stage levels still
+        make the variations differ.
+        """
+        start_time = time.time()
+        options = options or self.default_options()
+        rng = rng or random.Random()
+        _, generation_deadline = self._request_deadlines(start_time, options)
+        deadline_exceeded = False
+        pool: List[str] = []
+        pool_similarities: List[float] = []
+        original_vector = None
+        
+        profile = self._resolve_profile(options, text)
+        if method in ("hybrid", "neural"):
+            per_strategy = profile.num_return_sequences
+            if profile.sampling:
+                strategy_count = len(profile.strategies or self.NEURAL_STRATEGIES)
+                per_strategy = max(per_strategy, -(-num_variations // strategy_count))
+            try:
+                candidates = self._generate_candidates(
+                    [text], num_beams=max(profile.num_beams, per_strategy), num_return_sequences=per_strategy,
+                    rngs=[rng], cancel_tokens=[options.cancel_token], deadlines=[generation_deadline],
+                    profile=profile, temperature=options.temperature, max_length=options.max_length
+                )[0]
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Candidate pool generation failed: {e}")
+                candidates = []
+            candidates = list(dict.fromkeys(candidates))
+            deadline_exceeded = generation_deadline is not None and time.time() >= generation_deadline
+            
+            # Embed original + whole pool once, rank pool best-first
+            vectors = self._embed_texts([text] + candidates)
+            original_vector = vectors[0]
+            similarities = (vectors[1:] @ original_vector).tolist() if candidates else []
+            scores = self._candidate_scores(text, candidates, similarities)
+            ranked = sorted(zip(scores, candidates, similarities), key=lambda item: item[0], reverse=True)
+            pool = [candidate for _, candidate, _ in ranked]
+            pool_similarities = [float(similarity) for _, _, similarity in ranked]
+            
+            if not pool:
+                fallback, confidence = self._neural_fallback(text, rng)
+                pool, pool_similarities = [fallback], [confidence]
+        
+        # Rule stages at increasing levels over the pool
+        profile_name = profile.name if method in ("hybrid", "neural") else None
+        staged = []
+        seen_texts = set()
+        for i in range(num_variations):
+            self._check_cancelled(options)
+            if pool:
+                neural_result = pool[i % len(pool)]
+                neural_confidence = pool_similarities[i % len(pool)]
+            else:
+                neural_result, neural_confidence = None, 0.0
+            
+            final_text, transformations_applied, word_changes, syntax_changes = self._apply_rule_stages(
+                text, method, neural_result, neural_confidence,
+                options=self._variation_options(options, i), rng=rng
+            )
+            
+            # Only keep unique variations
+            if final_text in seen_texts:
+                logger.info(f"  ⚠️  Variation {i+1} duplicate, skipped")
+                continue
+            seen_texts.add(final_text)
+            staged.append((final_text, transformations_applied, word_changes, syntax_changes, neural_confidence))
+        
+        if not staged:
+            return []
+        
+        # Score all variations with one encode() call
+        final_texts = [item[0] for item in staged]
+        if original_vector is None:
+            vectors = self._embed_texts([text] + final_texts)
+            original_vector, final_vectors = vectors[0], vectors[1:]
+        else:
+            final_vectors = self._embed_texts(final_texts)
+        similarities = final_vectors @ original_vector
+        
+        per_item_time = (time.time() - start_time) / len(staged)
+        variations = []
+        for i, (final_text, transformations_applied, word_changes, syntax_changes, neural_confidence) in enumerate(staged):
+            quality_metrics = self._calculate_quality_metrics(
+                text, final_text, neural_confidence, word_changes, syntax_changes,
+                semantic_similarity=float(similarities[i])
+            )
+            variations.append(self._build_result(
+                text, final_text, method, transformations_applied, neural_confidence,
+                word_changes, syntax_changes, quality_metrics, per_item_time,
+                deadline_exceeded=deadline_exceeded, generation_profile=profile_name
+            ))
+            logger.info(f"  ✅ Variation {i+1} completed (quality: {variations[-1].quality_score:.2f})")
+        
+        return variations
+    
+    def _generate_sequential_variations(self, text: str, num_variations: int, method: str,
+                                        options: Optional[ParaphraseOptions] = None,
+                                        seed: Optional[int] = None) -> List[IndoT5HybridResult]:
+        """Generate variations with one full paraphrase() call each"""
+        variations = []
+        seen_texts = set()
+        
+        # Caching is skipped per call to ensure unique variations
+        options = replace(options or self.default_options(), use_cache=False)
+        
+        # One derived seed per variation keeps seeded runs reproducible
+        seed_rng = random.Random(seed)
+        
+        for i in range(num_variations):
+            self._check_cancelled(options)
+            logger.info(f"  📝 Variation {i+1}/{num_variations}...")
+            
+            # Generate variation with adjusted parameters
+            result = self.paraphrase(
+                text, method=method,
+                seed=seed_rng.getrandbits(32) if seed is not None else None,
+                options=self._variation_options(options, i)
+            )
+            
+            # Only add if unique
+            if result.paraphrased_text not in seen_texts:
+                variations.append(result)
+                seen_texts.add(result.paraphrased_text)
+                logger.info(f"  ✅ Variation {i+1} completed (quality: {result.quality_score:.2f})")
+            else:
+                logger.info(f"  ⚠️  Variation {i+1} duplicate, skipped")
+        
+        return variations
+    
+    def batch_paraphrase(self, texts: List[str], method: str = "hybrid",
+                         batch_size: int = 16,
+                         options: Optional[ParaphraseOptions] = None,
+                         deadline: Optional[float] = None) -> List[IndoT5HybridResult]:
         """
-        Process multiple texts in batch
+        Process multiple texts in batch (VECTORIZED)
+        
+        Neural candidates are generated in length-sorted mini-batches (one
+        padded generate() call each), all originals and candidates are embedded
+        in a single encode() call, and all final texts are scored with one more
+        encode() call. Empty inputs, cache hits and duplicates are resolved
+        without model work. Past the deadline, remaining texts get the
+        rule-based fallback and are marked deadline_exceeded.
         
         Args:
             texts: List of input texts
             method: Paraphrasing method
+            batch_size: Number of texts per generate() call
+            options: Per-request settings (defaults to default_options())
+            deadline: time.time() limit shared by the whole request (default: from
+                options.max_processing_time or options.latency_budget, counted from now)
             
         Returns:
-            List of IndoT5HybridResult objects
+            List of IndoT5HybridResult objects (same order as texts)
+            
+        Raises:
+            OperationCancelled: If options.cancel_token is cancelled (checked per mini-batch)
         """
-        results = []
+        logger.info(f"🔄 Batch processing {len(texts)} texts (method: {method})...")
+        options = options or self.default_options()
+        if deadline is None:
+            deadline = self._document_deadline(time.time(), options)
+        self._check_cancelled(options)
+        results: List[Optional[IndoT5HybridResult]] = [None] * len(texts)
         
+        # Resolve invalid input and cache hits, deduplicate the rest
+        pending: Dict[str, List[int]] = {}
         for i, text in enumerate(texts):
-            logger.info(f"Processing {i+1}/{len(texts)}: {text[:50]}...")
-            result = self.paraphrase(text, method=method)
-            results.append(result)
+            if not text or not text.strip() or method not in self.SUPPORTED_METHODS:
+                results[i] = self.paraphrase(text, method=method, options=options)
+                continue
+            
+            cached_result = self._get_cached_result(self._result_cache_key(method, text, options=options), options)
+            if cached_result is not None:
+                results[i] = cached_result
+            else:
+                pending.setdefault(text, []).append(i)
+        
+        unique_texts = list(pending)
+        if unique_texts:
+            try:
+                batch_results = self._batch_paraphrase_unique(unique_texts, method, batch_size, options,
+                                                              deadline=deadline)
+            except OperationCancelled:
+                self.record_cancellation(options.cancel_token)
+                raise
+            except Exception as e:
+                logger.error(f"❌ Vectorized batch failed, falling back to sequential processing: {e}")
+                batch_results = [self.paraphrase(text, method=method, options=options) for text in unique_texts]
+            
+            for text, result in zip(unique_texts, batch_results):
+                for i in pending[text]:
+                    results[i] = result
+                if result.success:
+                    self._store_result(self._result_cache_key(method, text, options=options), result, options)
         
         return results
     
+    def _batch_paraphrase_unique(self, texts: List[str], method: str, batch_size: int,
+                                 options: Optional[ParaphraseOptions] = None,
+                                 deadline: Optional[float] = None) -> List[IndoT5HybridResult]:
+        """Vectorized paraphrasing of unique, non-empty texts (see batch_paraphrase for the deadline)"""
+        start_time = time.time()
+        options = options or self.default_options()
+        rngs = [random.Random() for _ in texts]
+        generation_deadline = self._generation_deadline(deadline, options)
+        deadline_exceeded = [False] * len(texts)
+        
+        # Step 1: Neural candidates in length-sorted mini-batches
+        neural_outputs = [(None, 0.0)] * len(texts)
+        original_vectors = None
+        profile = None
+        
+        if method in ("hybrid", "neural"):
+            # Budgeted batches are planned for their longest text
+            profile = self._resolve_profile(options, max(texts, key=len))
+            candidates: List[List[str]] = [[] for _ in texts]
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i].split()))
+            
+            for offset in range(0, len(order), batch_size):
+                self._check_cancelled(options)
+                indices = order[offset:offset + batch_size]
+                if generation_deadline is not None and time.time() >= generation_deadline:
+                    # Texts without candidates get the rule-based fallback below
+                    logger.warning(f"⏱️  No time left for generation, using rule-based fallback for "
+                                   f"{len(order) - offset} texts")
+                    for i in order[offset:]:
+                        deadline_exceeded[i] = True
+                    break
+                logger.info(f"  📝 Generating {offset + len(indices)}/{len(texts)}...")
+                try:
+                    batch_candidates = self._generate_candidates(
+                        [texts[i] for i in indices], rngs=[rngs[i] for i in indices],
+                        cancel_tokens=[options.cancel_token] * len(indices),
+                        deadlines=[generation_deadline] * len(indices),
+                        profile=profile, temperature=options.temperature, max_length=options.max_length
+                    )
+                except OperationCancelled:
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ Neural batch generation failed: {e}")
+                    batch_candidates = [[] for _ in indices]
+                batch_truncated = generation_deadline is not None and time.time() >= generation_deadline
+                for i, text_candidates in zip(indices, batch_candidates):
+                    candidates[i] = text_candidates
+                    deadline_exceeded[i] = batch_truncated
+            
+            # One encode() call for every original and every candidate
+            vectors = self._embed_texts(list(texts) + [c for cs in candidates for c in cs])
+            original_vectors = vectors[:len(texts)]
+            
+            neural_outputs = []
+            offset = len(texts)
+            for i, text in enumerate(texts):
+                candidate_vectors = vectors[offset:offset + len(candidates[i])]
+                offset += len(candidates[i])
+                
+                best_candidate, confidence = self._rank_candidates(
+                    text, candidates[i], (candidate_vectors @ original_vectors[i]).tolist()
+                )
+                if best_candidate is None:
+                    best_candidate, confidence = self._neural_fallback(text, rngs[i])
+                neural_outputs.append((best_candidate, confidence))
+        
+        self._check_cancelled(options)
+        
+        # Step 2: Rule-based stages over the whole batch
+        staged = [
+            self._apply_rule_stages(text, method, neural_result, neural_confidence, options=options, rng=rng)
+            for text, (neural_result, neural_confidence), rng in zip(texts, neural_outputs, rngs)
+        ]
+        
+        # Step 3: Score all final texts with one encode() call
+        final_texts = [final_text for final_text, _, _, _ in staged]
+        if deadline is not None and time.time() >= deadline:
+            # Over budget: lexical similarity instead of another encode() call
+            similarities = [self._quick_similarity(text, final_text) for text, final_text in zip(texts, final_texts)]
+            deadline_exceeded = [True] * len(texts)
+        else:
+            if original_vectors is None:
+                vectors = self._embed_texts(list(texts) + final_texts)
+                original_vectors, final_vectors = vectors[:len(texts)], vectors[len(texts):]
+            else:
+                final_vectors = self._embed_texts(final_texts)
+            similarities = np.sum(original_vectors * final_vectors, axis=1)
+        
+        # Batch time is amortized over the items
+        per_item_time = (time.time() - start_time) / len(texts)
+        
+        results = []
+        for i, text in enumerate(texts):
+            final_text, transformations_applied, word_changes, syntax_changes = staged[i]
+            neural_confidence = neural_outputs[i][1]
+            quality_metrics = self._calculate_quality_metrics(
+                text, final_text, neural_confidence, word_changes, syntax_changes,
+                semantic_similarity=float(similarities[i])
+            )
+            results.append(self._build_result(
+                text, final_text, method, transformations_applied, neural_confidence,
+                word_changes, syntax_changes, quality_metrics, per_item_time,
+                deadline_exceeded=deadline_exceeded[i],
+                generation_profile=profile.name if profile is not None else None
+            ))
+        
+        return results
+    
+    def paraphrase_sentences(self, text: str, method: str = "hybrid",
+                             options: Optional[ParaphraseOptions] = None,
+                             batch_size: Optional[int] = None) -> IndoT5HybridResult:
+        """
+        Sentence-parallel paraphrasing for multi-sentence inputs
+        
+        The input is split into sentences which go through batch_paraphrase()
+        together (by default all of them in ONE padded generate() call) and
+        are reassembled in order. Nothing is truncated at the tokenizer limit,
+        and latency follows the longest sentence instead of the total length.
+        
+        Args:
+            text: Input text (one or more sentences)
+            method: Paraphrasing method ("hybrid", "neural", "rule-based")
+            options: Per-request settings (defaults to default_options())
+            batch_size: Sentences per generate() call (default: all sentences)
+            
+        Returns:
+            IndoT5HybridResult for the whole text, per-sentence results in sentence_results
+        """
+        start_time = time.time()
+        
+        sentences = self._file_parser.split_into_sentences(text, min_words=1) if text else []
+        if len(sentences) <= 1 or method not in self.SUPPORTED_METHODS:
+            return self.paraphrase(text, method=method, options=options)
+        
+        sentence_results = self.batch_paraphrase(
+            sentences, method=method, batch_size=batch_size or len(sentences), options=options,
+            deadline=self._document_deadline(start_time, options or self.default_options())
+        )
+        return self._combine_sentence_results(text, method, sentence_results, time.time() - start_time)
+    
+    def paraphrase_chunks(self, chunks: List[str], method: str = "hybrid",
+                          options: Optional[ParaphraseOptions] = None,
+                          batch_size: int = 16) -> Tuple[IndoT5HybridResult, List[IndoT5HybridResult]]:
+        """
+        Paraphrase overlapping document chunks, each unique sentence once
+        
+        Chunks from FileParser.chunk_text repeat up to three sentences of the
+        previous chunk. Sentences get IDs, every unique sentence goes through
+        batch_paraphrase() exactly once, and the chunks and the document are
+        rebuilt from the sentence map instead of stripping overlaps afterwards.
+        
+        Args:
+            chunks: Non-empty text chunks in document order
+            method: Paraphrasing method ("hybrid", "neural", "rule-based")
+            options: Per-request settings (defaults to default_options())
+            batch_size: Sentences per generate() call
+            
+        Returns:
+            Tuple of (document result, per-chunk results)
+        """
+        start_time = time.time()
+        
+        sentences, chunk_ids, document_ids = self._file_parser.map_chunk_sentences(chunks)
+        sentence_results = self.batch_paraphrase(
+            sentences, method=method, batch_size=batch_size, options=options,
+            deadline=self._document_deadline(start_time, options or self.default_options())
+        )
+        processing_time = time.time() - start_time
+        
+        chunk_results = [
+            self._combine_sentence_results(chunk, method, [sentence_results[i] for i in ids], processing_time)
+            for chunk, ids in zip(chunks, chunk_ids)
+        ]
+        document_result = self._combine_sentence_results(
+            " ".join(sentences[i] for i in document_ids), method,
+            [sentence_results[i] for i in document_ids], processing_time
+        )
+        
+        logger.info(f"✅ Paraphrased {len(chunks)} chunks: {len(sentences)} unique sentences "
+                    f"({sum(len(ids) for ids in chunk_ids)} incl. overlap)")
+        return document_result, chunk_results
+    
+    def iter_paraphrase_chunks(self, chunks: List[str], method: str = "hybrid",
+                               options: Optional[ParaphraseOptions] = None,
+                               batch_size: int = 16,
+                               max_workers: int = 2) -> Iterator[Tuple[Optional[int], IndoT5HybridResult]]:
+        """
+        Streaming variant of paraphrase_chunks()
+        
+        Every unique sentence belongs to the first chunk that contains it.
+        Chunks run through batch_paraphrase() on a bounded worker pool, one
+        call per chunk for the sentences it owns. Results are yielded in chunk
+        order as soon as a chunk and all chunks before it are done (the
+        overlap sentences of a chunk belong to earlier chunks). Closing the
+        generator cancels chunks that have not started; cancelling
+        options.cancel_token also stops the running ones.
+        
+        Args:
+            chunks: Non-empty text chunks in document order
+            method: Paraphrasing method ("hybrid", "neural", "rule-based")
+            options: Per-request settings (defaults to default_options())
+            batch_size: Sentences per generate() call
+            max_workers: Chunks processed concurrently
+            
+        Yields:
+            (chunk_index, chunk_result) in chunk order, then (None, document_result)
+        """
+        start_time = time.time()
+        
+        sentences, chunk_ids, document_ids = self._file_parser.map_chunk_sentences(chunks)
+        owned: List[List[int]] = [[] for _ in chunks]
+        seen = set()
+        for chunk_index, ids in enumerate(chunk_ids):
+            for i in ids:
+                if i not in seen:
+                    seen.add(i)
+                    owned[chunk_index].append(i)
+        
+        sentence_results: List[Optional[IndoT5HybridResult]] = [None] * len(sentences)
+        
+        # One deadline for the whole document, not one per chunk
+        deadline = self._document_deadline(start_time, options or self.default_options())
+        
+        def run_chunk(chunk_index: int) -> Tuple[int, List[IndoT5HybridResult]]:
+            self._check_cancelled(options)
+            ids = owned[chunk_index]
+            if not ids:
+                return chunk_index, []
+            return chunk_index, self.batch_paraphrase(
+                [sentences[i] for i in ids], method=method, batch_size=batch_size, options=options,
+                deadline=deadline
+            )
+        
+        pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="chunk-worker")
+        try:
+            futures = [pool.submit(run_chunk, chunk_index) for chunk_index in range(len(chunks))]
+            done = set()
+            next_index = 0
+            for future in as_completed(futures):
+                chunk_index, results = future.result()
+                for i, result in zip(owned[chunk_index], results):
+                    sentence_results[i] = result
+                done.add(chunk_index)
+                
+                # Keep chunk order even when later chunks finish first
+                while next_index in done:
+                    yield next_index, self._combine_sentence_results(
+                        chunks[next_index], method,
+                        [sentence_results[i] for i in chunk_ids[next_index]], time.time() - start_time
+                    )
+                    next_index += 1
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        yield None, self._combine_sentence_results(
+            " ".join(sentences[i] for i in document_ids), method,
+            [sentence_results[i] for i in document_ids], time.time() - start_time
+        )
+    
+    def _combine_sentence_results(self, text: str, method: str,
+                                  sentence_results: List[IndoT5HybridResult],
+                                  processing_time: float) -> IndoT5HybridResult:
+        """Reassemble per-sentence results; scores are averaged weighted by sentence length"""
+        if not sentence_results:
+            return self._error_result(text, method, "Empty input text", "Error: Empty input", processing_time)
+        
+        weights = np.array([max(len(r.original_text.split()), 1) for r in sentence_results], dtype=np.float64)
+        
+        def weighted(attribute: str) -> float:
+            values = np.array([getattr(r, attribute) for r in sentence_results], dtype=np.float64)
+            return float(np.dot(values, weights) / weights.sum())
+        
+        errors = [r.error_message for r in sentence_results if not r.success]
+        return IndoT5HybridResult(
+            original_text=text,
+            paraphrased_text=" ".join(r.paraphrased_text for r in sentence_results),
+            method_used=method,
+            transformations_applied=[t for r in sentence_results for t in r.transformations_applied],
+            quality_score=weighted("quality_score"),
+            confidence_score=weighted("confidence_score"),
+            neural_confidence=weighted("neural_confidence"),
+            semantic_similarity=weighted("semantic_similarity"),
+            lexical_diversity=weighted("lexical_diversity"),
+            syntactic_complexity=weighted("syntactic_complexity"),
+            fluency_score=weighted("fluency_score"),
+            processing_time=processing_time,
+            word_changes=sum(r.word_changes for r in sentence_results),
+            syntax_changes=sum(r.syntax_changes for r in sentence_results),
+            success=not errors,
+            error_message=errors[0] if errors else None,
+            sentence_results=sentence_results,
+            deadline_exceeded=any(r.deadline_exceeded for r in sentence_results),
+            generation_profile=next((r.generation_profile for r in sentence_results if r.generation_profile), None)
+        )
+    
     def paraphrase_with_analysis(self, text: str) -> IndoT5HybridResult:
         """
         Paraphrase with detailed analysis
@@ -950,12 +2667,24 @@ class IndoT5HybridParaphraser:
             "model_name": self.model_name,
             "device": str(self.device),
             "use_gpu": self.use_gpu,
+            "backend": self.backend,
+            "quantization": self.quantization,
             "synonym_rate": self.synonym_rate,
             "min_confidence": self.min_confidence,
             "quality_threshold": self.quality_threshold,
             "max_transformations": self.max_transformations,
+            "max_processing_time": self.max_processing_time,
+            "max_concurrent_generate": self.max_concurrent_generate,
+            "default_profile": self.default_profile,
+            "generation_profiles": self.get_profile_stats(),
+            "planner": self.planner.get_stats(),
+            "early_exit": self.get_early_exit_stats(),
+            "candidates": self.get_candidate_stats(),
             "synonyms_loaded": len(self.synonym_data),
-            "stopwords_loaded": len(self.stop_words)
+            "stopwords_loaded": len(self.stop_words),
+            "scheduler": self.scheduler.get_stats() if self.scheduler is not None else None,
+            "caches": self.get_cache_stats(),
+            "cancellations": self.get_cancellation_stats()
         }
 
 def create_indot5_hybrid_paraphraser(model_name: str = "Wikidepia/IndoT5-base", 
@@ -0,0 +1,350 @@
+"""
+Inference Scheduler for IndoT5 Hybrid Paraphraser
+Dynamic micro-batching of generation requests coming from concurrent web threads
+"""
+
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cancellation import CancellationToken, OperationCancelled
+
+logger = logging.getLogger(__name__)
+
+# Seconds between cancellation checks while a cancellable request waits for its batch
+CANCEL_POLL_INTERVAL = 0.05
+
+
+class SchedulerQueueFullError(RuntimeError):
+    """Raised when the scheduler queue is at its configured depth"""
+
+
+@dataclass
+class _PendingRequest:
+    """A single generation request waiting in the scheduler queue"""
+    text: str
+    generate_kwargs: Dict[str, Any]
+    future: Future
+    rng: Optional[random.Random] = None
+    exclusive: bool = False
+    cancel_token: Optional[CancellationToken] = None
+    deadline: Optional[float] = None
+    enqueued_at: float = field(default_factory=time.time)
+
+    @property
+    def group_key(self) -> Tuple:
+        """Requests can only share a generate() call when their settings match"""
+        key = tuple(sorted(self.generate_kwargs.items()))
+        if self.exclusive:
+            # Length limits are per text (see _generate_candidates), so batching does not
+            # change them; seeded requests still run alone so padding cannot perturb a replay
+            key += (("exclusive", id(self)),)
+        return key
+
+
+class InferenceScheduler:
+    """
+    Cross-request dynamic micro-batching scheduler
+
+    Flask threads submit texts and receive a Future. A single worker thread
+    collects pending requests for up to `max_wait_ms` (or until
+    `max_batch_size` requests are waiting), sorts them by token length and
+    runs them as padded, length-bucketed `_generate_candidates` calls.
+    `_generate_candidates` applies each text's own min/max length per row,
+    so a request's generation limits do not depend on its batch.
+
+    Only single-text neural requests (`_request_candidates`) go through the
+    worker. Streaming (`_stream_candidates`), pooled variations
+    (`_generate_pooled_variations`), batch/chunk/job work
+    (`_batch_paraphrase_unique`) and the benchmark call
+    `_generate_candidates` directly. Every path shares the paraphraser's
+    `max_concurrent_generate` slots, so the worker and those callers never
+    run more generate() calls at once than configured.
+    """
+
+    def __init__(self,
+                 paraphraser,
+                 max_wait_ms: float = 10.0,
+                 max_batch_size: int = 8,
+                 max_batch_tokens: int = 4096,
+                 queue_depth: int = 64):
+        """
+        Initialize Inference Scheduler
+
+        Args:
+            paraphraser: IndoT5HybridParaphraser used to run generation
+            max_wait_ms: Maximum time to wait for more requests before running a batch
+            max_batch_size: Maximum number of texts collected into one batch
+            max_batch_tokens: Maximum padded prompt tokens (rows x beams x longest prompt) per generate() call
+            queue_depth: Maximum number of pending requests before submit() rejects
+        """
+        self.paraphraser = paraphraser
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.queue_depth = queue_depth
+
+        self._queue: "queue.Queue[Optional[_PendingRequest]]" = queue.Queue(maxsize=queue_depth)
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "batches": 0,
+            "generate_calls": 0,
+            "total_wait_time": 0.0,
+        }
+        self._worker: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> "InferenceScheduler":
+        """Start the background worker thread"""
+        if self._running:
+            return self
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name="indot5-inference-scheduler", daemon=True)
+        self._worker.start()
+        logger.info(f"✅ Inference scheduler started (max_wait={self.max_wait_ms}ms, "
+                    f"max_batch_size={self.max_batch_size}, max_batch_tokens={self.max_batch_tokens})")
+        return self
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the worker thread after the queued requests are processed"""
+        if not self._running:
+            return
+        self._queue.put(None)
+        self._running = False
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+
+    def submit(self, text: str, rng: Optional[random.Random] = None, exclusive: bool = False,
+               cancel_token: Optional[CancellationToken] = None, deadline: Optional[float] = None,
+               **generate_kwargs) -> Future:
+        """
+        Submit a text for candidate generation
+
+        Args:
+            text: Input text
+            rng: Per-request random.Random used for this text's sampling
+            exclusive: Run in its own generate() call (reproducible seeded requests)
+            cancel_token: Cancelled requests are dropped from their batch (or stop it if all are)
+            deadline: time.time() limit; generate() stops once every request of the batch is past its deadline
+            **generate_kwargs: Keyword arguments for `_generate_candidates` (must be hashable)
+
+        Returns:
+            Future resolving to the list of candidates for this text
+
+        Raises:
+            SchedulerQueueFullError: If `queue_depth` requests are already pending
+        """
+        if not self._running:
+            self.start()
+
+        request = _PendingRequest(text=text, generate_kwargs=generate_kwargs, future=Future(),
+                                  rng=rng, exclusive=exclusive, cancel_token=cancel_token,
+                                  deadline=deadline)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise SchedulerQueueFullError(f"Inference queue is full ({self.queue_depth} pending requests)")
+
+        with self._lock:
+            self._stats["submitted"] += 1
+        return request.future
+
+    def generate(self, text: str, timeout: Optional[float] = None, rng: Optional[random.Random] = None,
+                 exclusive: bool = False, cancel_token: Optional[CancellationToken] = None,
+                 deadline: Optional[float] = None, **generate_kwargs) -> List[str]:
+        """
+        Submit a text and block until its candidates are ready
+
+        A request abandoned by its caller (timeout or cancellation) is skipped
+        by the worker if it is still queued; if it already runs, its result is discarded.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the candidates are not ready within timeout seconds
+            OperationCancelled: If cancel_token is cancelled while waiting
+        """
+        future = self.submit(text, rng=rng, exclusive=exclusive, cancel_token=cancel_token,
+                             deadline=deadline, **generate_kwargs)
+        wait_until = time.time() + timeout if timeout is not None else None
+        try:
+            if cancel_token is None:
+                return future.result(timeout=timeout)
+
+            while True:
+                try:
+                    return future.result(timeout=CANCEL_POLL_INTERVAL)
+                except FutureTimeoutError:
+                    if cancel_token.cancelled:
+                        future.cancel()
+                        cancel_token.raise_if_cancelled()
+                    if wait_until is not None and time.time() >= wait_until:
+                        raise
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def _collect_batch(self, first: _PendingRequest) -> Tuple[List[_PendingRequest], bool]:
+        """
+        Collect requests until max_wait_ms elapsed or max_batch_size reached
+
+        Returns:
+            Tuple of (batch, shutdown_requested)
+        """
+        batch = [first]
+        deadline = time.time() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Shutdown sentinel: everything submitted before it is in this batch
+                return batch, True
+            batch.append(request)
+
+        return batch, False
+
+    def _count_tokens(self, text: str) -> int:
+        """Count prompt tokens for length bucketing"""
+        try:
+            return len(self.paraphraser.tokenizer(text, truncation=True, max_length=512)["input_ids"])
+        except Exception:
+            return len(text.split()) * 2
+
+    def _rows_per_text(self, request: _PendingRequest) -> int:
+        """Beam rows generate() decodes per text: the request's strategies x num_beams"""
+        profile = request.generate_kwargs.get("profile")
+        strategies = request.generate_kwargs.get("strategies")
+        if strategies is None:
+            strategies = (
+                self.paraphraser._profile_strategies(profile) if profile is not None
+                else self.paraphraser.NEURAL_STRATEGIES
+            )
+        num_beams = request.generate_kwargs.get("num_beams") or (profile.num_beams if profile is not None else 1)
+        return len(strategies) * num_beams
+
+    def _bucket(self, requests: List[_PendingRequest]) -> List[List[_PendingRequest]]:
+        """
+        Split requests into length-sorted buckets that respect max_batch_tokens
+
+        Every text expands into one prompt row per strategy and beam (see
+        _rows_per_text), padded to the longest prompt in its bucket.
+        """
+        # Requests of one group share their generate() settings
+        rows_per_text = self._rows_per_text(requests[0]) if requests else 0
+        measured = sorted(((self._count_tokens(r.text), r) for r in requests), key=lambda item: item[0])
+
+        buckets = []
+        current: List[_PendingRequest] = []
+        current_max = 0
+        for tokens, request in measured:
+            longest = max(current_max, tokens)
+            padded_tokens = longest * (len(current) + 1) * rows_per_text
+            if current and padded_tokens > self.max_batch_tokens:
+                buckets.append(current)
+                current, longest = [], tokens
+            current.append(request)
+            current_max = longest
+        if current:
+            buckets.append(current)
+        return buckets
+
+    def _run_bucket(self, bucket: List[_PendingRequest]):
+        """Run one padded generate() call for a bucket and resolve its futures"""
+        # Requests cancelled while queued are dropped before any model work
+        active = []
+        for request in bucket:
+            if request.cancel_token is not None and request.cancel_token.cancelled:
+                request.future.cancel()
+            if request.future.set_running_or_notify_cancel():
+                active.append(request)
+        if len(active) < len(bucket):
+            with self._lock:
+                self._stats["cancelled"] += len(bucket) - len(active)
+        if not active:
+            return
+        bucket = active
+
+        texts = [request.text for request in bucket]
+        rngs = [request.rng or random.Random() for request in bucket]
+        try:
+            candidates = self.paraphraser._generate_candidates(
+                texts, rngs=rngs, cancel_tokens=[request.cancel_token for request in bucket],
+                deadlines=[request.deadline for request in bucket], **bucket[0].generate_kwargs
+            )
+        except OperationCancelled as e:
+            # Every request of the bucket was cancelled during generate()
+            for request in bucket:
+                request.future.set_exception(e)
+            with self._lock:
+                self._stats["cancelled"] += len(bucket)
+            return
+        except Exception as e:
+            logger.error(f"❌ Batched generation failed for {len(bucket)} requests: {e}")
+            for request in bucket:
+                request.future.set_exception(e)
+            with self._lock:
+                self._stats["failed"] += len(bucket)
+            return
+
+        for request, text_candidates in zip(bucket, candidates):
+            request.future.set_result(text_candidates)
+        with self._lock:
+            self._stats["completed"] += len(bucket)
+            self._stats["generate_calls"] += 1
+
+    def _run(self):
+        """Worker loop: runs until the shutdown sentinel is dequeued"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch, shutdown_requested = self._collect_batch(first)
+            started = time.time()
+            with self._lock:
+                self._stats["batches"] += 1
+                self._stats["total_wait_time"] += sum(started - r.enqueued_at for r in batch)
+
+            # Group by generation settings, then bucket by length
+            groups: Dict[Tuple, List[_PendingRequest]] = {}
+            for request in batch:
+                groups.setdefault(request.group_key, []).append(request)
+
+            for group in groups.values():
+                for bucket in self._bucket(group):
+                    self._run_bucket(bucket)
+
+            if shutdown_requested:
+                break
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+        finished = stats["completed"] + stats["failed"] + stats["cancelled"]
+        stats["queue_size"] = self._queue.qsize()
+        stats["avg_batch_size"] = stats["completed"] / stats["generate_calls"] if stats["generate_calls"] else 0.0
+        total_wait_time = stats.pop("total_wait_time")
+        stats["avg_queue_wait_ms"] = total_wait_time / finished * 1000.0 if finished else 0.0
+        stats["max_wait_ms"] = self.max_wait_ms
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_batch_tokens"] = self.max_batch_tokens
+        stats["queue_depth"] = self.queue_depth
+        stats["running"] = self._running
+        return stats
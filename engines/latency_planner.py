@@ -0,0 +1,161 @@
+"""
+Latency planner for IndoT5 Hybrid Paraphraser
+Learns generate() latency per generation profile from recorded timings and
+picks the most thorough profile whose predicted p95 fits a latency budget
+
+Cost model per profile:
+    latency ~ intercept + slope * work,   work = prompt tokens x prompt rows x beams
+fitted by least squares over a window of recent generate() calls. Profiles with too
+few timings of their own use the fit pooled over every profile (work units are
+comparable across profiles), then a fixed prior. The p95 is the prediction
+scaled by the 95th percentile of observed/predicted ratios.
+Time spent outside generate() (rule stages, scoring, queueing) is tracked
+per method as a running mean and added to the estimate.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Prior used until a profile has min_samples timings (seconds, CPU IndoT5-base)
+PRIOR_INTERCEPT = 0.1
+PRIOR_SECONDS_PER_WORK = 0.005
+PRIOR_P95_RATIO = 1.5
+PRIOR_OVERHEAD = 0.05
+
+# Weight of a new sample in the running overhead mean
+OVERHEAD_SMOOTHING = 0.1
+
+
+class LatencyPlanner:
+    """
+    Online latency model of the generation profiles
+    """
+
+    def __init__(self, window: int = 1000, min_samples: int = 5):
+        """
+        Initialize the planner
+
+        Args:
+            window: Timings kept per profile (oldest are dropped)
+            min_samples: Timings needed before a profile's own fit replaces the prior
+        """
+        self.window = window
+        self.min_samples = min_samples
+
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}  # profile -> (work, seconds)
+        self._overhead: Dict[str, float] = {}  # method -> running mean seconds
+        self._fits: Dict[Optional[str], Tuple[float, float, float]] = {}  # profile (None = pooled) -> fit
+
+    def record(self, profile: str, work: float, seconds: float) -> None:
+        """Record one generate() call"""
+        with self._lock:
+            self._samples.setdefault(profile, deque(maxlen=self.window)).append((float(work), float(seconds)))
+            self._fits.pop(profile, None)
+            self._fits.pop(None, None)
+
+    def record_overhead(self, method: str, seconds: float) -> None:
+        """Record the time a request spent outside generate()"""
+        with self._lock:
+            current = self._overhead.get(method)
+            self._overhead[method] = seconds if current is None else (
+                current + OVERHEAD_SMOOTHING * (seconds - current)
+            )
+
+    def latencies(self, profile: str) -> List[float]:
+        """Recorded generate() latencies of a profile (seconds, oldest first)"""
+        with self._lock:
+            return [seconds for _, seconds in self._samples.get(profile, ())]
+
+    def _fit(self, profile: Optional[str]) -> Tuple[float, float, float]:
+        """(intercept, slope, p95 ratio) of a profile, None = pooled (lock must be held)"""
+        if profile in self._fits:
+            return self._fits[profile]
+
+        if profile is None:
+            samples = [sample for values in self._samples.values() for sample in values]
+        else:
+            samples = self._samples.get(profile)
+        if not samples or len(samples) < self.min_samples:
+            if profile is None:
+                return PRIOR_INTERCEPT, PRIOR_SECONDS_PER_WORK, PRIOR_P95_RATIO
+            return self._fit(None)
+
+        work = np.array([w for w, _ in samples])
+        seconds = np.array([s for _, s in samples])
+        if np.var(work) < 1e-9:
+            # Every timing had the same size: scale proportionally
+            intercept, slope = 0.0, float(seconds.mean() / max(work.mean(), 1e-9))
+        else:
+            slope, intercept = (float(v) for v in np.polyfit(work, seconds, 1))
+            if slope < 0 or intercept < 0:
+                intercept, slope = 0.0, float(seconds.sum() / max(work.sum(), 1e-9))
+
+        predicted = np.maximum(intercept + slope * work, 1e-6)
+        ratio = max(float(np.percentile(seconds / predicted, 95)), 1.0)
+        self._fits[profile] = (intercept, slope, ratio)
+        return self._fits[profile]
+
+    def predict(self, profile: str, work: float, method: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Predict the latency of one request
+
+        Args:
+            profile: Generation profile name
+            work: Prompt tokens x prompt rows x beams (0 = no generation)
+            method: Paraphrasing method, adds its measured non-generation time
+
+        Returns:
+            Dict with generate_ms, total_ms, total_p95_ms and the profile's sample count
+        """
+        with self._lock:
+            intercept, slope, ratio = self._fit(profile)
+            samples = len(self._samples.get(profile, ()))
+            overhead = self._overhead.get(method, PRIOR_OVERHEAD) if method else 0.0
+
+        generate = intercept + slope * work if work else 0.0
+        return {
+            "generate_ms": round(generate * 1000.0, 2),
+            "total_ms": round((generate + overhead) * 1000.0, 2),
+            "total_p95_ms": round((generate * ratio + overhead) * 1000.0, 2),
+            "samples": samples
+        }
+
+    @staticmethod
+    def choose(estimates: Dict[str, Dict[str, Any]], work: Dict[str, float],
+               budget_ms: float) -> Tuple[str, bool]:
+        """
+        Pick a profile for a latency budget
+
+        Args:
+            estimates: Profile name -> predict() output
+            work: Profile name -> work of the request (more work = more thorough plan)
+            budget_ms: Latency budget in milliseconds
+
+        Returns:
+            Tuple of (profile name, whether its p95 fits the budget); the
+            cheapest profile is returned when none fits
+        """
+        fitting = [name for name, estimate in estimates.items() if estimate["total_p95_ms"] <= budget_ms]
+        if fitting:
+            return max(fitting, key=lambda name: (work[name], -estimates[name]["total_p95_ms"])), True
+        return min(estimates, key=lambda name: estimates[name]["total_p95_ms"]), False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Fitted coefficients per profile and the overhead per method"""
+        with self._lock:
+            profiles = {}
+            for profile in self._samples:
+                intercept, slope, ratio = self._fit(profile)
+                profiles[profile] = {
+                    "samples": len(self._samples[profile]),
+                    "intercept_ms": round(intercept * 1000.0, 3),
+                    "ms_per_work": round(slope * 1000.0, 5),
+                    "p95_ratio": round(ratio, 3),
+                    "fitted": len(self._samples[profile]) >= self.min_samples
+                }
+            overhead = {method: round(seconds * 1000.0, 2) for method, seconds in self._overhead.items()}
+        return {"profiles": profiles, "overhead_ms": overhead, "min_samples": self.min_samples}
@@ -0,0 +1,104 @@
+"""
+ONNX Runtime backend for IndoT5 Hybrid Paraphraser
+Exports IndoT5 to ONNX (encoder + decoder + decoder-with-past) and loads it for CPU inference
+
+The exported decoder-with-past keeps the decoder KV cache between steps, so
+generate() only feeds the newest token at each step. The loaded model is a
+drop-in replacement for AutoModelForSeq2SeqLM: it exposes the same generate()
+API, so the rest of the hybrid pipeline is unchanged.
+
+Requires the optional dependency: pip install "optimum[onnxruntime]"
+"""
+
+import logging
+import os
+import re
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Files written by the export; decoder_with_past is what enables the KV cache
+ONNX_REQUIRED_FILES = (
+    "encoder_model.onnx",
+    "decoder_model.onnx",
+    "decoder_with_past_model.onnx",
+)
+
+DEFAULT_ONNX_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "onnx")
+
+
+def default_onnx_dir(model_name: str) -> str:
+    """Get the default export directory for a model name"""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+    return os.path.join(DEFAULT_ONNX_ROOT, safe_name)
+
+
+def onnx_export_exists(onnx_dir: Optional[str]) -> bool:
+    """Check whether a complete ONNX export (with decoder KV cache) is present"""
+    if not onnx_dir or not os.path.isdir(onnx_dir):
+        return False
+    return all(os.path.exists(os.path.join(onnx_dir, filename)) for filename in ONNX_REQUIRED_FILES)
+
+
+def is_onnx_available() -> bool:
+    """Check whether optimum + onnxruntime are installed"""
+    try:
+        import onnxruntime  # noqa: F401
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def export_onnx_model(model_name: str, output_dir: Optional[str] = None) -> str:
+    """
+    Export an IndoT5 model to ONNX with a cached decoder (decoder-with-past)
+
+    Args:
+        model_name: HuggingFace model name or local path
+        output_dir: Export directory (default: models/onnx/<model_name>)
+
+    Returns:
+        Path of the export directory
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    output_dir = output_dir or default_onnx_dir(model_name)
+    logger.info(f"🔄 Exporting {model_name} to ONNX: {output_dir}")
+
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True)
+    os.makedirs(output_dir, exist_ok=True)
+    model.save_pretrained(output_dir)
+
+    logger.info("✅ ONNX export finished")
+    return output_dir
+
+
+def load_onnx_model(onnx_dir: str, num_threads: Optional[int] = None):
+    """
+    Load an exported IndoT5 model with ONNX Runtime on CPU
+
+    Args:
+        onnx_dir: Export directory created by export_onnx_model
+        num_threads: Intra-op threads for ONNX Runtime (None = runtime default)
+
+    Returns:
+        ORTModelForSeq2SeqLM instance with use_cache=True
+    """
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads:
+        session_options.intra_op_num_threads = num_threads
+
+    return ORTModelForSeq2SeqLM.from_pretrained(
+        onnx_dir,
+        use_cache=True,
+        provider="CPUExecutionProvider",
+        session_options=session_options,
+        encoder_file_name="encoder_model.onnx",
+        decoder_file_name="decoder_model.onnx",
+        decoder_with_past_file_name="decoder_with_past_model.onnx",
+    )
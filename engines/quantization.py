@@ -0,0 +1,105 @@
+"""
+Dynamic int8 quantization for IndoT5 Hybrid Paraphraser
+Quantizes the T5 linear layers for CPU inference and caches the result on disk
+
+Only the quantized state_dict is cached. Later startups quantize a model
+skeleton built from the config (no pretrained weights are read) and load the
+packed weights with torch.load(weights_only=True), which never unpickles code,
+so they skip both the fp32 checkpoint load and its conversion. Cache files are
+keyed by model name and torch/transformers versions because the packed
+parameter layout may change across library versions.
+"""
+
+import io
+import logging
+import os
+import re
+from typing import Callable, Optional
+
+import torch
+import transformers
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_QUANTIZATION = ("int8",)
+
+DEFAULT_QUANTIZED_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "quantized"
+)
+
+
+def quantized_cache_path(model_name: str, quantization: str = "int8", cache_dir: Optional[str] = None) -> str:
+    """Get the cache file for a quantized model"""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+    versions = f"torch{torch.__version__}-transformers{transformers.__version__}"
+    safe_versions = re.sub(r"[^A-Za-z0-9_.-]+", "_", versions)
+    return os.path.join(cache_dir or DEFAULT_QUANTIZED_CACHE_DIR, f"{safe_name}-{quantization}-{safe_versions}.pt")
+
+
+def quantize_dynamic_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Apply dynamic int8 quantization to all nn.Linear layers
+
+    Weights are stored as int8; activations are quantized on the fly, which
+    suits the memory-bound decoder loop on CPU.
+    """
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_or_quantize(model_name: str,
+                     load_fp32: Callable[[], torch.nn.Module],
+                     quantization: str = "int8",
+                     cache_dir: Optional[str] = None,
+                     build_skeleton: Optional[Callable[[], torch.nn.Module]] = None) -> torch.nn.Module:
+    """
+    Load cached quantized weights, or quantize the fp32 model and cache them
+
+    Args:
+        model_name: Model name (part of the cache key)
+        load_fp32: Callable returning the pretrained fp32 model (only called on
+            cache miss or when the cache cannot be loaded)
+        quantization: Quantization mode ("int8")
+        cache_dir: Cache directory (default: models/quantized)
+        build_skeleton: Callable returning the fp32 architecture without
+            pretrained weights, which receives the cached weights (default: load_fp32)
+
+    Returns:
+        Quantized model in eval mode
+    """
+    if quantization not in SUPPORTED_QUANTIZATION:
+        raise ValueError(f"Unsupported quantization: {quantization}")
+
+    cache_path = quantized_cache_path(model_name, quantization, cache_dir)
+
+    if os.path.exists(cache_path):
+        try:
+            logger.info(f"🔄 Loading cached {quantization} weights: {cache_path}")
+            state_dict = torch.load(cache_path, map_location="cpu", weights_only=True)
+            model = quantize_dynamic_int8((build_skeleton or load_fp32)())
+            model.load_state_dict(state_dict)
+            model.eval()
+            return model
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to load quantized cache ({e}), re-quantizing")
+
+    logger.info(f"🔄 Quantizing {model_name} to {quantization} (first startup only)")
+    model = quantize_dynamic_int8(load_fp32())
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        torch.save(model.state_dict(), tmp_path)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"✅ Cached quantized model: {cache_path}")
+    except Exception as e:
+        logger.warning(f"⚠️  Could not cache quantized model: {e}")
+
+    return model
+
+
+def model_size_mb(model: torch.nn.Module) -> float:
+    """Serialized state_dict size in MB (includes packed int8 weights)"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
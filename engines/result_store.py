@@ -0,0 +1,168 @@
+"""
+Process-shared result cache for IndoT5 Hybrid Paraphraser
+Stores paraphrase results in sqlite so every web worker reuses them
+
+Results are stored as JSON rows keyed by the engine's result cache key
+(model version, method, generation parameters, seed and text hash). Rows also
+keep the hash of their input text, so every result for a text can be deleted
+at once. Entries expire after a TTL and the least recently used rows are
+evicted once the table grows past max_entries.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "results", "results.sqlite"
+)
+
+# Eviction runs every N writes instead of on every insert
+EVICTION_INTERVAL = 64
+
+
+class ResultStore:
+    """
+    sqlite-backed LRU/TTL store of JSON-serialized results
+    """
+
+    def __init__(self, path: str = DEFAULT_RESULT_STORE_PATH,
+                 max_entries: int = 100000,
+                 ttl: Optional[float] = None):
+        """
+        Open (or create) a result store
+
+        Args:
+            path: sqlite database file (shared by all worker processes)
+            max_entries: Maximum stored results (least recently used are evicted)
+            ttl: Seconds before a stored result expires (None = never)
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, text_hash TEXT, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_text_hash ON results (text_hash)")
+
+        self._writes_since_eviction = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored result
+
+        Returns:
+            Result fields as a dict, or None on miss / expiry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl is not None and now - row[1] >= self.ttl):
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any], text_hash: Optional[str] = None) -> None:
+        """
+        Store (or replace) a result
+
+        Args:
+            key: Result cache key
+            value: Result fields
+            text_hash: Hash of the input text (see delete_text)
+        """
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False, default=float)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created_at, last_access, text_hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, now, text_hash)
+            )
+            self.writes += 1
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= EVICTION_INTERVAL:
+                self._evict(now)
+
+    def delete(self, key: str) -> None:
+        """Remove a stored result"""
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def delete_text(self, text_hash: str) -> int:
+        """Remove every stored result for a text and return how many were removed"""
+        with self._lock:
+            return self._conn.execute("DELETE FROM results WHERE text_hash = ?", (text_hash,)).rowcount
+
+    def evict(self) -> int:
+        """Remove expired rows and trim to max_entries (least recently used first)"""
+        with self._lock:
+            return self._evict(time.time())
+
+    def _evict(self, now: float) -> int:
+        """Evict rows (lock must be held)"""
+        self._writes_since_eviction = 0
+        removed = 0
+        if self.ttl is not None:
+            removed += self._conn.execute("DELETE FROM results WHERE created_at <= ?", (now - self.ttl,)).rowcount
+
+        excess = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+        if excess > 0:
+            removed += self._conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access LIMIT ?)",
+                (excess,)
+            ).rowcount
+
+        self.evictions += removed
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        """Get store size and hit-rate statistics (this process only)"""
+        rows = len(self)
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "rows": rows,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None
+        }
+
+    def close(self) -> None:
+        """Close the sqlite connection"""
+        with self._lock:
+            self._conn.close()
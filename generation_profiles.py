@@ -0,0 +1,41 @@
+"""
+Generation profiles for IndoT5 Hybrid Paraphraser
+Latency / quality cost points shared by the engine and config; dependency-free
+so that importing config does not load the model stack
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+# Generation profiles: latency / quality cost points selectable per request
+DEFAULT_GENERATION_PROFILES = {
+    # Greedy decoding, one strategy, one candidate
+    "fast": {"num_beams": 1, "num_return_sequences": 1, "strategies": ["parafrasekan"], "sampling": False},
+    # Sampled beam search over both strategies
+    "balanced": {"num_beams": 4, "num_return_sequences": 2, "strategies": None, "sampling": True,
+                 "top_k": 60, "top_p": 0.93},
+    # Wider beams and more candidates to rank
+    "best": {"num_beams": 8, "num_return_sequences": 4, "strategies": None, "sampling": True,
+             "top_k": 60, "top_p": 0.93}
+}
+
+DEFAULT_GENERATION_PROFILE = "balanced"
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """Neural generation budget of a named profile"""
+    name: str
+    num_beams: int = 4
+    num_return_sequences: int = 2
+    strategies: Optional[Tuple[str, ...]] = None  # Prompt prefixes to run (None = all)
+    sampling: bool = True  # False = deterministic beam search / greedy decoding
+    top_k: int = 60
+    top_p: float = 0.93
+    
+    @classmethod
+    def from_dict(cls, name: str, spec: Dict[str, Any]) -> "GenerationProfile":
+        """Build a profile from its config entry"""
+        spec = dict(spec)
+        if spec.get("strategies") is not None:
+            spec["strategies"] = tuple(spec["strategies"])
+        return cls(name=name, **spec)
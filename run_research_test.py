@@ -95,20 +95,16 @@ def print_result_summary(result: IndoT5HybridResult, index: int = None):
 # FUNGSI PENGUJIAN
 # ============================================================================
 
-def run_single_experiment(paraphraser: IndoT5HybridParaphraser, 
-                          text: str, 
-                          method: str = "hybrid") -> Dict[str, Any]:
+def build_experiment_data(paraphraser: IndoT5HybridParaphraser,
+                          text: str,
+                          method: str,
+                          result: IndoT5HybridResult,
+                          total_time: float) -> Dict[str, Any]:
     """
-    Menjalankan eksperimen tunggal
+    Menyusun data eksperimen dari hasil parafrase
     """
-    experiment_id = f"EXP-{get_timestamp()}"
-    
-    start_time = time.time()
-    result = paraphraser.paraphrase(text, method=method)
-    total_time = time.time() - start_time
-    
-    experiment_data = {
-        "experiment_id": experiment_id,
+    return {
+        "experiment_id": f"EXP-{get_timestamp()}",
         "timestamp": datetime.now().isoformat(),
         "configuration": {
             "model_name": paraphraser.model_name,
@@ -124,8 +120,18 @@ def run_single_experiment(paraphraser: IndoT5HybridParaphraser,
         "result": result_to_dict(result),
         "total_processing_time": round(total_time, 4)
     }
+
+def run_single_experiment(paraphraser: IndoT5HybridParaphraser, 
+                          text: str, 
+                          method: str = "hybrid") -> Dict[str, Any]:
+    """
+    Menjalankan eksperimen tunggal
+    """
+    start_time = time.time()
+    result = paraphraser.paraphrase(text, method=method)
+    total_time = time.time() - start_time
     
-    return experiment_data
+    return build_experiment_data(paraphraser, text, method, result, total_time)
 
 def run_batch_experiments(paraphraser: IndoT5HybridParaphraser,
                           sentences: List[str],
@@ -145,10 +151,11 @@ def run_batch_experiments(paraphraser: IndoT5HybridParaphraser,
     total_time = 0
     success_count = 0
     
-    for i, sentence in enumerate(sentences, 1):
-        print(f"\n🔄 Processing [{i}/{len(sentences)}]...")
-        
-        experiment = run_single_experiment(paraphraser, sentence, method)
+    # Semua kalimat diproses sekaligus dengan jalur batch (vectorized)
+    batch_results = paraphraser.batch_paraphrase(sentences, method=method)
+    
+    for i, (sentence, result) in enumerate(zip(sentences, batch_results), 1):
+        experiment = build_experiment_data(paraphraser, sentence, method, result, result.processing_time)
         results.append(experiment)
         
         if experiment["result"]["success"]:
@@ -158,26 +165,7 @@ def run_batch_experiments(paraphraser: IndoT5HybridParaphraser,
         
         total_time += experiment["total_processing_time"]
         
-        print_result_summary(
-            IndoT5HybridResult(
-                original_text=sentence,
-                paraphrased_text=experiment["result"]["paraphrased_text"],
-                method_used=method,
-                transformations_applied=experiment["result"]["transformations_applied"],
-                quality_score=experiment["result"]["quality_score"],
-                confidence_score=experiment["result"]["confidence_score"],
-                neural_confidence=experiment["result"]["neural_confidence"],
-                semantic_similarity=experiment["result"]["semantic_similarity"],
-                lexical_diversity=experiment["result"]["lexical_diversity"],
-                syntactic_complexity=experiment["result"]["syntactic_complexity"],
-                fluency_score=experiment["result"]["fluency_score"],
-                processing_time=experiment["result"]["processing_time"],
-                word_changes=experiment["result"]["word_changes"],
-                syntax_changes=experiment["result"]["syntax_changes"],
-                success=experiment["result"]["success"]
-            ),
-            index=i
-        )
+        print_result_summary(result, index=i)
     
     # Hitung statistik
     avg_quality = total_quality / success_count if success_count > 0 else 0
@@ -0,0 +1,93 @@
+"""
+Test Suite for the in-memory caches
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.cache import LRUCache, text_key
+
+def test_lru_eviction_order():
+    """Test that the least recently used entry is evicted first"""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+def test_hit_rate_statistics():
+    """Test hit/miss counters"""
+    cache = LRUCache(maxsize=4)
+    assert cache.get_stats()["hit_rate"] is None
+
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+def test_byte_budget_eviction():
+    """Test that entries are evicted to stay within the byte budget"""
+    cache = LRUCache(maxsize=100, max_bytes=100, sizeof=lambda value: value)
+    cache.put("a", 40)
+    cache.put("b", 40)
+    cache.put("c", 40)
+
+    assert "a" not in cache
+    assert cache.bytes == 80
+
+    # Values larger than the whole budget are not cached
+    cache.put("huge", 500)
+    assert "huge" not in cache
+
+def test_ttl_expiration(monkeypatch):
+    """Test that expired entries count as misses"""
+    now = [1000.0]
+    monkeypatch.setattr("engines.cache.time.monotonic", lambda: now[0])
+
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+def test_pop_tag_removes_tagged_entries():
+    """Test that pop_tag removes every entry of a tag and nothing else"""
+    cache = LRUCache(maxsize=2, sizeof=lambda value: value)
+    cache.put("a", 1, tag="teks")
+    cache.put("b", 2, tag="teks")
+    cache.put("c", 3, tag="lain")
+
+    # "a" was evicted, so only "b" is left under its tag
+    assert cache.pop_tag("teks") == 1
+    assert "b" not in cache and "c" in cache
+    assert cache.bytes == 3
+    assert cache.pop_tag("teks") == 0
+
+def test_text_key_uses_full_text():
+    """Test that long texts sharing a prefix get different keys"""
+    prefix = "kata " * 50
+    assert text_key(prefix + "awal") != text_key(prefix + "akhir")
+    assert text_key("a", "bc") != text_key("ab", "c")
+
+def test_invalid_maxsize():
+    """Test that an empty cache size is rejected"""
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,63 @@
+"""
+Test Suite for the persistent embedding store
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.cache import text_key
+from engines.embedding_store import EmbeddingStore, default_embedding_dir
+
+def normalized(rows, dim=8, seed=0):
+    """Random L2-normalized vectors"""
+    vectors = np.random.default_rng(seed).standard_normal((rows, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def test_vectors_survive_reopen(tmp_path):
+    """Test that a new store instance (warm restart) reads stored vectors"""
+    keys = [text_key(f"kalimat {i}") for i in range(3)]
+    vectors = normalized(3)
+
+    store = EmbeddingStore(str(tmp_path), "all-MiniLM-L6-v2")
+    assert store.put_many(keys, vectors) == 3
+    store.close()
+
+    reopened = EmbeddingStore(str(tmp_path), "all-MiniLM-L6-v2")
+    found = reopened.get_many(keys + [text_key("belum ada")])
+
+    assert set(found) == set(keys)
+    for key, vector in zip(keys, vectors):
+        assert np.allclose(found[key], vector, atol=1e-3)
+    assert reopened.get_stats()["misses"] == 1
+
+def test_duplicate_keys_written_once(tmp_path):
+    """Test that keys already in the store are not appended again"""
+    store = EmbeddingStore(str(tmp_path), "all-MiniLM-L6-v2")
+    keys = [text_key("a"), text_key("b")]
+
+    store.put_many(keys, normalized(2))
+    written = store.put_many(keys + [text_key("c"), text_key("c")], normalized(4, seed=1))
+
+    assert written == 1
+    assert len(store) == 3
+
+def test_store_rejects_other_model(tmp_path):
+    """Test that vectors of another semantic model are never mixed in"""
+    EmbeddingStore(str(tmp_path), "all-MiniLM-L6-v2").close()
+
+    with pytest.raises(ValueError):
+        EmbeddingStore(str(tmp_path), "paraphrase-multilingual-MiniLM-L12-v2")
+
+def test_default_embedding_dir_is_per_model():
+    """Test that each semantic model gets its own directory"""
+    assert os.path.basename(default_embedding_dir("sentence-transformers/all-MiniLM-L6-v2")) == \
+        "sentence-transformers__all-MiniLM-L6-v2"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+"""
+Test Suite for FileParser sentence handling
+Tests for sentence splitting and the sentence map of overlapping chunks
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_parser import FileParser
+
+SENTENCES = [
+    "Penelitian ini menggunakan metode kualitatif.",
+    "Data dikumpulkan melalui wawancara mendalam.",
+    "Analisis dilakukan secara tematik.",
+    "Hasilnya menunjukkan pola yang konsisten.",
+    "Penelitian lanjutan masih diperlukan."
+]
+
+@pytest.fixture
+def parser():
+    return FileParser()
+
+def test_split_keeps_short_sentences(parser):
+    """Test that min_words=1 keeps every sentence"""
+    text = "Ya. Penelitian ini menggunakan metode kualitatif."
+
+    assert parser.split_into_sentences(text) == ["Penelitian ini menggunakan metode kualitatif."]
+    assert parser.split_into_sentences(text, min_words=1) == ["Ya.", "Penelitian ini menggunakan metode kualitatif."]
+
+def test_map_chunk_sentences_removes_overlap(parser):
+    """Test that overlapping sentences get one ID and appear once in the document"""
+    chunks = [
+        " ".join(SENTENCES[0:3]),
+        " ".join(SENTENCES[1:4]),  # Two sentences of overlap
+        " ".join(SENTENCES[3:5])   # One sentence of overlap
+    ]
+
+    sentences, chunk_ids, document_ids = parser.map_chunk_sentences(chunks)
+
+    assert sentences == SENTENCES
+    assert chunk_ids == [[0, 1, 2], [1, 2, 3], [3, 4]]
+    assert document_ids == [0, 1, 2, 3, 4]
+
+def test_map_chunk_sentences_real_chunks(parser):
+    """Test that the document rebuilt from chunk_text chunks matches the source sentences"""
+    source = [f"Kalimat nomor {i} membahas hasil penelitian lapangan." for i in range(12)]
+    chunks = parser.chunk_text(" ".join(source), max_chars=200)
+
+    sentences, chunk_ids, document_ids = parser.map_chunk_sentences(chunks)
+
+    assert len(chunks) > 1
+    assert [sentences[i] for i in document_ids] == source
+    assert sum(len(ids) for ids in chunk_ids) > len(document_ids)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,187 @@
+"""
+Test Suite for IndoT5 generation utilities
+Tests for custom logits processors used in batched generation
+"""
+
+import pytest
+import sys
+import os
+import torch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.cancellation import CancellationToken
+from engines.generation_utils import (
+    CancellationStoppingCriteria, ColonRunSuppressor, LeadingSequenceBlocker, PerRowLengthLogitsProcessor,
+    PerRowTemperatureWarper, SeededGumbelSampler, build_prompt_rows
+)
+
+class TestPerRowTemperatureWarper:
+    """Test cases for PerRowTemperatureWarper"""
+
+    def test_each_row_uses_own_temperature(self):
+        """Test that every row is scaled by its own temperature"""
+        warper = PerRowTemperatureWarper([1.0, 2.0])
+        scores = torch.ones(2, 4)
+
+        warped = warper(None, scores)
+
+        assert torch.allclose(warped[0], torch.ones(4))
+        assert torch.allclose(warped[1], torch.full((4,), 0.5))
+
+    def test_temperatures_repeat_per_beam(self):
+        """Test that temperatures are expanded over flattened beams"""
+        warper = PerRowTemperatureWarper([1.0, 4.0])
+        scores = torch.ones(6, 3)  # 2 inputs x 3 beams
+
+        warped = warper(None, scores)
+
+        assert torch.allclose(warped[:3], torch.ones(3, 3))
+        assert torch.allclose(warped[3:], torch.full((3, 3), 0.25))
+
+    def test_invalid_temperatures(self):
+        """Test that empty or non-positive temperatures are rejected"""
+        with pytest.raises(ValueError):
+            PerRowTemperatureWarper([])
+        with pytest.raises(ValueError):
+            PerRowTemperatureWarper([1.0, 0.0])
+
+def test_length_limits_apply_per_row():
+    """Test that EOS is banned and forced against each row's own limits"""
+    processor = PerRowLengthLogitsProcessor([2, 5], [8, 4], eos_token_id=1)
+    input_ids = torch.zeros(4, 3, dtype=torch.long)  # 2 rows x 2 beams, cur_len 3
+    scores = torch.zeros(4, 5)
+
+    processed = processor(input_ids, scores)
+
+    # Row 0: past min_length, below max_length - 1 -> untouched
+    assert torch.equal(processed[:2], torch.zeros(2, 5))
+    # Row 1: at max_length - 1 -> only EOS remains
+    assert torch.all(processed[2:, 1] == 0.0)
+    assert torch.all(processed[2:, [0, 2, 3, 4]] == -float("inf"))
+
+    scores = torch.zeros(2, 5)
+    processed = PerRowLengthLogitsProcessor([4, 2], [10, 10], eos_token_id=1)(input_ids[:2], scores)
+    assert processed[0, 1] == -float("inf")
+    assert processed[1, 1] == 0.0
+
+class TestSeededGumbelSampler:
+    """Test cases for SeededGumbelSampler"""
+
+    def build_sampler(self, seeds):
+        return SeededGumbelSampler([torch.Generator().manual_seed(seed) for seed in seeds])
+
+    def test_same_seed_same_noise(self):
+        """Test that equal generator seeds perturb scores identically"""
+        input_ids = torch.zeros(4, 1, dtype=torch.long)  # 2 inputs x 2 beams
+        scores = torch.log_softmax(torch.randn(4, 8), dim=-1)
+
+        first = self.build_sampler([1, 2])(input_ids, scores.clone())
+        second = self.build_sampler([1, 2])(input_ids, scores.clone())
+        other = self.build_sampler([3, 2])(input_ids, scores.clone())
+
+        assert torch.equal(first, second)
+        assert not torch.equal(first[:2], other[:2])
+        assert torch.equal(first[2:], other[2:])
+
+    def test_previous_noise_is_removed(self):
+        """Test that the noise of the chosen token is subtracted at the next step"""
+        scores = torch.zeros(1, 4)
+        start = torch.zeros(1, 1, dtype=torch.long)
+
+        sampler = self.build_sampler([5])
+        first = sampler(start, scores.clone())
+        token = int(first[0].argmax())
+        continued = sampler(torch.tensor([[0, token]]), scores.clone())
+
+        # Same draws, but the prefix was never produced, so nothing is subtracted
+        reference = self.build_sampler([5])
+        reference(start, scores.clone())
+        uncorrected = reference(torch.tensor([[1, token]]), scores.clone())
+
+        assert torch.allclose(continued, uncorrected - first[0, token])
+
+    def test_reordered_beams_use_parent_noise(self):
+        """Test that beams reordered by beam search subtract their parent's noise"""
+        scores = torch.zeros(2, 6)  # 1 input x 2 beams
+        sampler = self.build_sampler([9])
+        first = sampler(torch.tensor([[0, 1], [0, 2]]), scores.clone())
+
+        # Both new beams descend from the old second beam
+        continued = sampler(torch.tensor([[0, 2, 4], [0, 2, 5]]), scores.clone())
+
+        reference = self.build_sampler([9])
+        reference(torch.tensor([[0, 1], [0, 2]]), scores.clone())
+        uncorrected = reference(torch.tensor([[7, 7, 4], [7, 7, 5]]), scores.clone())
+
+        assert torch.allclose(continued[0], uncorrected[0] - first[1, 4])
+        assert torch.allclose(continued[1], uncorrected[1] - first[1, 5])
+
+def test_leading_sequence_blocked_only_at_start():
+    """Test that a prompt echo is blocked at the start of the output only"""
+    blocker = LeadingSequenceBlocker([[5, 6]])
+
+    scores = blocker(torch.tensor([[0], [0]]), torch.zeros(2, 8))
+    assert torch.isinf(scores[:, 5]).all()
+
+    # Second token of the echo is blocked after its first token only
+    scores = blocker(torch.tensor([[0, 5], [0, 7]]), torch.zeros(2, 8))
+    assert torch.isinf(scores[0, 6]) and not torch.isinf(scores[1, 6])
+
+    # Later in the sentence the words are allowed
+    scores = blocker(torch.tensor([[0, 7, 5]]), torch.zeros(1, 8))
+    assert not torch.isinf(scores).any()
+
+class TestColonRunSuppressor:
+    """Test cases for ColonRunSuppressor"""
+
+    def test_colon_free_prefix(self):
+        """Test that colons are blocked at the start of the output"""
+        suppressor = ColonRunSuppressor([3], colon_free_prefix=2)
+
+        scores = suppressor(torch.tensor([[0, 7]]), torch.zeros(1, 8))
+        assert torch.isinf(scores[0, 3]) and not torch.isinf(scores[0, 4])
+
+        scores = suppressor(torch.tensor([[0, 7, 7]]), torch.zeros(1, 8))
+        assert not torch.isinf(scores).any()
+
+    def test_colon_runs_and_blocked_tokens(self):
+        """Test that colons are blocked after colons, after blocked tokens and past max_colons"""
+        suppressor = ColonRunSuppressor([3], blocked_after_ids=[4], colon_free_prefix=0, max_colons=2)
+        input_ids = torch.tensor([
+            [0, 7, 7, 7, 3],  # colon run
+            [0, 7, 7, 7, 4],  # "...kan:"
+            [0, 3, 7, 3, 7],  # max_colons reached
+            [0, 3, 7, 7, 7],  # one colon so far
+        ])
+
+        scores = suppressor(input_ids, torch.zeros(4, 8))
+
+        assert torch.isinf(scores[:3, 3]).all()
+        assert not torch.isinf(scores[3]).any()
+        assert not torch.isinf(scores[:, 4]).any()
+
+def test_cancellation_stops_only_when_all_cancelled():
+    """Test that a shared batch keeps running while any request still waits"""
+    first, second = CancellationToken(), CancellationToken()
+    criteria = CancellationStoppingCriteria([first, second, None])
+    input_ids = torch.zeros(3, 2, dtype=torch.long)
+
+    first.cancel()
+    second.cancel()
+    assert not criteria(input_ids, None).any()  # None = request without a token
+
+    criteria = CancellationStoppingCriteria([first, second])
+    assert criteria(input_ids, None).all()
+
+def test_build_prompt_rows():
+    """Test expansion of texts x strategies into prompt rows"""
+    rows = build_prompt_rows(["satu", "dua"], [("parafrasekan", 1.3), ("tulis ulang", 1.1)])
+
+    assert len(rows) == 4
+    assert rows[0] == (0, "parafrasekan", 1.3, "parafrasekan: satu")
+    assert rows[3] == (1, "tulis ulang", 1.1, "tulis ulang: dua")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
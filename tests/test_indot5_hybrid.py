@@ -6,12 +6,17 @@ Tests for neural + rule-based hybrid paraphrasing
 import pytest
 import sys
 import os
+import random
+import threading
 import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from engines.cancellation import CancellationToken, OperationCancelled
 from engines.indot5_hybrid_engine import IndoT5HybridParaphraser, IndoT5HybridResult, create_indot5_hybrid_paraphraser
+from engines.result_store import ResultStore
 
 class TestIndoT5HybridParaphraser:
     """Test cases for IndoT5 Hybrid Paraphraser"""
@@ -137,7 +142,76 @@ class TestIndoT5HybridParaphraser:
         # Check that variations are different
         texts = [v.paraphrased_text for v in variations]
         assert len(set(texts)) >= 2  # At least 2 different variations
-    
+
+    def test_pooled_variations_single_generate(self, paraphraser):
+        """Test that pooled variations run the neural model only once"""
+        text = "Penelitian ini menggunakan metode kualitatif untuk menganalisis data."
+        calls = []
+        original_generate = paraphraser.model.generate
+
+        def counting_generate(*args, **kwargs):
+            calls.append(kwargs.get("num_return_sequences"))
+            return original_generate(*args, **kwargs)
+
+        paraphraser.model.generate = counting_generate
+        try:
+            variations = paraphraser.generate_variations(text, num_variations=5, min_quality_threshold=0)
+        finally:
+            paraphraser.model.generate = original_generate
+
+        assert len(calls) == 1
+        assert 0 < len(variations) <= 5
+        assert len({v.paraphrased_text for v in variations}) == len(variations)
+        assert all(v.original_text == text for v in variations)
+
+    def test_encoder_cache_reuse(self, paraphraser):
+        """Test that repeated inputs only run the decoder"""
+        text = "Sistem informasi akademik memudahkan mahasiswa mengakses nilai."
+        encoder = paraphraser.model.get_encoder()
+        calls = []
+        original_forward = encoder.forward
+
+        def counting_forward(*args, **kwargs):
+            calls.append(1)
+            return original_forward(*args, **kwargs)
+
+        encoder.forward = counting_forward
+        try:
+            paraphraser._generate_candidates([text])
+            paraphraser._generate_candidates([text])
+        finally:
+            encoder.forward = original_forward
+
+        stats = paraphraser.get_model_info()["caches"]["encoder"]
+        assert len(calls) == 1
+        assert stats["hits"] >= len(paraphraser.NEURAL_STRATEGIES)
+
+    def test_single_paraphrase_embedding_passes(self, paraphraser):
+        """Test that one request embeds the original once and candidates in one batch"""
+        text = "Perpustakaan digital menyediakan akses jurnal ilmiah secara daring."
+        encoded = []
+        original_encode = paraphraser.semantic_model.encode
+
+        def counting_encode(sentences, *args, **kwargs):
+            encoded.append(list(sentences))
+            return original_encode(sentences, *args, **kwargs)
+
+        paraphraser.semantic_model.encode = counting_encode
+        try:
+            paraphraser.clear_cache()
+            second_passes = paraphraser.get_early_exit_stats()["second_pass_run"]
+            result = paraphraser.paraphrase(text, method="hybrid")
+            second_passes = paraphraser.get_early_exit_stats()["second_pass_run"] - second_passes
+        finally:
+            paraphraser.semantic_model.encode = original_encode
+
+        assert result.success == True
+        # Original + candidates, final text; a second strategy pass adds one batch of its new candidates
+        assert len(encoded) <= 2 + second_passes
+        assert sum(batch.count(text) for batch in encoded) == 1
+        embedded = [sentence for batch in encoded for sentence in batch]
+        assert len(embedded) == len(set(embedded))
+
     def test_batch_processing(self, paraphraser):
         """Test batch processing"""
         texts = [
@@ -155,7 +229,112 @@ class TestIndoT5HybridParaphraser:
         for original, result in zip(texts, results):
             assert result.original_text == original
             assert result.paraphrased_text != original
-    
+
+    def test_batch_processing_order(self, paraphraser):
+        """Test that batch results keep input order, duplicates and empty inputs"""
+        texts = [
+            "Penelitian ini menggunakan metode kualitatif untuk menganalisis data.",
+            "",
+            "Teknologi blockchain sangat penting untuk masa depan.",
+            "Penelitian ini menggunakan metode kualitatif untuk menganalisis data."
+        ]
+
+        results = paraphraser.batch_paraphrase(texts, batch_size=2)
+
+        assert [r.original_text for r in results] == texts
+        assert results[1].success == False
+        assert results[0].paraphrased_text == results[3].paraphrased_text
+
+    def test_paraphrase_sentences(self, paraphraser):
+        """Test that sentence-parallel mode uses one generate() call and keeps sentence order"""
+        sentences = [
+            "Mahasiswa mengerjakan tugas akhir di perpustakaan kampus.",
+            "Dosen pembimbing memberikan masukan setiap minggu.",
+            "Hasil penelitian dipresentasikan pada seminar nasional."
+        ]
+        text = " ".join(sentences)
+        calls = []
+        original_generate = paraphraser.model.generate
+
+        def counting_generate(*args, **kwargs):
+            calls.append(kwargs["input_ids"].shape[0])
+            return original_generate(*args, **kwargs)
+
+        paraphraser.model.generate = counting_generate
+        try:
+            result = paraphraser.paraphrase_sentences(text, options=paraphraser.default_options(use_cache=False))
+        finally:
+            paraphraser.model.generate = original_generate
+
+        assert result.success == True
+        assert result.original_text == text
+        assert len(calls) == 1
+        assert [r.original_text for r in result.sentence_results] == sentences
+        assert result.paraphrased_text == " ".join(r.paraphrased_text for r in result.sentence_results)
+        assert min(r.quality_score for r in result.sentence_results) <= result.quality_score \
+            <= max(r.quality_score for r in result.sentence_results)
+
+        # A single sentence is paraphrased directly
+        assert paraphraser.paraphrase_sentences(sentences[0]).sentence_results == []
+
+    def test_paraphrase_chunks_dedups_overlap(self, paraphraser):
+        """Test that overlapping chunk sentences are paraphrased once and the document is rebuilt in order"""
+        sentences = [
+            "Mahasiswa mengerjakan tugas akhir di perpustakaan kampus.",
+            "Dosen pembimbing memberikan masukan setiap minggu.",
+            "Hasil penelitian dipresentasikan pada seminar nasional.",
+            "Laporan akhir diserahkan kepada program studi."
+        ]
+        chunks = [" ".join(sentences[0:3]), " ".join(sentences[1:4])]
+        batches = []
+        original_batch = paraphraser.batch_paraphrase
+
+        def recording_batch(texts, *args, **kwargs):
+            batches.append(list(texts))
+            return original_batch(texts, *args, **kwargs)
+
+        paraphraser.batch_paraphrase = recording_batch
+        try:
+            document, chunk_results = paraphraser.paraphrase_chunks(chunks)
+        finally:
+            paraphraser.batch_paraphrase = original_batch
+
+        assert batches == [sentences]
+        assert document.original_text == " ".join(sentences)
+        assert [r.original_text for r in document.sentence_results] == sentences
+        assert len(chunk_results) == 2
+        assert chunk_results[1].sentence_results[0] is chunk_results[0].sentence_results[1]
+
+    def test_iter_paraphrase_chunks_keeps_order(self, paraphraser):
+        """Test that streamed chunks come out in order even when later chunks finish first"""
+        sentences = [
+            "Mahasiswa mengerjakan tugas akhir di perpustakaan kampus.",
+            "Dosen pembimbing memberikan masukan setiap minggu.",
+            "Hasil penelitian dipresentasikan pada seminar nasional.",
+            "Laporan akhir diserahkan kepada program studi."
+        ]
+        chunks = [" ".join(sentences[0:2]), " ".join(sentences[1:3]), sentences[3]]
+        batches = []
+        original_batch = paraphraser.batch_paraphrase
+
+        def slow_first_chunk(texts, *args, **kwargs):
+            if sentences[0] in texts:
+                time.sleep(0.3)
+            batches.append(list(texts))
+            return original_batch(texts, *args, **kwargs)
+
+        paraphraser.batch_paraphrase = slow_first_chunk
+        try:
+            events = list(paraphraser.iter_paraphrase_chunks(chunks, max_workers=3))
+        finally:
+            paraphraser.batch_paraphrase = original_batch
+
+        assert [index for index, _ in events] == [0, 1, 2, None]
+        assert batches[-1] == sentences[0:2]  # The first chunk finished last
+        assert sorted(sentence for batch in batches for sentence in batch) == sorted(sentences)
+        assert [r.original_text for r in events[1][1].sentence_results] == sentences[1:3]
+        assert events[-1][1].original_text == " ".join(sentences)
+
     def test_detailed_analysis(self, paraphraser):
         """Test detailed analysis functionality"""
         text = "Implementasi sistem informasi dapat meningkatkan efisiensi."
@@ -254,6 +433,408 @@ class TestIndoT5HybridParaphraser:
         # Second call should be faster (cached)
         assert time2 <= time1
     
+    def test_cache_statistics(self, paraphraser):
+        """Test that result cache hits and clearing are reported"""
+        text = "Statistik cache dilaporkan melalui informasi model."
+        paraphraser.clear_cache(text)
+        before = paraphraser.get_model_info()["caches"]["results"]
+
+        paraphraser.paraphrase(text)
+        paraphraser.paraphrase(text)
+        after = paraphraser.get_model_info()["caches"]["results"]
+
+        assert after["hits"] == before["hits"] + 1
+        assert after["misses"] == before["misses"] + 1
+        assert after["bytes"] > 0
+        assert after["size"] <= after["maxsize"]
+
+        paraphraser.clear_cache(text)
+        assert paraphraser.get_model_info()["caches"]["results"]["size"] == after["size"] - 1
+
+    def test_clear_cache_removes_every_variant_of_a_text(self, paraphraser, monkeypatch, tmp_path):
+        """Test that clear_cache(text) also drops seeded and non-default-option results"""
+        text = "Semua varian hasil untuk teks ini dihapus."
+        other = "Teks lain tetap tersimpan di cache."
+        monkeypatch.setattr(paraphraser, "_result_store", ResultStore(str(tmp_path / "results.sqlite")))
+        options = paraphraser.default_options(synonym_rate=0.2, max_length=40)
+        
+        keys = [
+            paraphraser._result_cache_key("rule-based", text, seed=7, options=options),
+            paraphraser._result_cache_key("rule-based", text),
+        ]
+        paraphraser.paraphrase(text, method="rule-based", seed=7, options=options)
+        paraphraser.paraphrase(text, method="rule-based")
+        paraphraser.paraphrase(other, method="rule-based")
+        assert all(key in paraphraser._result_cache for key in keys)
+        
+        paraphraser.clear_cache(text)
+        
+        assert not any(key in paraphraser._result_cache for key in keys)
+        assert all(paraphraser._result_store.get(key) is None for key in keys)
+        other_key = paraphraser._result_cache_key("rule-based", other)
+        assert other_key in paraphraser._result_cache
+        assert paraphraser._result_store.get(other_key) is not None
+    
+    def test_result_cache_key_includes_parameters(self, paraphraser):
+        """Test that generation parameters and seed are part of the result cache key"""
+        text = "Kunci cache memuat parameter generasi."
+        key = paraphraser._result_cache_key("hybrid", text)
+
+        assert key == paraphraser._result_cache_key("hybrid", text)
+        assert key != paraphraser._result_cache_key("neural", text)
+        assert key != paraphraser._result_cache_key("hybrid", text, seed=42)
+
+        original_rate = paraphraser.synonym_rate
+        paraphraser.synonym_rate = original_rate + 0.1
+        try:
+            assert key != paraphraser._result_cache_key("hybrid", text)
+        finally:
+            paraphraser.synonym_rate = original_rate
+
+    def test_seeded_paraphrase_reproducible(self, paraphraser):
+        """Test that the same seed reproduces the same paraphrase"""
+        text = "Pemerintah sedang mengembangkan program pendidikan untuk masyarakat."
+        options = paraphraser.default_options(use_cache=False)
+        
+        for method in ["hybrid", "neural", "rule-based"]:
+            result1 = paraphraser.paraphrase(text, method=method, seed=123, options=options)
+            result2 = paraphraser.paraphrase(text, method=method, seed=123, options=options)
+            
+            assert result1.paraphrased_text == result2.paraphrased_text
+            assert result1.transformations_applied == result2.transformations_applied
+        
+        variations1 = paraphraser.generate_variations(text, num_variations=2, seed=7, options=options)
+        variations2 = paraphraser.generate_variations(text, num_variations=2, seed=7, options=options)
+        assert [r.paraphrased_text for r in variations1] == [r.paraphrased_text for r in variations2]
+    
+    def test_variations_do_not_mutate_engine(self, paraphraser):
+        """Test that per-variation settings never leak into concurrent requests"""
+        text = "Variasi berjalan bersamaan dengan permintaan lain."
+        defaults = paraphraser.default_options()
+        observed = []
+        
+        worker = threading.Thread(
+            target=paraphraser.generate_variations,
+            kwargs={"text": text, "num_variations": 3, "use_candidate_pool": False}
+        )
+        worker.start()
+        while worker.is_alive():
+            observed.append(paraphraser.default_options())
+            time.sleep(0.001)
+        worker.join()
+        
+        assert all(options == defaults for options in observed)
+        
+        # Options are immutable
+        with pytest.raises(AttributeError):
+            defaults.synonym_rate = 1.0
+    
+    def test_variation_levels_raise_syntactic_budget(self, paraphraser):
+        """Test that every variation level allows more transforms, from each stage's own default"""
+        defaults = paraphraser.default_options()
+        levels = [paraphraser._variation_options(defaults, level) for level in range(4)]
+        
+        hybrid_budgets = [paraphraser._transform_budget(options, 2) for options in levels]
+        fallback_budgets = [paraphraser._transform_budget(options, 4) for options in levels]
+        
+        assert hybrid_budgets[0] == 2
+        assert hybrid_budgets == sorted(hybrid_budgets) and len(set(hybrid_budgets)) > 1
+        assert fallback_budgets[0] == 4
+        assert max(hybrid_budgets + fallback_budgets) <= max(paraphraser.max_transformations, 4)
+    
+    def test_cancelled_requests_abort(self, paraphraser):
+        """Test that a cancelled token aborts paraphrase, variations and chunks"""
+        token = CancellationToken()
+        token.cancel("client disconnected")
+        options = paraphraser.default_options(cancel_token=token)
+        before = paraphraser.get_cancellation_stats()["requests"]
+        
+        with pytest.raises(OperationCancelled):
+            paraphraser.paraphrase("Permintaan ini dibatalkan oleh klien.", options=options)
+        with pytest.raises(OperationCancelled):
+            paraphraser.generate_variations("Variasi ini dibatalkan.", num_variations=3, options=options)
+        with pytest.raises(OperationCancelled):
+            list(paraphraser.iter_paraphrase_chunks(["Potongan pertama dibatalkan. Potongan kedua juga."],
+                                                    options=options))
+        
+        # One token = one cancelled request; the token is not part of the options' identity
+        assert paraphraser.get_cancellation_stats()["requests"] == before + 1
+        assert options == paraphraser.default_options()
+        assert "cancellations" in paraphraser.get_model_info()
+    
+    def test_deadline_falls_back_to_rules(self, paraphraser):
+        """Test that an exhausted time budget still returns a flagged, uncached result"""
+        text = "Batas waktu permintaan ini sangat singkat sekali."
+        options = paraphraser.default_options(max_processing_time=1e-6)
+        
+        result = paraphraser.paraphrase(text, method="hybrid", options=options)
+        
+        assert result.success
+        assert result.deadline_exceeded
+        assert paraphraser._get_cached_result(paraphraser._result_cache_key("hybrid", text, options=options)) is None
+        
+        # Without a budget the flag stays off
+        assert not paraphraser.paraphrase(text, method="rule-based").deadline_exceeded
+    
+    def test_document_deadline_falls_back_to_rules(self, paraphraser, monkeypatch):
+        """Test that the sentence and chunk paths share one request deadline"""
+        text = "Kalimat pertama cukup panjang. Kalimat kedua juga panjang. Kalimat ketiga menutup teks."
+        options = paraphraser.default_options(max_processing_time=1e-6, use_cache=False)
+        
+        def fail_generate(*args, **kwargs):
+            raise AssertionError("generate() must not run past the deadline")
+        
+        monkeypatch.setattr(paraphraser, "_generate_candidates", fail_generate)
+        
+        result = paraphraser.paraphrase_sentences(text, method="hybrid", options=options)
+        assert result.success
+        assert result.deadline_exceeded
+        assert all(r.deadline_exceeded for r in result.sentence_results)
+        
+        # Latency budgets bound document requests as well
+        chunks = ["Bagian pertama dokumen ini. Bagian kedua dokumen ini.", "Bagian ketiga dokumen ini."]
+        budget = paraphraser.default_options(latency_budget=1e-6, profile="fast", use_cache=False)
+        document, chunk_results = paraphraser.paraphrase_chunks(chunks, method="hybrid", options=budget)
+        assert document.deadline_exceeded
+        assert all(r.success for r in chunk_results)
+        
+        streamed = list(paraphraser.iter_paraphrase_chunks(chunks, method="neural", options=options))
+        assert all(r.deadline_exceeded for _, r in streamed)
+    
+    def test_generation_profiles(self, paraphraser):
+        """Test per-request generation profiles and their latency stats"""
+        text = "Profil cepat dipakai untuk pengguna interaktif."
+        before = paraphraser.get_profile_stats()["fast"]["generate_calls"]
+        
+        result = paraphraser.paraphrase(text, method="neural", options=paraphraser.default_options(profile="fast"))
+        
+        assert result.success
+        assert result.generation_profile == "fast"
+        stats = paraphraser.get_profile_stats()
+        assert set(stats) >= {"fast", "balanced", "best"}
+        assert stats["fast"]["generate_calls"] == before + 1
+        assert stats["fast"]["p50_ms"] is not None
+        
+        # Profiles and generation fields are part of the cache key
+        keys = {
+            paraphraser._result_cache_key("neural", text, options=paraphraser.default_options(**fields))
+            for fields in [{"profile": "fast"}, {"profile": "best"}, {"temperature": 0.7}, {"max_length": 64}]
+        }
+        assert len(keys) == 4
+        
+        unknown = paraphraser.paraphrase(text, options=paraphraser.default_options(profile="turbo"))
+        assert not unknown.success
+    
+    def test_early_exit_skips_second_strategy(self, paraphraser, monkeypatch):
+        """Test that later prompt strategies only run when the first misses the thresholds"""
+        text = "Strategi pertama sering sudah cukup baik."
+        candidate = "Pendekatan awal biasanya telah memadai untuk kebanyakan teks."
+        calls = []
+        
+        def fake_request_candidates(text, strategies, **kwargs):
+            calls.append(strategies)
+            return [candidate]
+        
+        monkeypatch.setattr(paraphraser, "_request_candidates", fake_request_candidates)
+        monkeypatch.setattr(paraphraser, "early_exit_similarity", -1.0)
+        monkeypatch.setattr(paraphraser, "early_exit_max_overlap", 1.0)
+        strategies = paraphraser._profile_strategies(paraphraser.generation_profiles["balanced"])
+        before = paraphraser.get_early_exit_stats()
+        
+        result, _ = paraphraser._neural_paraphrase(text, profile=paraphraser.generation_profiles["balanced"])
+        
+        stats = paraphraser.get_early_exit_stats()
+        assert result == candidate
+        assert calls == [strategies[:1]]
+        assert stats["second_pass_skipped"] == before["second_pass_skipped"] + 1
+        
+        monkeypatch.setattr(paraphraser, "early_exit_similarity", 2.0)
+        calls.clear()
+        paraphraser._neural_paraphrase(text, profile=paraphraser.generation_profiles["balanced"])
+        
+        after = paraphraser.get_early_exit_stats()
+        assert calls == [strategies[:1], strategies[1:]]
+        assert after["second_pass_run"] == stats["second_pass_run"] + 1
+        assert after["requests"] == before["requests"] + 2
+    
+    def test_adaptive_stages_skip_for_diverse_neural_result(self, paraphraser):
+        """Test that rule stages are skipped (and recorded) for an already diverse neural result"""
+        text = "Penelitian ini menggunakan metode kualitatif."
+        neural_result = "Studi tersebut memakai pendekatan berbasis wawancara mendalam."
+        
+        plan = paraphraser._plan_hybrid_stages(text, neural_result, 0.9)
+        assert plan["synonym_substitution"] and plan["syntactic_transformation"] and plan["word_reordering"]
+        
+        final_text, transformations, word_changes, syntax_changes = paraphraser._apply_rule_stages(
+            text, "hybrid", neural_result, 0.9, rng=random.Random(0)
+        )
+        assert final_text == neural_result
+        assert any(t.startswith("skipped:synonym_substitution") for t in transformations)
+        assert word_changes == len(set(text.lower().split()) - set(neural_result.lower().split()))
+        assert syntax_changes == 1
+        
+        # A close copy of the original still runs every stage
+        assert not any(paraphraser._plan_hybrid_stages(text, text + " ini", 0.9).values())
+    
+    def test_stage_counts_unchanged_without_adaptive_stages(self, paraphraser, monkeypatch):
+        """Test that with adaptive_stages off the counts, which drive the quality score, are the stages' own"""
+        monkeypatch.setattr(paraphraser, "adaptive_stages", False)
+        text = "Penelitian ini menggunakan metode kualitatif."
+        neural_result = "Studi tersebut memakai pendekatan berbasis wawancara mendalam."
+        
+        _, _, word_changes, syntax_changes = paraphraser._apply_rule_stages(
+            text, "hybrid", neural_result, 0.9, rng=random.Random(3)
+        )
+        
+        # The same stages run by hand with the same random sequence
+        rng = random.Random(3)
+        options = paraphraser.default_options()
+        expected_text, _, expected_words = paraphraser._apply_synonym_substitution(
+            neural_result, rate=min(0.65, options.synonym_rate * 0.9), rng=rng
+        )
+        expected_text, _, expected_syntax = paraphraser._apply_syntactic_transformation(
+            expected_text, max_transforms=2, rng=rng
+        )
+        assert (word_changes, syntax_changes) == (expected_words, expected_syntax)
+    
+    def test_constrained_decoding_counts_rejections(self, paraphraser):
+        """Test that rejected candidates are counted per decoding mode"""
+        assert paraphraser._colon_ids
+        before = paraphraser.get_candidate_stats()["constrained"]["generated"]
+        
+        paraphraser._generate_candidates(["Penelitian ini menggunakan metode kualitatif."])
+        
+        stats = paraphraser.get_candidate_stats()
+        assert stats["constrained_decoding"]
+        assert stats["constrained"]["generated"] > before
+        assert 0.0 <= stats["constrained"]["rejection_rate"] <= 1.0
+    
+    def test_streamed_generation_reports_partials(self, paraphraser):
+        """Test that on_partial receives the growing neural output before the result"""
+        partials = []
+        options = paraphraser.default_options(profile="balanced", use_cache=False, on_partial=partials.append)
+        
+        result = paraphraser.paraphrase("Keluaran model dikirim sedikit demi sedikit.", method="neural", options=options)
+        
+        assert result.success
+        assert result.generation_profile == "balanced+streamed"
+        assert partials
+        assert all(len(a) <= len(b) for a, b in zip(partials, partials[1:]))
+        
+        # Streamers only support a single prompt row and beam
+        with pytest.raises(ValueError):
+            paraphraser._generate_candidates(["Teks contoh."], streamer=object())
+    
+    def test_generate_calls_are_bounded_across_paths(self, paraphraser, monkeypatch):
+        """Test that batch and direct generation never run more generate() calls than the bound"""
+        generate = paraphraser.model.generate
+        state = {"running": 0, "peak": 0}
+        state_lock = threading.Lock()
+        
+        def counting_generate(*args, **kwargs):
+            with state_lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            try:
+                return generate(*args, **kwargs)
+            finally:
+                with state_lock:
+                    state["running"] -= 1
+        
+        monkeypatch.setattr(paraphraser.model, "generate", counting_generate)
+        options = paraphraser.default_options(profile="fast", use_cache=False)
+        workers = [
+            threading.Thread(target=paraphraser.batch_paraphrase, args=(["Data dianalisis secara kualitatif."],),
+                             kwargs={"method": "neural", "options": options}),
+            threading.Thread(target=paraphraser.batch_paraphrase, args=(["Hasil penelitian menunjukkan perubahan."],),
+                             kwargs={"method": "neural", "options": options}),
+            threading.Thread(target=paraphraser._generate_candidates, args=(["Model dijalankan bersamaan."],)),
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        assert paraphraser.max_concurrent_generate == 1
+        assert state["peak"] == 1
+    
+    def test_scheduler_timeout_uses_rule_based_fallback(self, paraphraser, monkeypatch):
+        """Test that the scheduler's concurrent.futures timeout falls back to the rule stages"""
+        class TimingOutScheduler:
+            def generate(self, text, **kwargs):
+                raise FutureTimeoutError()
+        
+        text = "Penelitian ini menggunakan metode kualitatif."
+        monkeypatch.setattr(paraphraser, "scheduler", TimingOutScheduler())
+        monkeypatch.setattr(paraphraser, "_neural_fallback", lambda text, rng: ("fallback", 0.4))
+        
+        assert paraphraser._neural_paraphrase(text, deadline=time.time() + 1.0) == ("fallback", 0.4)
+    
+    def test_streamed_candidate_below_thresholds_runs_remaining_strategies(self, paraphraser, monkeypatch):
+        """Test that streaming keeps the early-exit thresholds of the profile's plan"""
+        text = "Keluaran model dikirim sedikit demi sedikit."
+        strategies = paraphraser._profile_strategies(paraphraser.generation_profiles["balanced"])
+        streamed, requested = [], []
+        
+        def fake_stream(text, strategy, on_partial, **kwargs):
+            streamed.append(strategy)
+            on_partial("Keluaran model")
+            return ["Keluaran model dikirim secara bertahap."]
+        
+        def fake_request(text, strategies, **kwargs):
+            requested.append(tuple(strategies))
+            return ["Hasil model dikirim secara bertahap."]
+        
+        monkeypatch.setattr(paraphraser, "_stream_candidates", fake_stream)
+        monkeypatch.setattr(paraphraser, "_request_candidates", fake_request)
+        monkeypatch.setattr(paraphraser, "early_exit_similarity", 2.0)
+        
+        paraphraser._neural_paraphrase(text, profile=paraphraser.generation_profiles["balanced"], on_partial=lambda _: None)
+        assert streamed == [strategies[0]]
+        assert requested == [tuple(strategies[1:])]
+        
+        # A candidate that passes the thresholds skips the remaining strategies
+        streamed.clear()
+        requested.clear()
+        monkeypatch.setattr(paraphraser, "early_exit_similarity", -1.0)
+        monkeypatch.setattr(paraphraser, "early_exit_max_overlap", 1.0)
+        paraphraser._neural_paraphrase(text, profile=paraphraser.generation_profiles["balanced"], on_partial=lambda _: None)
+        assert streamed == [strategies[0]]
+        assert requested == []
+        
+        # With early exit disabled the remaining strategies always run and nothing is recorded
+        streamed.clear()
+        monkeypatch.setattr(paraphraser, "enable_early_exit", False)
+        before = paraphraser.get_early_exit_stats()
+        paraphraser._neural_paraphrase(text, profile=paraphraser.generation_profiles["balanced"], on_partial=lambda _: None)
+        assert streamed == [strategies[0]]
+        assert requested == [tuple(strategies[1:])]
+        assert paraphraser.get_early_exit_stats() == before
+    
+    def test_latency_budget_planning(self, paraphraser):
+        """Test latency estimates and budget-based profile choice"""
+        text = "Anggaran waktu menentukan profil yang dipakai."
+        
+        estimate = paraphraser.estimate_latency(text, latency_budget=0.001)
+        assert set(estimate["profiles"]) == set(paraphraser.generation_profiles)
+        assert estimate["profiles"]["best"]["work"] > estimate["profiles"]["fast"]["work"]
+        cheapest = min(estimate["profiles"], key=lambda name: estimate["profiles"][name]["total_p95_ms"])
+        assert estimate["recommended_profile"] == cheapest
+        assert estimate["within_budget"] is False
+        
+        generous = paraphraser.estimate_latency(text, latency_budget=1000.0)
+        assert generous["recommended_profile"] == "best"
+        assert generous["within_budget"] is True
+        
+        rules = paraphraser.estimate_latency(text, method="rule-based")
+        assert all(profile["generate_ms"] == 0.0 for profile in rules["profiles"].values())
+        
+        result = paraphraser.paraphrase(
+            text, method="neural", options=paraphraser.default_options(latency_budget=0.001, use_cache=False)
+        )
+        assert result.generation_profile == cheapest
+    
     def test_different_texts(self, paraphraser):
         """Test with different types of texts"""
         texts = [
@@ -0,0 +1,174 @@
+"""
+Test Suite for the IndoT5 inference scheduler
+Tests for cross-request micro-batching
+"""
+
+import pytest
+import sys
+import os
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.cancellation import CancellationToken, OperationCancelled
+from engines.indot5_hybrid_engine import DEFAULT_GENERATION_PROFILES, GenerationProfile
+from engines.inference_scheduler import InferenceScheduler, SchedulerQueueFullError, _PendingRequest
+
+class RecordingParaphraser:
+    """Minimal paraphraser exposing what the scheduler needs"""
+
+    NEURAL_STRATEGIES = [("parafrasekan", 1.3), ("tulis ulang", 1.1)]
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def tokenizer(self, text, **kwargs):
+        return {"input_ids": text.split()}
+
+    def _profile_strategies(self, profile):
+        return [
+            strategy for strategy in self.NEURAL_STRATEGIES
+            if profile.strategies is None or strategy[0] in profile.strategies
+        ]
+
+    def _generate_candidates(self, texts, **kwargs):
+        with self.lock:
+            self.calls.append((list(texts), kwargs))
+        return [[f"hasil {text}"] for text in texts]
+
+class TestInferenceScheduler:
+    """Test cases for InferenceScheduler"""
+
+    def test_concurrent_requests_share_generate_call(self):
+        """Test that concurrent submissions are batched together"""
+        paraphraser = RecordingParaphraser()
+        scheduler = InferenceScheduler(paraphraser, max_wait_ms=200, max_batch_size=4)
+        scheduler.start()
+
+        futures = [scheduler.submit(f"kalimat nomor {i}") for i in range(4)]
+        results = [f.result(timeout=5) for f in futures]
+        scheduler.shutdown()
+
+        assert results == [[f"hasil kalimat nomor {i}"] for i in range(4)]
+        assert len(paraphraser.calls) == 1
+        assert scheduler.get_stats()["completed"] == 4
+
+    def test_different_settings_are_not_mixed(self):
+        """Test that requests with different generation settings run separately"""
+        paraphraser = RecordingParaphraser()
+        scheduler = InferenceScheduler(paraphraser, max_wait_ms=200, max_batch_size=4)
+        scheduler.start()
+
+        first = scheduler.submit("satu dua tiga", num_beams=4)
+        second = scheduler.submit("empat lima enam", num_beams=2)
+        first.result(timeout=5)
+        second.result(timeout=5)
+        scheduler.shutdown()
+
+        assert sorted(call[1]["num_beams"] for call in paraphraser.calls) == [2, 4]
+
+    def test_token_budget_splits_buckets(self):
+        """Test that max_batch_tokens splits a batch into length buckets"""
+        paraphraser = RecordingParaphraser()
+        scheduler = InferenceScheduler(paraphraser, max_batch_tokens=10)
+
+        requests = [scheduler.submit(text) for text in ["a b", "a b c d e", "a b c"]]
+        scheduler.shutdown()
+        for request in requests:
+            request.result(timeout=5)
+
+        for texts, _ in paraphraser.calls:
+            longest = max(len(text.split()) for text in texts)
+            assert len(texts) == 1 or longest * len(texts) * 2 <= 10
+
+    def test_token_budget_counts_profile_rows(self):
+        """Test that bucket sizes follow each request's strategies x beams"""
+        paraphraser = RecordingParaphraser()
+        scheduler = InferenceScheduler(paraphraser, max_batch_tokens=64)
+        texts = ["a b c d", "e f g h", "i j k l", "m n o p"]
+        best = GenerationProfile.from_dict("best", DEFAULT_GENERATION_PROFILES["best"])
+        fast = GenerationProfile.from_dict("fast", DEFAULT_GENERATION_PROFILES["fast"])
+
+        def pending(**kwargs):
+            return [_PendingRequest(text, kwargs, Future()) for text in texts]
+
+        # best: 2 strategies x 8 beams = 16 rows of 4 tokens per text
+        assert scheduler._rows_per_text(pending(profile=best)[0]) == 16
+        assert [len(bucket) for bucket in scheduler._bucket(pending(profile=best))] == [1, 1, 1, 1]
+
+        # fast: 1 strategy x 1 beam, so every text fits in one call
+        assert scheduler._rows_per_text(pending(profile=fast)[0]) == 1
+        assert [len(bucket) for bucket in scheduler._bucket(pending(profile=fast))] == [4]
+
+        # Strategy subsets from early exit and streaming shrink the rows
+        subset = pending(profile=best, strategies=tuple(paraphraser.NEURAL_STRATEGIES[:1]))
+        assert scheduler._rows_per_text(subset[0]) == 8
+        assert [len(bucket) for bucket in scheduler._bucket(subset)] == [2, 2]
+
+    def test_queue_depth_rejects(self):
+        """Test that a full queue rejects new submissions"""
+        paraphraser = RecordingParaphraser()
+        scheduler = InferenceScheduler(paraphraser, queue_depth=1)
+        scheduler._running = True  # Worker not started: queue never drains
+
+        scheduler.submit("satu dua tiga")
+        with pytest.raises(SchedulerQueueFullError):
+            scheduler.submit("empat lima enam")
+        assert scheduler.get_stats()["rejected"] == 1
+
+    def test_stats_without_finished_requests(self):
+        """Test that the wait-time accumulator never leaks into the stats"""
+        scheduler = InferenceScheduler(RecordingParaphraser())
+
+        stats = scheduler.get_stats()
+        assert "total_wait_time" not in stats
+        assert stats["avg_queue_wait_ms"] == 0.0
+
+    def test_cancelled_request_is_skipped(self):
+        """Test that a request cancelled while queued never reaches generate()"""
+        paraphraser = RecordingParaphraser()
+        scheduler = InferenceScheduler(paraphraser)
+        token = CancellationToken()
+
+        cancelled = scheduler.submit("dibatalkan oleh klien", cancel_token=token)
+        kept = scheduler.submit("tetap diproses")
+        token.cancel()
+        scheduler.start()
+        scheduler.shutdown()
+
+        assert kept.result(timeout=5) == ["hasil tetap diproses"]
+        assert cancelled.cancelled()
+        assert [texts for texts, _ in paraphraser.calls] == [["tetap diproses"]]
+        assert scheduler.get_stats()["cancelled"] == 1
+
+    def test_generate_raises_when_cancelled(self):
+        """Test that a waiting caller returns as soon as its token is cancelled"""
+        paraphraser = RecordingParaphraser()
+        scheduler = InferenceScheduler(paraphraser)
+        scheduler._running = True  # Worker not started: the request stays queued
+        token = CancellationToken()
+
+        threading.Timer(0.1, token.cancel).start()
+        with pytest.raises(OperationCancelled):
+            scheduler.generate("menunggu giliran", cancel_token=token)
+
+    def test_timed_out_request_is_dropped(self):
+        """Test that a request abandoned at its timeout is not generated afterwards"""
+        paraphraser = RecordingParaphraser()
+        scheduler = InferenceScheduler(paraphraser)
+        scheduler._running = True  # Worker not started: the request stays queued
+
+        with pytest.raises(FutureTimeoutError):
+            scheduler.generate("terlambat", timeout=0.05)
+
+        scheduler._running = False
+        scheduler.start()
+        scheduler.shutdown()
+        assert paraphraser.calls == []
+        assert scheduler.get_stats()["cancelled"] == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
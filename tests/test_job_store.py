@@ -0,0 +1,140 @@
+"""
+Test Suite for the persistent document job store
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.job_store import JOB_COMPLETED, JOB_QUEUED, JOB_RUNNING, JobStore
+
+def test_job_lifecycle(tmp_path):
+    """Test that chunk checkpoints and the document result are stored"""
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    job_id = store.create_job(["Bagian pertama.", "Bagian kedua."], "hybrid", {"profile": "fast"})
+
+    job = store.get_job(job_id)
+    assert job["status"] == JOB_QUEUED
+    assert job["options"] == {"profile": "fast"}
+    assert job["total_chunks"] == 2 and job["completed_chunks"] == 0
+
+    assert store.claim_job(job_id)
+    assert not store.claim_job(job_id)  # Already running
+
+    store.save_chunk_result(job_id, 1, {"paraphrased": "Bagian 2.", "quality_score": 60.0})
+    chunks = store.get_chunks(job_id)
+    assert [chunk["result"] for chunk in chunks] == [None, {"paraphrased": "Bagian 2.", "quality_score": 60.0}]
+    assert store.get_job(job_id)["completed_chunks"] == 1
+
+    store.set_status(job_id, JOB_COMPLETED, result={"combined_text": "Selesai."})
+    job = store.get_job(job_id)
+    assert job["status"] == JOB_COMPLETED
+    assert job["result"] == {"combined_text": "Selesai."}
+    assert store.unfinished_jobs() == []
+
+    assert store.delete_job(job_id)
+    assert store.get_job(job_id) is None
+    assert store.get_chunks(job_id) == []
+
+def test_interrupted_job_resumes_from_checkpoint(tmp_path, monkeypatch):
+    """Test that a restarted worker requeues jobs with an expired lease and keeps their checkpoints"""
+    now = [1000.0]
+    monkeypatch.setattr("utils.job_store.time.time", lambda: now[0])
+    path = str(tmp_path / "jobs.sqlite")
+    store = JobStore(path, lease_timeout=60)
+    job_id = store.create_job(["Satu.", "Dua.", "Tiga."], "neural")
+    store.claim_job(job_id)
+    store.save_chunk_result(job_id, 0, {"paraphrased": "Satu!"})
+    store.close()
+
+    # Worker restart after the lease expired
+    now[0] += 61
+    restarted = JobStore(path, lease_timeout=60)
+    assert restarted.get_job(job_id)["status"] == JOB_RUNNING
+    assert restarted.requeue_interrupted() == [job_id]
+    assert restarted.unfinished_jobs() == [job_id]
+    assert restarted.claim_job(job_id)
+
+    pending = [chunk["chunk_index"] for chunk in restarted.get_chunks(job_id) if chunk["result"] is None]
+    assert pending == [1, 2]
+
+def test_live_lease_is_not_requeued(tmp_path, monkeypatch):
+    """Test that a second worker does not take over a job whose lease is renewed"""
+    now = [1000.0]
+    monkeypatch.setattr("utils.job_store.time.time", lambda: now[0])
+    path = str(tmp_path / "jobs.sqlite")
+    worker = JobStore(path, worker_id="worker-a", lease_timeout=60)
+    job_id = worker.create_job(["Satu.", "Dua."], "hybrid")
+    assert worker.claim_job(job_id)
+
+    now[0] += 45
+    assert worker.heartbeat(job_id)
+    now[0] += 45
+
+    other = JobStore(path, worker_id="worker-b", lease_timeout=60)
+    assert other.requeue_interrupted() == []
+    assert not other.claim_job(job_id)
+    assert not other.heartbeat(job_id)
+
+    # Without heartbeats the lease expires and the other worker takes over
+    now[0] += 61
+    assert other.requeue_interrupted() == [job_id]
+    assert other.claim_job(job_id)
+    assert not worker.heartbeat(job_id)
+
+def test_restart_inside_lease_window_resumes_once_expired(tmp_path, monkeypatch):
+    """Test that a job of a worker that crashed just before a restart is taken over when its lease expires"""
+    now = [1000.0]
+    monkeypatch.setattr("utils.job_store.time.time", lambda: now[0])
+    path = str(tmp_path / "jobs.sqlite")
+    crashed = JobStore(path, worker_id="worker-a", lease_timeout=60)
+    job_id = crashed.create_job(["Satu.", "Dua."], "hybrid")
+    assert crashed.claim_job(job_id)
+    crashed.save_chunk_result(job_id, 0, {"paraphrased": "Satu!"})
+    crashed.close()
+
+    # Restart 10s later: the lease still looks live
+    now[0] += 10
+    restarted = JobStore(path, worker_id="worker-b", lease_timeout=60)
+    assert restarted.requeue_interrupted() == []
+    assert restarted.unfinished_jobs() == [job_id]
+    assert not restarted.claim_job(job_id)
+
+    # Once the lease expired the job is claimed directly, without a requeue pass
+    now[0] += 60
+    assert restarted.claim_job(job_id)
+    assert restarted.get_job(job_id)["status"] == JOB_RUNNING
+    assert [chunk["chunk_index"] for chunk in restarted.get_chunks(job_id) if chunk["result"] is None] == [1]
+
+def test_lost_lease_writes_nothing(tmp_path, monkeypatch):
+    """Test that a worker that lost its lease mid-job cannot checkpoint or finish the job"""
+    now = [1000.0]
+    monkeypatch.setattr("utils.job_store.time.time", lambda: now[0])
+    path = str(tmp_path / "jobs.sqlite")
+    stalled = JobStore(path, worker_id="worker-a", lease_timeout=60)
+    job_id = stalled.create_job(["Satu.", "Dua."], "hybrid")
+    assert stalled.claim_job(job_id)
+    assert stalled.save_chunk_result(job_id, 0, {"paraphrased": "Satu!"})
+
+    # The stalled worker misses its heartbeats and another worker takes over
+    now[0] += 61
+    owner = JobStore(path, worker_id="worker-b", lease_timeout=60)
+    assert owner.claim_job(job_id)
+
+    assert not stalled.heartbeat(job_id)
+    assert not stalled.save_chunk_result(job_id, 1, {"paraphrased": "Basi."})
+    assert not stalled.set_status(job_id, JOB_COMPLETED, result={"combined_text": "Basi."})
+
+    job = owner.get_job(job_id)
+    assert job["status"] == JOB_RUNNING and job["result"] is None
+    assert owner.get_chunks(job_id)[1]["result"] is None
+
+    assert owner.save_chunk_result(job_id, 1, {"paraphrased": "Dua!"})
+    assert owner.set_status(job_id, JOB_COMPLETED, result={"combined_text": "Satu! Dua!"})
+    assert owner.get_job(job_id)["status"] == JOB_COMPLETED
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,69 @@
+"""
+Test Suite for the IndoT5 latency planner
+Tests for the latency cost model and budget-based profile choice
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.latency_planner import LatencyPlanner, PRIOR_INTERCEPT, PRIOR_SECONDS_PER_WORK
+
+class TestLatencyPlanner:
+    """Test cases for LatencyPlanner"""
+
+    def test_prior_until_enough_samples(self):
+        """Test that the prior is used before min_samples timings are recorded"""
+        planner = LatencyPlanner(min_samples=3)
+        planner.record("fast", 100, 5.0)
+
+        estimate = planner.predict("fast", 100)
+        expected = (PRIOR_INTERCEPT + PRIOR_SECONDS_PER_WORK * 100) * 1000.0
+        assert estimate["generate_ms"] == pytest.approx(expected)
+        assert estimate["samples"] == 1
+
+    def test_linear_fit(self):
+        """Test that recorded timings are fitted as intercept + slope * work"""
+        planner = LatencyPlanner(min_samples=3)
+        for work in (10, 20, 40, 80):
+            planner.record("balanced", work, 0.02 + 0.001 * work)
+
+        estimate = planner.predict("balanced", 100)
+        assert estimate["generate_ms"] == pytest.approx(120.0, rel=1e-3)
+        assert estimate["total_p95_ms"] >= estimate["total_ms"] - 1e-6
+        assert planner.get_stats()["profiles"]["balanced"]["fitted"]
+
+    def test_pooled_fit_for_unfitted_profile(self):
+        """Test that a profile without enough timings uses the fit over all profiles"""
+        planner = LatencyPlanner(min_samples=3)
+        for work in (10, 20, 40):
+            planner.record("balanced", work, 0.001 * work)
+
+        assert planner.predict("fast", 50)["generate_ms"] == pytest.approx(50.0, rel=1e-3)
+
+    def test_overhead_added_per_method(self):
+        """Test that non-generation time is added only for the given method"""
+        planner = LatencyPlanner()
+        planner.record_overhead("rule-based", 0.2)
+
+        assert planner.predict("fast", 0, method="rule-based")["total_ms"] == pytest.approx(200.0)
+        assert planner.predict("fast", 0)["total_ms"] == 0.0
+
+    def test_choose_most_thorough_fitting_profile(self):
+        """Test that the profile with the most work within the budget is chosen"""
+        estimates = {
+            "fast": {"total_p95_ms": 50.0},
+            "balanced": {"total_p95_ms": 200.0},
+            "best": {"total_p95_ms": 800.0}
+        }
+        work = {"fast": 10, "balanced": 80, "best": 160}
+
+        assert LatencyPlanner.choose(estimates, work, 300.0) == ("balanced", True)
+        assert LatencyPlanner.choose(estimates, work, 1000.0) == ("best", True)
+        assert LatencyPlanner.choose(estimates, work, 10.0) == ("fast", False)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,72 @@
+"""
+Test Suite for dynamic int8 quantization helpers
+"""
+
+import pytest
+import sys
+import os
+
+import torch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.quantization import load_or_quantize, quantized_cache_path
+
+def build_model():
+    """Small fp32 model with Linear layers"""
+    return torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU(), torch.nn.Linear(32, 4))
+
+def test_cache_path_includes_library_versions(tmp_path):
+    """Test that cached modules are not reused across torch/transformers upgrades"""
+    path = quantized_cache_path("Wikidepia/IndoT5-base", "int8", str(tmp_path))
+    filename = os.path.basename(path)
+
+    assert filename.startswith("Wikidepia__IndoT5-base-int8-")
+    assert "torch" in filename and "transformers" in filename
+
+def test_load_or_quantize_caches_weights(tmp_path):
+    """Test that later loads take the cached int8 weights without loading the fp32 model"""
+    calls = []
+
+    def load_fp32():
+        calls.append(1)
+        return build_model()
+
+    first = load_or_quantize("tiny", load_fp32, cache_dir=str(tmp_path), build_skeleton=build_model)
+
+    # A differently initialized skeleton only provides the architecture
+    second = load_or_quantize("tiny", load_fp32, cache_dir=str(tmp_path), build_skeleton=build_model)
+
+    assert len(calls) == 1
+
+    assert isinstance(second[0], torch.ao.nn.quantized.dynamic.Linear)
+    assert isinstance(torch.load(quantized_cache_path("tiny", "int8", str(tmp_path)), weights_only=True), dict)
+
+    inputs = torch.randn(2, 16)
+    assert torch.allclose(first(inputs), second(inputs))
+
+def test_pickled_module_cache_is_not_loaded(tmp_path):
+    """Test that a cache file holding a pickled module is rejected and replaced"""
+    cache_path = quantized_cache_path("tiny", "int8", str(tmp_path))
+    torch.save(build_model(), cache_path)
+    calls = []
+
+    def load_fp32():
+        calls.append(1)
+        return build_model()
+
+    model = load_or_quantize("tiny", load_fp32, cache_dir=str(tmp_path), build_skeleton=build_model)
+
+    assert len(calls) == 1
+
+    assert isinstance(model[0], torch.ao.nn.quantized.dynamic.Linear)
+    assert isinstance(torch.load(cache_path, weights_only=True), dict)
+
+def test_unsupported_quantization(tmp_path):
+    """Test that unknown quantization modes are rejected"""
+    with pytest.raises(ValueError):
+        load_or_quantize("tiny", build_model, quantization="int4", cache_dir=str(tmp_path))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+"""
+Test Suite for the process-shared result store
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engines.result_store as result_store
+from engines.result_store import ResultStore
+
+def test_results_shared_between_instances(tmp_path):
+    """Test that a second connection (another worker) sees stored results"""
+    path = str(tmp_path / "results.sqlite")
+    writer = ResultStore(path)
+    reader = ResultStore(path)
+
+    writer.put("hybrid:abc", {"paraphrased_text": "Teks hasil", "quality_score": 71.5})
+
+    assert reader.get("hybrid:abc") == {"paraphrased_text": "Teks hasil", "quality_score": 71.5}
+    assert reader.get("hybrid:missing") is None
+    assert reader.get_stats()["hits"] == 1
+
+def test_least_recently_used_evicted(tmp_path, monkeypatch):
+    """Test that eviction keeps the most recently used rows"""
+    monkeypatch.setattr(result_store, "EVICTION_INTERVAL", 1)
+    now = [1000.0]
+    monkeypatch.setattr("engines.result_store.time.time", lambda: now[0])
+
+    store = ResultStore(str(tmp_path / "results.sqlite"), max_entries=2)
+    for key in ("a", "b"):
+        now[0] += 1
+        store.put(key, {"key": key})
+    now[0] += 1
+    store.get("a")
+    now[0] += 1
+    store.put("c", {"key": "c"})
+
+    assert len(store) == 2
+    assert store.get("b") is None
+    assert store.get("a") == {"key": "a"}
+    assert store.evictions == 1
+
+def test_delete_text_removes_all_results_of_a_text(tmp_path):
+    """Test that every result stored with a text hash is deleted together"""
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    store.put("hybrid:seed-1", {"key": 1}, text_hash="teks")
+    store.put("neural:fast", {"key": 2}, text_hash="teks")
+    store.put("hybrid:other", {"key": 3}, text_hash="lain")
+
+    assert store.delete_text("teks") == 2
+    assert store.get("hybrid:seed-1") is None and store.get("neural:fast") is None
+    assert store.get("hybrid:other") == {"key": 3}
+
+def test_expired_results_ignored(tmp_path, monkeypatch):
+    """Test that results older than the TTL are misses"""
+    now = [1000.0]
+    monkeypatch.setattr("engines.result_store.time.time", lambda: now[0])
+
+    store = ResultStore(str(tmp_path / "results.sqlite"), ttl=60)
+    store.put("a", {"key": "a"})
+    now[0] += 61
+
+    assert store.get("a") is None
+    assert store.evict() == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
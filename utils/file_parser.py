@@ -191,12 +191,13 @@ class FileParser:
         
         return text
     
-    def split_into_sentences(self, text: str) -> List[str]:
+    def split_into_sentences(self, text: str, min_words: int = 3) -> List[str]:
         """
         Split text into sentences
         
         Args:
             text: Input text
+            min_words: Drop sentences with fewer words (1 keeps every sentence)
             
         Returns:
             List of sentences
@@ -219,8 +220,8 @@ class FileParser:
         sentences = []
         for s in result:
             s = s.strip()
-            # Keep sentences with at least 3 words
-            if s and len(s.split()) >= 3:
+            # Keep sentences with at least min_words words
+            if s and len(s.split()) >= min_words:
                 sentences.append(s)
         
         return sentences
@@ -327,6 +328,45 @@ class FileParser:
         logger.info(f"📄 Split text into {len(unique_chunks)} chunks (with overlap for context)")
         return unique_chunks
     
+    def map_chunk_sentences(self, chunks: List[str]) -> Tuple[List[str], List[List[int]], List[int]]:
+        """
+        Assign sentence IDs to overlapping chunks (see chunk_text)
+        
+        Identical sentences share one ID, so the overlap repeated at the start
+        of a chunk maps to sentences that were already seen. The document
+        order is rebuilt by appending each chunk's IDs minus the longest
+        prefix that matches the end of the document so far.
+        
+        Args:
+            chunks: Text chunks in document order
+            
+        Returns:
+            Tuple of (unique sentences, sentence IDs per chunk, document sentence IDs)
+        """
+        sentences = []
+        sentence_ids = {}
+        chunk_ids = []
+        document_ids = []
+        
+        for chunk in chunks:
+            ids = []
+            for sentence in self.split_into_sentences(chunk, min_words=1):
+                if sentence not in sentence_ids:
+                    sentence_ids[sentence] = len(sentences)
+                    sentences.append(sentence)
+                ids.append(sentence_ids[sentence])
+            chunk_ids.append(ids)
+            
+            # Skip the overlap with the previous chunk
+            overlap = 0
+            for size in range(min(len(ids), len(document_ids)), 0, -1):
+                if document_ids[-size:] == ids[:size]:
+                    overlap = size
+                    break
+            document_ids.extend(ids[overlap:])
+        
+        return sentences, chunk_ids, document_ids
+    
     def process_file(self, file_path: str, chunk: bool = True) -> dict:
         """
         Process file and return extracted text with metadata
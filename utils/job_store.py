@@ -0,0 +1,276 @@
+"""
+Persistent job store for asynchronous document paraphrasing
+Keeps jobs and per-chunk checkpoints in sqlite so a restarted worker resumes them
+
+Tables:
+    jobs        one row per job (status, method, request options, result of the whole document)
+    job_chunks  one row per chunk (text, JSON result once the chunk is done)
+
+Chunk results are written as soon as they are produced, so a job that was
+interrupted only reprocesses the chunks without a stored result.
+
+A running job holds a lease: the claiming worker's ID and a heartbeat time
+it refreshes while working. Only jobs whose lease expired are requeued or
+claimed by another worker, so a worker starting next to live ones (several
+processes, overlapping restarts) does not take over jobs that are still
+running. Checkpoints and status updates are only written by the lease owner,
+so a worker that lost its lease cannot overwrite the new owner's job.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "jobs", "jobs.sqlite"
+)
+
+# Job statuses
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+UNFINISHED_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Seconds without a heartbeat after which a running job counts as interrupted
+DEFAULT_LEASE_TIMEOUT = 300.0
+
+
+class JobStore:
+    """
+    sqlite-backed store of document jobs and their chunk checkpoints
+    """
+
+    def __init__(self, path: str = DEFAULT_JOB_STORE_PATH,
+                 worker_id: Optional[str] = None,
+                 lease_timeout: float = DEFAULT_LEASE_TIMEOUT):
+        """
+        Open (or create) a job store
+
+        Args:
+            path: sqlite database file
+            worker_id: Lease owner of the jobs this store claims (default: pid + random suffix)
+            lease_timeout: Seconds without a heartbeat before a running job can be requeued
+        """
+        self.path = path
+        self.worker_id = worker_id or f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_timeout = lease_timeout
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, method TEXT NOT NULL, "
+            "total_chunks INTEGER NOT NULL, error TEXT, result TEXT, options TEXT, "
+            "worker_id TEXT, heartbeat_at REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_chunks ("
+            "job_id TEXT NOT NULL, chunk_index INTEGER NOT NULL, text TEXT NOT NULL, result TEXT, "
+            "PRIMARY KEY (job_id, chunk_index))"
+        )
+
+    def create_job(self, chunks: List[str], method: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Store a new queued job
+
+        Args:
+            chunks: Text chunks in document order
+            method: Paraphrasing method
+            options: JSON-serializable request options (profile, temperature, ...)
+
+        Returns:
+            Job ID
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO jobs (job_id, status, method, total_chunks, options, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, JOB_QUEUED, method, len(chunks), json.dumps(options or {}), now, now)
+                )
+                self._conn.executemany(
+                    "INSERT INTO job_chunks (job_id, chunk_index, text) VALUES (?, ?, ?)",
+                    [(job_id, i, chunk) for i, chunk in enumerate(chunks)]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job with its progress
+
+        Returns:
+            Job fields (result parsed from JSON), or None if the job does not exist
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, status, method, total_chunks, error, result, created_at, updated_at, options "
+                "FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            completed = self._conn.execute(
+                "SELECT COUNT(*) FROM job_chunks WHERE job_id = ? AND result IS NOT NULL", (job_id,)
+            ).fetchone()[0]
+
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "method": row[2],
+            "total_chunks": row[3],
+            "completed_chunks": completed,
+            "error": row[4],
+            "result": json.loads(row[5]) if row[5] else None,
+            "created_at": row[6],
+            "updated_at": row[7],
+            "options": json.loads(row[8]) if row[8] else {}
+        }
+
+    def get_chunks(self, job_id: str) -> List[Dict[str, Any]]:
+        """Get the chunks of a job in order, with their stored results (None while pending)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_index, text, result FROM job_chunks WHERE job_id = ? ORDER BY chunk_index",
+                (job_id,)
+            ).fetchall()
+        return [
+            {"chunk_index": index, "text": text, "result": json.loads(result) if result else None}
+            for index, text, result in rows
+        ]
+
+    def save_chunk_result(self, job_id: str, chunk_index: int, result: Dict[str, Any]) -> bool:
+        """
+        Checkpoint the result of one chunk (also renews this worker's lease)
+
+        Returns:
+            False (nothing written) if this worker no longer holds the job's lease
+        """
+        payload = json.dumps(result, ensure_ascii=False, default=float)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                owned = self._conn.execute(
+                    "UPDATE jobs SET heartbeat_at = ?, updated_at = ? "
+                    "WHERE job_id = ? AND status = ? AND worker_id = ?",
+                    (now, now, job_id, JOB_RUNNING, self.worker_id)
+                ).rowcount > 0
+                if owned:
+                    self._conn.execute(
+                        "UPDATE job_chunks SET result = ? WHERE job_id = ? AND chunk_index = ?",
+                        (payload, job_id, chunk_index)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return owned
+
+    def set_status(self, job_id: str, status: str,
+                   error: Optional[str] = None,
+                   result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Update the status (and the error or document result) of a job this worker holds
+
+        Returns:
+            False (nothing written) if this worker no longer holds the job's lease
+        """
+        payload = json.dumps(result, ensure_ascii=False, default=float) if result is not None else None
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, result = COALESCE(?, result), updated_at = ? "
+                "WHERE job_id = ? AND status = ? AND worker_id = ?",
+                (status, error, payload, time.time(), job_id, JOB_RUNNING, self.worker_id)
+            ).rowcount > 0
+
+    def claim_job(self, job_id: str) -> bool:
+        """
+        Atomically take a job under this worker's lease
+
+        Queued jobs and running jobs whose lease expired can be claimed, so a
+        job left running by a crashed worker is taken over even if it was
+        never requeued.
+
+        Returns:
+            False if the job is finished or another worker holds a live lease
+        """
+        now = time.time()
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, heartbeat_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND (status = ? OR (status = ? AND COALESCE(heartbeat_at, updated_at) < ?))",
+                (JOB_RUNNING, self.worker_id, now, now, job_id, JOB_QUEUED, JOB_RUNNING, now - self.lease_timeout)
+            ).rowcount > 0
+
+    def heartbeat(self, job_id: str) -> bool:
+        """Renew this worker's lease on a running job (False if the lease was lost)"""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND status = ? AND worker_id = ?",
+                (time.time(), job_id, JOB_RUNNING, self.worker_id)
+            ).rowcount > 0
+
+    def requeue_interrupted(self) -> List[str]:
+        """
+        Mark running jobs whose lease expired (their worker stopped) as queued again
+
+        Returns:
+            IDs of the requeued jobs, oldest first
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                job_ids = [row[0] for row in self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = ? AND COALESCE(heartbeat_at, updated_at) < ? "
+                    "ORDER BY created_at",
+                    (JOB_RUNNING, now - self.lease_timeout)
+                ).fetchall()]
+                self._conn.executemany(
+                    "UPDATE jobs SET status = ?, worker_id = NULL, updated_at = ? WHERE job_id = ?",
+                    [(JOB_QUEUED, now, job_id) for job_id in job_ids]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job_ids
+
+    def unfinished_jobs(self) -> List[str]:
+        """IDs of queued or interrupted jobs, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id FROM jobs WHERE status IN ({','.join('?' * len(UNFINISHED_STATUSES))}) "
+                "ORDER BY created_at",
+                UNFINISHED_STATUSES
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def delete_job(self, job_id: str) -> bool:
+        """Remove a job and its chunks"""
+        with self._lock:
+            self._conn.execute("DELETE FROM job_chunks WHERE job_id = ?", (job_id,))
+            return self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount > 0
+
+    def close(self) -> None:
+        """Close the sqlite connection"""
+        with self._lock:
+            self._conn.close()